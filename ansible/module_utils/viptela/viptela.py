@@ -11,13 +11,30 @@ try:
 except ImportError:
     JSONDecodeError = ValueError
 
+try:
+    from vmanage.api.rate_limit import DEFAULT_THROTTLE_RETRIES, get_rate_limiter
+except ImportError:
+    get_rate_limiter = None
+
+try:
+    from vmanage.api.timeouts import TimeoutProfiles
+except ImportError:
+    TimeoutProfiles = None
+
+try:
+    from vmanage.api.instrumentation import Instrumentation, LatencyHistogram
+except ImportError:
+    Instrumentation = LatencyHistogram = None
+
 def viptela_argument_spec():
     return dict(host=dict(type='str', required=True, fallback=(env_fallback, ['VMANAGE_HOST'])),
                 port=dict(type='str', required=False, fallback=(env_fallback, ['VMANAGE_PORT'])),
                 user=dict(type='str', required=True, fallback=(env_fallback, ['VMANAGE_USERNAME'])),
                 password=dict(type='str', required=True, fallback=(env_fallback, ['VMANAGE_PASSWORD'])),
                 validate_certs=dict(type='bool', required=False, default=False),
-                timeout=dict(type='int', default=30)
+                timeout=dict(type='int', default=30),
+                timeouts=dict(type='list', default=[], fallback=(env_fallback, ['VMANAGE_TIMEOUTS'])),
+                profile=dict(type='bool', default=False)
                 )
 
 
@@ -51,6 +68,22 @@ class viptelaModule(object):
         self.password = self.params['password']
         self.host = self.params['host']
         self.timeout = self.params['timeout']
+        self.timeout_profiles = None
+        if TimeoutProfiles is not None:
+            # Calls that match no profile keep using the timeout parameter
+            try:
+                self.timeout_profiles = TimeoutProfiles(read=self.timeout).update(self.params['timeouts'])
+            except ValueError as e:
+                self.module.fail_json(msg=str(e))
+        self.instrumentation = None
+        self.latency_histogram = None
+        if self.params['profile']:
+            if Instrumentation is None:
+                self.module.fail_json(msg='The profile option needs the viptela Python package')
+            # Per endpoint call counts and latency, returned as the profile result
+            self.latency_histogram = LatencyHistogram()
+            self.instrumentation = Instrumentation()
+            self.instrumentation.add_hooks(after=self.latency_histogram.record)
         self.modifiable_methods = ['POST', 'PUT', 'DELETE']
 
         self.session = requests.Session()
@@ -151,7 +184,22 @@ class viptelaModule(object):
             data = json.dumps(payload)
             self.result['data'] = data
 
-        response = self.session.request(method, self.url, files=files, data=data)
+        timeout = self.timeout_profiles.get_timeout(self.url) if self.timeout_profiles else None
+        call = self.instrumentation.start(method, self.url, data=data) if self.instrumentation else None
+        try:
+            if get_rate_limiter is None:
+                response = self.session.request(method, self.url, files=files, data=data, timeout=timeout)
+            else:
+                # Share the rate limit with the SDK, and don't resend a file that has been read
+                response = get_rate_limiter(self.url).request(
+                    self.url, lambda: self.session.request(method, self.url, files=files, data=data, timeout=timeout),
+                    retries=0 if files else DEFAULT_THROTTLE_RETRIES)
+        except Exception as e:
+            if call:
+                self.instrumentation.finish(call, error=e)
+            raise
+        if call:
+            self.instrumentation.finish(call, response=response)
 
         self.status_code = response.status_code
         self.status = requests.status_codes._codes[response.status_code][0]
@@ -974,6 +1022,8 @@ class viptelaModule(object):
         """Custom written method to exit from module."""
 
         self.result.update(**kwargs)
+        if self.latency_histogram:
+            self.result['profile'] = self.latency_histogram.get_summary()
         self.module.exit_json(**self.result)
 
     def fail_json(self, msg, **kwargs):
@@ -981,4 +1031,6 @@ class viptelaModule(object):
         """Custom written method to return info on failure."""
 
         self.result.update(**kwargs)
+        if self.latency_histogram:
+            self.result['profile'] = self.latency_histogram.get_summary()
         self.module.fail_json(msg=msg, **self.result)
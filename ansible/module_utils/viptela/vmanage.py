@@ -1,5 +1,8 @@
 from ansible.module_utils.basic import AnsibleModule, json, env_fallback
 from vmanage.api.authentication import Authentication
+from vmanage.api.instrumentation import Instrumentation, LatencyHistogram
+from vmanage.api.timeouts import TimeoutProfiles
+from vmanage.api.tracing import Tracer, get_exporter
 
 
 def vmanage_argument_spec():
@@ -8,12 +11,13 @@ def vmanage_argument_spec():
                 user=dict(type='str', required=True, fallback=(env_fallback, ['VMANAGE_USERNAME'])),
                 password=dict(type='str', required=True, fallback=(env_fallback, ['VMANAGE_PASSWORD'])),
                 validate_certs=dict(type='bool', required=False, default=False),
-                timeout=dict(type='int', default=30)
-                )
+                timeout=dict(type='int', default=30),
+                timeouts=dict(type='list', default=[], fallback=(env_fallback, ['VMANAGE_TIMEOUTS'])),
+                profile=dict(type='bool', default=False),
+                trace=dict(type='str', fallback=(env_fallback, ['VMANAGE_TRACE'])))
 
 
 class Vmanage(object):
-
     def __init__(self, module, function=None):
         self.module = module
         self.params = module.params
@@ -24,13 +28,34 @@ class Vmanage(object):
         self.host = self.params['host']
         self.port = self.params['port']
         self.timeout = self.params['timeout']
+        # Per endpoint call counts and latency, returned as the profile result
+        self.latency_histogram = LatencyHistogram() if self.params['profile'] else None
+        self.tracer = None
 
         self.__auth = None
 
     @property
     def auth(self):
         if self.__auth is None:
-            self.__auth = Authentication(host=self.host, user=self.username, password=self.password).login()
+            # Calls that match no profile keep using the timeout parameter
+            try:
+                timeouts = TimeoutProfiles(read=self.timeout).update(self.params['timeouts'])
+            except ValueError as e:
+                self.fail_json(msg=str(e))
+            instrumentation = Instrumentation()
+            if self.latency_histogram:
+                instrumentation.add_hooks(after=self.latency_histogram.record)
+            if self.params['trace']:
+                try:
+                    self.tracer = Tracer(get_exporter(self.params['trace']))
+                except OSError as e:
+                    self.fail_json(msg='Cannot record trace: {0}'.format(e))
+            self.__auth = Authentication(host=self.host,
+                                         user=self.username,
+                                         password=self.password,
+                                         timeouts=timeouts,
+                                         instrumentation=instrumentation,
+                                         tracer=self.tracer).login()
         return self.__auth
 
     def exit_json(self, **kwargs):
@@ -38,6 +63,10 @@ class Vmanage(object):
         """Custom written method to exit from module."""
 
         self.result.update(**kwargs)
+        if self.latency_histogram:
+            self.result['profile'] = self.latency_histogram.get_summary()
+        if self.tracer:
+            self.tracer.close()
         self.module.exit_json(**self.result)
 
     def fail_json(self, msg, **kwargs):
@@ -45,4 +74,8 @@ class Vmanage(object):
         """Custom written method to return info on failure."""
 
         self.result.update(**kwargs)
+        if self.latency_histogram:
+            self.result['profile'] = self.latency_histogram.get_summary()
+        if self.tracer:
+            self.tracer.close()
         self.module.fail_json(msg=msg, **self.result)
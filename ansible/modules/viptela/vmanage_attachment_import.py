@@ -18,6 +18,8 @@ def run_module():
                          update=dict(type='bool', required=False, default=False),
                          type=dict(type='str', required=False, choices=['feature', 'device'], default=None),
                          name_list=dict(type='list', required=False, default=[]),
+                         batch_size=dict(type='int', required=False, default=None),
+                         batches_in_flight=dict(type='int', required=False, default=4),
                          )
 
     # seed the result dict in the object
@@ -42,7 +44,9 @@ def run_module():
     vmanage_files = Files(vmanage.auth, vmanage.host)
     vmanage.result['imported'] = vmanage_files.import_attachments_from_file(vmanage.params['file'], update=vmanage.params['update'],
                                                                           check_mode=module.check_mode,
-                                                                          name_list=vmanage.params['name_list'])
+                                                                          name_list=vmanage.params['name_list'],
+                                                                          batch_size=vmanage.params['batch_size'],
+                                                                          batches_in_flight=vmanage.params['batches_in_flight'])
 
     vmanage.exit_json(**vmanage.result)
 
@@ -0,0 +1,77 @@
+import json
+
+import click
+from benchmarks.harness import Benchmark, PERCENTILES
+from benchmarks.mock_vmanage import MockVmanage
+from benchmarks.workloads import WORKLOADS
+
+COLUMNS = [
+    ('workload', 'Workload', '{}'),
+    ('devices', 'Devices', '{}'),
+    ('items', 'Items', '{}'),
+    ('seconds', 'Seconds', '{:.2f}'),
+    ('items_per_second', 'Items/s', '{:.1f}'),
+    ('calls', 'Calls', '{}'),
+    ('calls_per_second', 'Calls/s', '{:.1f}'),
+] + [(f'p{percentile}_ms', f'p{percentile} ms', '{:.1f}') for percentile in PERCENTILES] + [
+    ('peak_memory_mb', 'Peak MB', '{:.1f}'),
+]
+
+
+def parse_sizes(ctx, param, value):  #pylint: disable=unused-argument
+    try:
+        return [int(size) for size in value.split(',') if size]
+    except ValueError:
+        raise click.BadParameter(f"{value} is not a comma separated list of device counts")
+
+
+def format_row(values, widths):
+    # The workload name is left aligned, the numbers right aligned
+    return '  '.join([values[0].ljust(widths[0])] +
+                     [value.rjust(width) for value, width in zip(values[1:], widths[1:])])
+
+
+@click.command()
+@click.option('--devices',
+              default='100,1000,10000',
+              callback=parse_sizes,
+              help="Comma separated inventory sizes to run each workload against")
+@click.option('--latency', default=0.0, help="Milliseconds the mock vManage delays each response by")
+@click.option('--jitter', default=0.0, help="Up to this many milliseconds more are added to each response")
+@click.option('--workload',
+              '-w',
+              'workloads',
+              multiple=True,
+              type=click.Choice(list(WORKLOADS)),
+              help="Workload to run (default: all)")
+@click.option('--repeat', default=1, help="Timed runs of each workload, the median run is reported")
+@click.option('--memory/--no-memory', default=True, help="Measure the peak memory of each workload")
+@click.option('--rate-limit/--no-rate-limit', default=True, help="Pace requests as against a real vManage")
+@click.option('--json', 'as_json', is_flag=True, default=False, help="Print the results as JSON")
+def benchmarks(devices, latency, jitter, workloads, repeat, memory, rate_limit, as_json):
+    """
+    Run the SDK workloads against a local mock vManage
+    """
+    results = []
+    widths = [max(len(name) for name in WORKLOADS)] + [max(len(title), 8) for _, title, _ in COLUMNS[1:]]
+    if not as_json:
+        click.echo(format_row([title for _, title, _ in COLUMNS], widths))
+    with MockVmanage() as mock:
+        for size in devices:
+            benchmark = Benchmark(mock,
+                                  devices=size,
+                                  latency=latency / 1000.0,
+                                  jitter=jitter / 1000.0,
+                                  rate_limit=rate_limit)
+            for name in workloads or WORKLOADS:
+                result = benchmark.run(name, repeat=repeat, trace_memory=memory)
+                results.append(result)
+                if not as_json:
+                    values = [fmt.format(result[key]) if result[key] is not None else '-' for key, _, fmt in COLUMNS]
+                    click.echo(format_row(values, widths))
+    if as_json:
+        click.echo(json.dumps(results, indent=4))
+
+
+if __name__ == '__main__':
+    benchmarks()  #pylint: disable=no-value-for-parameter
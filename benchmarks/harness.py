@@ -0,0 +1,136 @@
+"""Benchmark Harness.
+"""
+
+import gc
+import time
+import tracemalloc
+
+from benchmarks.workloads import WORKLOADS
+from vmanage.api.authentication import Authentication
+
+PERCENTILES = [50, 90, 99]
+
+
+def get_percentile(values, percentile):
+    """Get a percentile of a list of values by the nearest rank method."""
+
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(percentile / 100.0 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class Benchmark(object):
+    """Run workloads against a mock vManage and measure them.
+
+    Every run starts from a freshly generated inventory and a new login,
+    so caches and indexes built by one run don't carry over to the next.
+    Timings are taken without memory tracing, which slows Python down a
+    lot, and the peak memory is taken from one more traced run.
+
+    """
+    def __init__(self, mock, devices=100, latency=0.0, jitter=0.0, rate_limit=True):
+        """Initialize the benchmark.
+
+        Args:
+            mock (MockVmanage): The mock vManage to run against
+            devices (int): Number of vEdges in the mock inventory
+            latency (float): Seconds the mock delays each response by
+            jitter (float): Up to this many seconds more are added at random
+            rate_limit (bool): Pace requests as the SDK does against a real vManage
+
+        """
+
+        self.mock = mock
+        self.devices = devices
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.host = mock.host
+        self.port = mock.port
+        self.session = None
+
+    def login(self):
+        auth = Authentication(host=self.host,
+                              port=self.port,
+                              user='admin',
+                              password='admin',
+                              cache=True,
+                              rate_limit=self.rate_limit)
+        self.mock.mount(auth.session, pool_maxsize=auth.transport.pool_maxsize)
+        self.session = auth.login()
+
+    def reset(self, empty=None):
+        """Start over from a new inventory and session.
+
+        Args:
+            empty (list): Scopes of the inventory to leave empty
+
+        """
+
+        self.mock.reset(devices=self.devices, latency=self.latency, jitter=self.jitter, empty=empty)
+        self.login()
+
+    def run_once(self, name, trace_memory=False):
+        """Run a workload once.
+
+        Returns:
+            result (dict): The items processed, seconds taken, latency of
+                each call and peak memory (when traced) of the run.
+
+        """
+
+        workload = WORKLOADS[name]
+        self.reset()
+        args = workload['setup'](self) if workload['setup'] else None
+        latencies = []
+        self.session.hooks['response'].append(
+            lambda response, *_, **__: latencies.append(response.elapsed.total_seconds()))
+        gc.collect()
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            items = workload['run'](self, args)
+            seconds = time.perf_counter() - start
+        finally:
+            peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+            if trace_memory:
+                tracemalloc.stop()
+        unhandled = self.mock.get_stats()['unhandled']
+        if unhandled:
+            raise RuntimeError(f"Workload {name} called endpoints the mock does not serve: {', '.join(unhandled)}")
+        return {'items': items, 'seconds': seconds, 'latencies': latencies, 'peak': peak}
+
+    def run(self, name, repeat=1, trace_memory=True):
+        """Run a workload and summarize it.
+
+        Args:
+            name (str): Name of the workload (see WORKLOADS)
+            repeat (int): Number of timed runs, the median run is reported
+            trace_memory (bool): Measure the peak memory with one more run
+
+        Returns:
+            result (dict): Throughput, call latency percentiles and peak memory.
+
+        """
+
+        runs = sorted((self.run_once(name) for _ in range(repeat)), key=lambda run: run['seconds'])
+        median = runs[len(runs) // 2]
+        peak = self.run_once(name, trace_memory=True)['peak'] if trace_memory else None
+
+        result = {
+            'workload': name,
+            'devices': self.devices,
+            'latency_ms': self.latency * 1000,
+            'items': median['items'],
+            'seconds': median['seconds'],
+            'items_per_second': median['items'] / median['seconds'] if median['seconds'] else 0.0,
+            'calls': len(median['latencies']),
+            'calls_per_second': len(median['latencies']) / median['seconds'] if median['seconds'] else 0.0,
+            'peak_memory_mb': peak / 1048576.0 if peak is not None else None,
+        }
+        for percentile in PERCENTILES:
+            result[f'p{percentile}_ms'] = get_percentile(median['latencies'], percentile) * 1000
+        return result
@@ -0,0 +1,1049 @@
+"""Mock vManage dataservice for Offline Benchmarks.
+"""
+
+import ast
+import itertools
+import json
+import multiprocessing
+import random
+import re
+import socketserver
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from vmanage.api.transport import DEFAULT_POOL_MAXSIZE, KeepAliveAdapter
+
+VMANAGE_VERSION = '20.3.1'
+DEVICES_PER_SITE = 4
+DEVICES_PER_DEVICE_TEMPLATE = 100
+DEVICES_PER_POLICY_LIST = 20
+DEVICES_PER_DEFINITION = 100
+DEVICES_PER_CENTRAL_POLICY = 2000
+BFD_SESSIONS_PER_DEVICE = 8
+# Seconds to wait on the mock to generate an inventory
+CONTROL_TIMEOUT = 600
+
+# Feature templates that make up each device template, with the type of
+# the template they sit under (None for the top level)
+FEATURE_TEMPLATE_TYPES = [
+    ('system-vedge', None),
+    ('omp-vedge', None),
+    ('logging', None),
+    ('banner', None),
+    ('vpn-vedge', None),
+    ('vpn-vedge-interface', 'vpn-vedge'),
+]
+# Columns of the device template input.  The editable ones are filled in
+# from the variables of each attachment.
+TEMPLATE_INPUT_COLUMNS = [
+    ('csv-status', 'Status', False),
+    ('csv-deviceId', 'Chassis Number', False),
+    ('csv-deviceIP', 'System IP', False),
+    ('csv-host-name', 'Hostname', False),
+    ('//system/host-name', 'Hostname(system_host_name)', True),
+    ('//system/system-ip', 'System IP(system_system_ip)', True),
+    ('//system/site-id', 'Site ID(system_site_id)', True),
+    ('/1/vpn_if_name/interface/if-name', 'Interface Name(vpn_if_name)', True),
+    ('/1/vpn_if_name/interface/ip/address', 'IPv4 Address(vpn_if_ip)', True),
+]
+POLICY_LIST_TYPES = ['site', 'vpn', 'dataPrefix', 'prefix', 'color', 'tloc']
+# Parts of vManage that can be left empty, so that imports have something to create
+INVENTORY_SCOPES = ['templates', 'attachments', 'policies']
+
+
+def get_mock_id(kind, number):
+    """Make a stable UUID style ID for the numbered object of a kind."""
+
+    return str(uuid.UUID(int=(kind << 64) + number))
+
+
+def get_system_ip(number):
+    return f"10.{(number >> 16) & 255}.{(number >> 8) & 255}.{number & 255}"
+
+
+class MockInventory(object):
+    """Synthetic contents of a vManage, sized by its number of devices.
+
+    Templates, policy lists, definitions and policies grow with the
+    device count.  Objects keep count of what references them so that
+    deletes are refused in the same order a real vManage refuses them.
+
+    """
+    def __init__(self, devices=100, empty=None):
+        """Initialize the inventory.
+
+        Args:
+            devices (int): Number of vEdges
+            empty (list): Scopes of INVENTORY_SCOPES to leave empty
+
+        """
+
+        empty = set(empty or [])
+        self.ids = itertools.count(1)
+        self.created_at = int(time.time() * 1000)
+        self.vedges = {}
+        self.system_ips = {}
+        self.controllers = {}
+        self.feature_templates = {}
+        self.device_templates = {}
+        self.attachments = {}
+        self.policy_lists = {}
+        self.definitions = {}
+        self.policies = {'vedge': {}, 'vsmart': {}, 'security': {}}
+        self.actions = {}
+        self.references = {}
+
+        self.add_controller('vmanage', 'vmanage', 0)
+        self.add_controller('vsmart', 'vsmart', 1)
+        self.add_controller('vsmart', 'vsmart', 2)
+        self.add_controller('vbond', 'vedge-cloud', 3)
+        for number in range(1, devices + 1):
+            self.add_vedge(number)
+        if 'templates' not in empty:
+            self.add_templates(max(2, devices // DEVICES_PER_DEVICE_TEMPLATE))
+            if 'attachments' not in empty:
+                template_ids = list(self.device_templates)
+                for number, device in enumerate(self.vedges.values()):
+                    self.attach(template_ids[number % len(template_ids)], device, self.get_input_row(device))
+        if 'policies' not in empty:
+            self.add_policies(devices)
+
+    def new_id(self, kind):
+        return get_mock_id(kind, next(self.ids))
+
+    def link(self, object_ids, count=1):
+        for object_id in object_ids:
+            self.references[object_id] = self.references.get(object_id, 0) + count
+
+    #
+    # Devices
+    #
+    def add_controller(self, device_type, device_model, number):
+        device_uuid = get_mock_id(1, number)
+        self.controllers[device_uuid] = {
+            'uuid': device_uuid,
+            'deviceType': device_type,
+            'deviceModel': device_model,
+            'host-name': f'{device_type}-{number}',
+            'system-ip': f'1.1.1.{number + 1}',
+            'deviceIP': f'1.1.1.{number + 1}',
+            'site-id': '1',
+            'version': VMANAGE_VERSION,
+            'configOperationMode': 'vmanage' if number == 1 else 'cli',
+            'reachability': 'reachable',
+            'validity': 'valid',
+            'personality': device_type,
+        }
+
+    def add_vedge(self, number):
+        device_uuid = get_mock_id(2, number)
+        self.vedges[device_uuid] = {
+            'uuid': device_uuid,
+            'chasisNumber': device_uuid,
+            'serialNumber': f'{number:08X}',
+            'deviceType': 'vedge',
+            'deviceModel': 'vedge-cloud',
+            'host-name': f'vedge-{number}',
+            'system-ip': get_system_ip(number),
+            'deviceIP': get_system_ip(number),
+            'site-id': str(100 + number // DEVICES_PER_SITE),
+            'version': VMANAGE_VERSION,
+            'configOperationMode': 'cli',
+            'reachability': 'reachable',
+            'validity': 'valid',
+            'personality': 'vedge',
+        }
+        self.system_ips[get_system_ip(number)] = device_uuid
+
+    def get_device_status(self):
+        status_list = []
+        for device in itertools.chain(self.controllers.values(), self.vedges.values()):
+            status_list.append({
+                'deviceId': device['system-ip'],
+                'system-ip': device['system-ip'],
+                'host-name': device['host-name'],
+                'uuid': device['uuid'],
+                'site-id': device['site-id'],
+                'board-serial': device.get('serialNumber', device['uuid'][-8:]),
+                'device-model': device['deviceModel'],
+                'device-type': device['deviceType'],
+                'personality': device['personality'],
+                'reachability': device['reachability'],
+                'status': 'normal',
+                'version': device['version'],
+                'uptime-date': self.created_at,
+                'lastupdated': self.created_at,
+            })
+        return status_list
+
+    def get_device_rows(self, path, system_ip):
+        """Make up the rows of a real time query against a device."""
+
+        device = self.vedges.get(self.system_ips.get(system_ip))
+        if device is None:
+            return []
+        rows = []
+        for number in range(BFD_SESSIONS_PER_DEVICE):
+            rows.append({
+                'vdevice-name': system_ip,
+                'vdevice-host-name': device['host-name'],
+                'system-ip': get_system_ip(number + 1),
+                'site-id': device['site-id'],
+                'src-ip': f'192.0.2.{number + 1}',
+                'dst-ip': f'198.51.100.{number + 1}',
+                'color': ['mpls', 'biz-internet'][number % 2],
+                'state': 'up',
+                'proto': 'ipsec',
+                'transitions': 0,
+                'tx-interval': 1000,
+                'detect-multiplier': 7,
+                'uptime': '0:01:02:03',
+                'path': path,
+                'lastupdated': self.created_at,
+            })
+        return rows
+
+    #
+    # Templates
+    #
+    def get_feature_definition(self, template_type, number):
+        definition = {}
+        for variable in range(24):
+            definition[f'{template_type}-setting-{variable}'] = {
+                'vipObjectType': 'object',
+                'vipType': 'variableName' if variable % 4 == 0 else 'constant',
+                'vipValue': f'value-{number}-{variable}',
+                'vipVariableName': f'{template_type.replace("-", "_")}_{variable}',
+            }
+        return definition
+
+    def add_feature_template(self, template, factory_default=False):
+        template_id = self.new_id(3)
+        self.feature_templates[template_id] = dict(template,
+                                                   templateId=template_id,
+                                                   factoryDefault=factory_default,
+                                                   createdBy='admin',
+                                                   createdOn=self.created_at,
+                                                   lastUpdatedBy='admin',
+                                                   lastUpdatedOn=self.created_at)
+        return template_id
+
+    def add_device_template(self, template):
+        template_id = self.new_id(4)
+        template = dict(template, templateId=template_id, lastUpdatedBy='admin', lastUpdatedOn=self.created_at)
+        self.link(self.get_feature_template_ids(template))
+        self.device_templates[template_id] = template
+        self.attachments[template_id] = {}
+        return template_id
+
+    @staticmethod
+    def get_feature_template_ids(device_template):
+        template_ids = []
+        pending = list(device_template.get('generalTemplates', []))
+        while pending:
+            template = pending.pop()
+            template_ids.append(template['templateId'])
+            pending.extend(template.get('subTemplates', []))
+        return template_ids
+
+    def add_templates(self, count):
+        for template_type, _ in FEATURE_TEMPLATE_TYPES:
+            self.add_feature_template(
+                {
+                    'templateName': f'Factory_Default_{template_type}',
+                    'templateDescription': 'Factory default',
+                    'templateType': template_type,
+                    'deviceType': ['vedge-cloud'],
+                    'templateMinVersion': '15.0.0',
+                    'configType': 'xml',
+                    'templateDefinition': self.get_feature_definition(template_type, 0),
+                },
+                factory_default=True)
+        for number in range(1, count + 1):
+            template_ids = {}
+            for template_type, _ in FEATURE_TEMPLATE_TYPES:
+                template_ids[template_type] = self.add_feature_template({
+                    'templateName':
+                    f'{template_type}-{number}',
+                    'templateDescription':
+                    f'{template_type} for template {number}',
+                    'templateType':
+                    template_type,
+                    'deviceType': ['vedge-cloud'],
+                    'templateMinVersion':
+                    '15.0.0',
+                    'configType':
+                    'xml',
+                    'templateDefinition':
+                    self.get_feature_definition(template_type, number),
+                })
+            general_templates = []
+            for template_type, parent_type in FEATURE_TEMPLATE_TYPES:
+                template = {'templateId': template_ids[template_type], 'templateType': template_type}
+                if parent_type is None:
+                    general_templates.append(template)
+                else:
+                    parent = next(item for item in general_templates if item['templateType'] == parent_type)
+                    parent.setdefault('subTemplates', []).append(template)
+            self.add_device_template({
+                'templateName': f'vedge-template-{number}',
+                'templateDescription': f'Device template {number}',
+                'deviceType': 'vedge-cloud',
+                'deviceRole': 'sdwan-edge',
+                'configType': 'template',
+                'factoryDefault': False,
+                'policyId': '',
+                'securityPolicyId': '',
+                'featureTemplateUidRange': [],
+                'connectionPreferenceRequired': True,
+                'connectionPreference': True,
+                'generalTemplates': general_templates,
+            })
+
+    def get_feature_template_summary(self, template):
+        return dict(template,
+                    templateDefinition=json.dumps(template['templateDefinition']),
+                    attachedMastersCount=self.references.get(template['templateId'], 0),
+                    devicesAttached=0)
+
+    def get_device_template_summary(self, template):
+        summary = {
+            key: value
+            for key, value in template.items() if key not in ['generalTemplates', 'featureTemplateUidRange']
+        }
+        summary['devicesAttached'] = len(self.attachments.get(template['templateId'], {}))
+        summary['templateAttached'] = summary['devicesAttached']
+        return summary
+
+    #
+    # Attachments
+    #
+    @staticmethod
+    def get_input_row(device):
+        return {
+            'csv-status': 'complete',
+            'csv-deviceId': device['uuid'],
+            'csv-deviceIP': device['system-ip'],
+            'csv-host-name': device['host-name'],
+            '//system/host-name': device['host-name'],
+            '//system/system-ip': device['system-ip'],
+            '//system/site-id': device['site-id'],
+            '/1/vpn_if_name/interface/if-name': 'ge0/0',
+            '/1/vpn_if_name/interface/ip/address': f"{device['system-ip']}/24",
+        }
+
+    def attach(self, template_id, device, row):
+        for attachments in self.attachments.values():
+            attachments.pop(device['uuid'], None)
+        self.attachments[template_id][device['uuid']] = row
+        device['configOperationMode'] = 'vmanage'
+        device['template'] = self.device_templates[template_id]['templateName']
+        device['templateId'] = template_id
+
+    def detach(self, device):
+        for attachments in self.attachments.values():
+            attachments.pop(device['uuid'], None)
+        device['configOperationMode'] = 'cli'
+        device.pop('template', None)
+        device.pop('templateId', None)
+
+    def add_action(self, device_uuids, activity):
+        action_id = f'push_{next(self.ids)}'
+        self.actions[action_id] = [{
+            'uuid': device_uuid,
+            'statusId': 'success',
+            'status': 'Success',
+            'currentActivity': activity,
+            'activity': [activity],
+        } for device_uuid in device_uuids]
+        return action_id
+
+    #
+    # Policies
+    #
+    def add_policy_list(self, policy_list, owner='admin'):
+        list_id = self.new_id(5)
+        self.policy_lists[list_id] = dict(policy_list,
+                                          listId=list_id,
+                                          owner=owner,
+                                          readOnly=owner == 'system',
+                                          version='0',
+                                          infoTag='',
+                                          lastUpdated=self.created_at,
+                                          isActivatedByVsmart=False)
+        return list_id
+
+    def add_definition(self, definition):
+        definition_id = self.new_id(6)
+        self.link(self.get_reference_ids(definition))
+        self.definitions[definition_id] = dict(definition,
+                                               definitionId=definition_id,
+                                               owner='admin',
+                                               infoTag='',
+                                               mode='',
+                                               optimized='false',
+                                               lastUpdated=self.created_at)
+        return definition_id
+
+    def add_policy(self, kind, policy):
+        policy_id = self.new_id(7)
+        policy_definition = policy.get('policyDefinition', {})
+        if isinstance(policy_definition, str):
+            policy_definition = json.loads(policy_definition)
+        self.link(self.get_reference_ids(policy_definition))
+        self.policies[kind][policy_id] = dict(policy,
+                                              policyId=policy_id,
+                                              policyDefinition=policy_definition,
+                                              isPolicyActivated=policy.get('isPolicyActivated', False),
+                                              policyVersion='0',
+                                              createdBy='admin',
+                                              createdOn=self.created_at,
+                                              lastUpdatedBy='admin',
+                                              lastUpdatedOn=self.created_at)
+        return policy_id
+
+    def get_reference_ids(self, item):
+        """Find the IDs of the lists and definitions an object refers to."""
+
+        reference_ids = []
+        if isinstance(item, dict):
+            for key, value in item.items():
+                if key in ['ref', 'definitionId'] or (key.endswith('List') and isinstance(value, str)):
+                    reference_ids.append(value)
+                elif key.endswith('Lists') and isinstance(value, list):
+                    reference_ids.extend(value)
+                else:
+                    reference_ids.extend(self.get_reference_ids(value))
+        elif isinstance(item, list):
+            for value in item:
+                reference_ids.extend(self.get_reference_ids(value))
+        return [
+            reference_id for reference_id in reference_ids
+            if reference_id in self.policy_lists or reference_id in self.definitions
+        ]
+
+    def get_list_entries(self, list_type, number):
+        if list_type == 'site':
+            return [{'siteId': str(100 + number * 10 + entry)} for entry in range(10)]
+        if list_type == 'vpn':
+            return [{'vpn': str(number % 512 + 1)}]
+        if list_type in ['dataPrefix', 'prefix']:
+            return [{'ipPrefix': f'10.{number % 256}.{entry}.0/24'} for entry in range(8)]
+        if list_type == 'color':
+            return [{'color': 'mpls'}, {'color': 'biz-internet'}]
+        return [{'tloc': get_system_ip(number + 1), 'color': 'mpls', 'encap': 'ipsec'}]
+
+    def add_policies(self, devices):
+        for list_type in POLICY_LIST_TYPES:
+            self.add_policy_list(
+                {
+                    'name': f'System_{list_type}',
+                    'type': list_type,
+                    'description': 'System list',
+                    'entries': self.get_list_entries(list_type, 0)
+                },
+                owner='system')
+        list_ids = {list_type: [] for list_type in POLICY_LIST_TYPES}
+        for number in range(max(len(POLICY_LIST_TYPES), devices // DEVICES_PER_POLICY_LIST)):
+            list_type = POLICY_LIST_TYPES[number % len(POLICY_LIST_TYPES)]
+            list_ids[list_type].append(
+                self.add_policy_list({
+                    'name': f'{list_type}-{number}',
+                    'type': list_type,
+                    'description': f'{list_type} list {number}',
+                    'entries': self.get_list_entries(list_type, number),
+                }))
+
+        definition_ids = {'data': [], 'control': []}
+        for number in range(max(2, devices // DEVICES_PER_DEFINITION)):
+            definition_type = ['data', 'control'][number % 2]
+            list_type = 'dataPrefix' if definition_type == 'data' else 'site'
+            field = 'sourceDataPrefixList' if definition_type == 'data' else 'siteList'
+            sequences = []
+            for sequence in range(4):
+                list_id = list_ids[list_type][(number + sequence) % len(list_ids[list_type])]
+                sequences.append({
+                    'sequenceId': sequence + 1,
+                    'sequenceName': definition_type.title(),
+                    'baseAction': 'accept',
+                    'sequenceType': definition_type,
+                    'sequenceIpType': 'ipv4',
+                    'match': {
+                        'entries': [{
+                            'field': field,
+                            'ref': list_id
+                        }]
+                    },
+                    'actions': [{
+                        'type': 'count',
+                        'parameter': f'{definition_type}_{number}_{sequence}'
+                    }],
+                })
+            definition_ids[definition_type].append(
+                self.add_definition({
+                    'name': f'{definition_type}-{number}',
+                    'type': definition_type,
+                    'description': f'{definition_type} definition {number}',
+                    'defaultAction': {
+                        'type': 'accept'
+                    },
+                    'sequences': sequences,
+                }))
+
+        for number in range(max(2, devices // DEVICES_PER_CENTRAL_POLICY)):
+            assembly = []
+            for definition_type, direction in [('data', 'service'), ('control', 'out')]:
+                definitions = definition_ids[definition_type]
+                assembly.append({
+                    'definitionId':
+                    definitions[number % len(definitions)],
+                    'type':
+                    definition_type,
+                    'entries': [{
+                        'direction': direction,
+                        'siteLists': list_ids['site'][number % len(list_ids['site']):][:2],
+                        'vpnLists': list_ids['vpn'][number % len(list_ids['vpn']):][:1],
+                    }],
+                })
+            self.add_policy(
+                'vsmart', {
+                    'policyName': f'central-policy-{number}',
+                    'policyDescription': f'Central policy {number}',
+                    'policyType': 'feature',
+                    'isPolicyActivated': number == 0,
+                    'policyDefinition': {
+                        'assembly': assembly
+                    },
+                })
+        for number in range(2):
+            self.add_policy(
+                'vedge', {
+                    'policyName': f'local-policy-{number}',
+                    'policyDescription': f'Local policy {number}',
+                    'policyType': 'feature',
+                    'policyDefinition': {
+                        'assembly': [],
+                        'settings': {
+                            'appVisibility': True,
+                            'flowVisibility': True
+                        }
+                    },
+                })
+
+    def get_list_summary(self, policy_list):
+        return dict(policy_list, referenceCount=self.references.get(policy_list['listId'], 0), references=[])
+
+    def get_definition_summary(self, definition):
+        summary = {key: value for key, value in definition.items() if key not in ['sequences', 'defaultAction']}
+        summary['referenceCount'] = self.references.get(definition['definitionId'], 0)
+        summary['references'] = []
+        return summary
+
+    @staticmethod
+    def get_policy_summary(policy):
+        return dict(policy, policyDefinition=json.dumps(policy['policyDefinition']))
+
+
+class MockVmanageServer(socketserver.ThreadingMixIn, HTTPServer):
+    """Threaded HTTP server holding the mock inventory."""
+
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, address, devices=100, latency=0.0, jitter=0.0):
+        HTTPServer.__init__(self, address, MockVmanageHandler)
+        self.lock = threading.Lock()
+        self.reset(devices=devices, latency=latency, jitter=jitter)
+
+    def reset(self, devices=100, latency=0.0, jitter=0.0, empty=None):
+        """Replace the inventory and the response latency.
+
+        Args:
+            devices (int): Number of vEdges
+            latency (float): Seconds each response is delayed by
+            jitter (float): Up to this many seconds more are added at random
+            empty (list): Scopes of INVENTORY_SCOPES to leave empty
+
+        """
+
+        with self.lock:
+            self.inventory = MockInventory(devices=devices, empty=empty)
+            self.latency = latency
+            self.jitter = jitter
+            self.request_count = 0
+            self.unhandled = set()
+
+
+class MockVmanageHandler(BaseHTTPRequestHandler):
+    """Serves the dataservice endpoints used by the SDK from the mock inventory.
+
+    Each route maps a method and path to a handler that gets the path
+    match, the query parameters and the decoded body, and returns the
+    status code and the body to send.  Paths without a route get a 404
+    and are remembered, so a benchmark can tell when it strayed outside
+    of what is mocked.
+
+    """
+
+    protocol_version = 'HTTP/1.1'
+    ROUTES = [
+        ('POST', r'j_security_check', 'login'),
+        ('GET', r'client/token', 'get_token'),
+        ('GET', r'system/device/(?P<category>vedges|controllers)', 'get_device_list'),
+        ('PUT', r'system/device/decommission/(?P<uuid>[^/]+)', 'decommission'),
+        ('GET', r'device', 'get_device_status'),
+        ('GET', r'device/action/status/tasks/activeCount', 'get_active_count'),
+        ('GET', r'device/action/status/(?P<action_id>[^/]+)', 'get_action_status'),
+        ('GET', r'device/(?P<path>.+)', 'get_device_rows'),
+        ('GET', r'template/feature', 'get_feature_templates'),
+        ('POST', r'template/feature', 'add_feature_template'),
+        ('PUT', r'template/feature/(?P<template_id>[^/]+)', 'update_feature_template'),
+        ('DELETE', r'template/feature/(?P<template_id>[^/]+)', 'delete_feature_template'),
+        ('GET', r'template/device', 'get_device_templates'),
+        ('GET', r'template/device/object/(?P<template_id>[^/]+)', 'get_device_template'),
+        ('POST', r'template/device/feature', 'add_device_template'),
+        ('PUT', r'template/device/(?P<template_id>[^/]+)', 'update_device_template'),
+        ('DELETE', r'template/device/(?P<template_id>[^/]+)', 'delete_device_template'),
+        ('GET', r'template/device/config/attached/(?P<template_id>[^/]+)', 'get_attached'),
+        ('POST', r'template/device/config/input', 'get_template_input'),
+        ('POST', r'template/device/config/attachfeature', 'attach'),
+        ('POST', r'template/config/device/mode/cli', 'detach'),
+        ('GET', r'template/policy/list', 'get_policy_lists'),
+        ('GET', r'template/policy/list/(?P<list_type>[^/]+)', 'get_policy_lists'),
+        ('GET', r'template/policy/list/(?P<list_type>[^/]+)/(?P<list_id>[^/]+)', 'get_policy_list'),
+        ('POST', r'template/policy/list/(?P<list_type>[^/]+)', 'add_policy_list'),
+        ('PUT', r'template/policy/list/(?P<list_type>[^/]+)/(?P<list_id>[^/]+)', 'update_policy_list'),
+        ('DELETE', r'template/policy/list/(?P<list_type>[^/]+)/(?P<list_id>[^/]+)', 'delete_policy_list'),
+        ('GET', r'template/policy/definition/(?P<definition_type>[^/]+)', 'get_definitions'),
+        ('GET', r'template/policy/definition/(?P<definition_type>[^/]+)/(?P<definition_id>[^/]+)', 'get_definition'),
+        ('POST', r'template/policy/definition/(?P<definition_type>[^/]+)', 'add_definition'),
+        ('PUT', r'template/policy/definition/(?P<definition_type>[^/]+)/(?P<definition_id>[^/]+)', 'update_definition'),
+        ('DELETE', r'template/policy/definition/(?P<definition_type>[^/]+)/(?P<definition_id>[^/]+)',
+         'delete_definition'),
+        ('POST', r'template/policy/vsmart/(?P<action>activate|deactivate)/(?P<policy_id>[^/]+)', 'activate_policy'),
+        ('GET', r'template/policy/(?P<kind>vedge|vsmart|security)', 'get_policies'),
+        ('POST', r'template/policy/(?P<kind>vedge|vsmart|security)', 'add_policy'),
+        ('PUT', r'template/policy/(?P<kind>vedge|vsmart|security)/(?P<policy_id>[^/]+)', 'update_policy'),
+        ('DELETE', r'template/policy/(?P<kind>vedge|vsmart|security)/(?P<policy_id>[^/]+)', 'delete_policy'),
+    ]
+    COMPILED_ROUTES = [(method, re.compile(f'^/dataservice/{pattern}/?$'), name) for method, pattern, name in ROUTES]
+
+    def log_message(self, format, *args):  #pylint: disable=redefined-builtin
+        pass
+
+    @staticmethod
+    def encode_body(body):
+        if isinstance(body, str):
+            return body.encode(), 'text/plain'
+        return json.dumps(body).encode(), 'application/json'
+
+    def send_body(self, status_code, data, content_type='application/json'):
+        self.send_response(status_code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode() if length else ''
+        if self.headers.get('Content-Type', '').startswith('application/x-www-form-urlencoded'):
+            return dict(parse_qsl(body))
+        try:
+            return json.loads(body) if body else {}
+        except ValueError:
+            # Some payloads are built as Python literals rather than JSON
+            return ast.literal_eval(body)
+
+    def handle_request(self):
+        url = urlsplit(self.path)
+        body = self.read_body()
+        if url.path.startswith('/bench/'):
+            return self.handle_control(url.path, body)
+
+        server = self.server
+        delay = server.latency + (random.uniform(0, server.jitter) if server.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        query = dict(parse_qsl(url.query))
+        with server.lock:
+            server.request_count += 1
+            for method, pattern, name in self.COMPILED_ROUTES:
+                match = pattern.match(url.path)
+                if method == self.command and match:
+                    status_code, response = getattr(self, name)(server.inventory, match.groupdict(), query, body)
+                    break
+            else:
+                server.unhandled.add(f'{self.command} {url.path}')
+                status_code, response = 404, {'error': {'message': 'Not found', 'details': url.path}}
+            # Encode while holding the lock, the response can refer to objects other requests change
+            data, content_type = self.encode_body(response)
+        return self.send_body(status_code, data, content_type)
+
+    def handle_control(self, path, body):
+        server = self.server
+        if path == '/bench/reset':
+            server.reset(**body)
+            return self.send_body(200, *self.encode_body({'devices': len(server.inventory.vedges)}))
+        if path == '/bench/stats':
+            with server.lock:
+                stats = {'requests': server.request_count, 'unhandled': sorted(server.unhandled)}
+            return self.send_body(200, *self.encode_body(stats))
+        return self.send_body(404, *self.encode_body({}))
+
+    do_GET = do_POST = do_PUT = do_DELETE = handle_request
+
+    #
+    # Login
+    #
+    def login(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        return 200, ''
+
+    def get_token(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        return 200, 'mock-token'
+
+    #
+    # Devices
+    #
+    @staticmethod
+    def filter_rows(rows, query):
+        for key, value in query.items():
+            key = 'deviceModel' if key == 'model' else key
+            rows = [row for row in rows if key not in row or str(row[key]) == value]
+        return rows
+
+    def get_device_list(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        devices = inventory.vedges if params['category'] == 'vedges' else inventory.controllers
+        return 200, {'data': self.filter_rows(list(devices.values()), query)}
+
+    def decommission(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        device = inventory.vedges.pop(params['uuid'], None)
+        if device is None:
+            return 400, {'error': {'message': 'No such device', 'details': params['uuid']}}
+        inventory.detach(device)
+        return 200, {'id': inventory.add_action([device['uuid']], 'Decommissioned')}
+
+    def get_device_status(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        return 200, {'data': self.filter_rows(inventory.get_device_status(), query)}
+
+    def get_active_count(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        return 200, {'data': {'activeTaskCount': 0}}
+
+    def get_action_status(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        rows = inventory.actions.get(params['action_id'], [])
+        return 200, {'summary': {'status': 'done', 'count': {'Success': len(rows)}}, 'data': rows}
+
+    def get_device_rows(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        return 200, {'data': inventory.get_device_rows(params['path'], query.get('deviceId'))}
+
+    #
+    # Templates
+    #
+    def get_feature_templates(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        return 200, {
+            'data':
+            [inventory.get_feature_template_summary(template) for template in inventory.feature_templates.values()]
+        }
+
+    def add_feature_template(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        return 200, {'templateId': inventory.add_feature_template(body)}
+
+    def update_feature_template(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        template = inventory.feature_templates.get(params['template_id'])
+        if template is None:
+            return 404, {'error': {'message': 'No such template', 'details': params['template_id']}}
+        template.update(body)
+        return 200, {'processId': f"process_{params['template_id']}", 'masterTemplatesAffected': []}
+
+    def delete_feature_template(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        template_id = params['template_id']
+        if inventory.references.get(template_id):
+            return 400, {'error': {'message': 'Template is in use', 'details': template_id}}
+        if inventory.feature_templates.pop(template_id, None) is None:
+            return 404, {'error': {'message': 'No such template', 'details': template_id}}
+        return 200, {}
+
+    def get_device_templates(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        return 200, {
+            'data':
+            [inventory.get_device_template_summary(template) for template in inventory.device_templates.values()]
+        }
+
+    def get_device_template(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        template = inventory.device_templates.get(params['template_id'])
+        if template is None:
+            return 404, {'error': {'message': 'No such template', 'details': params['template_id']}}
+        return 200, template
+
+    def add_device_template(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        return 200, {'templateId': inventory.add_device_template(body)}
+
+    def update_device_template(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        template = inventory.device_templates.get(params['template_id'])
+        if template is None:
+            return 404, {'error': {'message': 'No such template', 'details': params['template_id']}}
+        inventory.link(inventory.get_feature_template_ids(template), -1)
+        template.update(body)
+        inventory.link(inventory.get_feature_template_ids(template))
+        return 200, {'data': {'processId': f"process_{params['template_id']}", 'attachedDevices': []}}
+
+    def delete_device_template(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        template_id = params['template_id']
+        if inventory.attachments.get(template_id):
+            return 400, {'error': {'message': 'Template is attached to devices', 'details': template_id}}
+        template = inventory.device_templates.pop(template_id, None)
+        if template is None:
+            return 404, {'error': {'message': 'No such template', 'details': template_id}}
+        inventory.attachments.pop(template_id, None)
+        inventory.link(inventory.get_feature_template_ids(template), -1)
+        return 200, {}
+
+    def get_attached(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        devices = []
+        for device_uuid in inventory.attachments.get(params['template_id'], {}):
+            device = inventory.vedges.get(device_uuid) or inventory.controllers.get(device_uuid)
+            devices.append({
+                'host-name': device['host-name'],
+                'deviceIP': device['system-ip'],
+                'site-id': device['site-id'],
+                'uuid': device_uuid,
+                'personality': device['personality'],
+            })
+        return 200, {'data': devices}
+
+    def get_template_input(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        attachments = inventory.attachments.get(body.get('templateId'), {})
+        rows = []
+        for device_uuid in body.get('deviceIds', []):
+            if device_uuid in attachments:
+                rows.append(attachments[device_uuid])
+            elif device_uuid in inventory.vedges:
+                rows.append(inventory.get_input_row(inventory.vedges[device_uuid]))
+        columns = [{
+            'property': column,
+            'title': title,
+            'editable': editable,
+            'toolTip': title
+        } for column, title, editable in TEMPLATE_INPUT_COLUMNS]
+        return 200, {'header': {'columns': columns}, 'data': rows}
+
+    def attach(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        device_uuids = []
+        for device_template in body.get('deviceTemplateList', []):
+            template_id = device_template['templateId']
+            if template_id not in inventory.device_templates:
+                return 400, {'error': {'message': 'No such template', 'details': template_id}}
+            for row in device_template['device']:
+                device = inventory.vedges.get(row['csv-deviceId']) or inventory.controllers.get(row['csv-deviceId'])
+                if device is None:
+                    return 400, {'error': {'message': 'No such device', 'details': row['csv-deviceId']}}
+                inventory.attach(template_id, device, row)
+                device_uuids.append(device['uuid'])
+        return 200, {'id': inventory.add_action(device_uuids, 'Done - Push Feature Template Configuration')}
+
+    def detach(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        device_uuids = []
+        for entry in body.get('devices', []):
+            device = inventory.vedges.get(entry['deviceId']) or inventory.controllers.get(entry['deviceId'])
+            if device is not None:
+                inventory.detach(device)
+                device_uuids.append(device['uuid'])
+        return 200, {'id': inventory.add_action(device_uuids, 'Done - Change to CLI mode')}
+
+    #
+    # Policy lists and definitions
+    #
+    def get_policy_lists(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        list_type = params.get('list_type')
+        return 200, {
+            'data': [
+                inventory.get_list_summary(policy_list) for policy_list in inventory.policy_lists.values()
+                if list_type is None or policy_list['type'].lower() == list_type.lower()
+            ]
+        }
+
+    def get_policy_list(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        policy_list = inventory.policy_lists.get(params['list_id'])
+        if policy_list is None:
+            return 404, {'error': {'message': 'No such list', 'details': params['list_id']}}
+        return 200, inventory.get_list_summary(policy_list)
+
+    def add_policy_list(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        return 200, {'listId': inventory.add_policy_list(body)}
+
+    def update_policy_list(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        policy_list = inventory.policy_lists.get(params['list_id'])
+        if policy_list is None:
+            return 404, {'error': {'message': 'No such list', 'details': params['list_id']}}
+        policy_list.update(body)
+        return 200, {'processId': f"process_{params['list_id']}", 'masterTemplatesAffected': []}
+
+    def delete_policy_list(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        list_id = params['list_id']
+        if inventory.references.get(list_id):
+            return 400, {'error': {'message': 'List is in use', 'details': list_id}}
+        if inventory.policy_lists.pop(list_id, None) is None:
+            return 404, {'error': {'message': 'No such list', 'details': list_id}}
+        return 200, {}
+
+    def get_definitions(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        definition_type = params['definition_type'].lower()
+        return 200, {
+            'data': [
+                inventory.get_definition_summary(definition) for definition in inventory.definitions.values()
+                if definition['type'].lower() == definition_type
+            ]
+        }
+
+    def get_definition(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        definition = inventory.definitions.get(params['definition_id'])
+        if definition is None:
+            return 404, {'error': {'message': 'No such definition', 'details': params['definition_id']}}
+        return 200, dict(definition, referenceCount=inventory.references.get(definition['definitionId'], 0))
+
+    def add_definition(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        return 200, {'definitionId': inventory.add_definition(body)}
+
+    def update_definition(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        definition = inventory.definitions.get(params['definition_id'])
+        if definition is None:
+            return 404, {'error': {'message': 'No such definition', 'details': params['definition_id']}}
+        inventory.link(inventory.get_reference_ids(definition), -1)
+        definition.update(body)
+        inventory.link(inventory.get_reference_ids(definition))
+        return 200, {'processId': f"process_{params['definition_id']}", 'masterTemplatesAffected': []}
+
+    def delete_definition(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        definition_id = params['definition_id']
+        if inventory.references.get(definition_id):
+            return 400, {'error': {'message': 'Definition is in use', 'details': definition_id}}
+        definition = inventory.definitions.pop(definition_id, None)
+        if definition is None:
+            return 404, {'error': {'message': 'No such definition', 'details': definition_id}}
+        inventory.link(inventory.get_reference_ids(definition), -1)
+        return 200, {}
+
+    #
+    # Policies
+    #
+    def get_policies(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        return 200, {
+            'data': [inventory.get_policy_summary(policy) for policy in inventory.policies[params['kind']].values()]
+        }
+
+    def add_policy(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        inventory.add_policy(params['kind'], body)
+        return 200, {}
+
+    def update_policy(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        policy = inventory.policies[params['kind']].get(params['policy_id'])
+        if policy is None:
+            return 404, {'error': {'message': 'No such policy', 'details': params['policy_id']}}
+        inventory.link(inventory.get_reference_ids(policy['policyDefinition']), -1)
+        policy.update(body)
+        if isinstance(policy['policyDefinition'], str):
+            policy['policyDefinition'] = json.loads(policy['policyDefinition'])
+        inventory.link(inventory.get_reference_ids(policy['policyDefinition']))
+        vsmarts = [device for device in inventory.controllers.values() if device['deviceType'] == 'vsmart']
+        return 200, [{'deviceId': device['uuid']} for device in vsmarts]
+
+    def delete_policy(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        policy = inventory.policies[params['kind']].get(params['policy_id'])
+        if policy is None:
+            return 404, {'error': {'message': 'No such policy', 'details': params['policy_id']}}
+        if policy['isPolicyActivated']:
+            return 400, {'error': {'message': 'Policy is activated', 'details': params['policy_id']}}
+        inventory.policies[params['kind']].pop(params['policy_id'])
+        inventory.link(inventory.get_reference_ids(policy['policyDefinition']), -1)
+        return 200, {}
+
+    def activate_policy(self, inventory, params, query, body):  #pylint: disable=unused-argument
+        policy = inventory.policies['vsmart'].get(params['policy_id'])
+        if policy is None:
+            return 404, {'error': {'message': 'No such policy', 'details': params['policy_id']}}
+        policy['isPolicyActivated'] = params['action'] == 'activate'
+        vsmarts = [device['uuid'] for device in inventory.controllers.values() if device['deviceType'] == 'vsmart']
+        return 200, {'id': inventory.add_action(vsmarts, f"Done - {params['action'].title()} Policy")}
+
+
+class PlainHTTPAdapter(KeepAliveAdapter):
+    """Requests adapter that sends HTTPS requests as plain HTTP, for the mock vManage."""
+    def send(self, request, *args, **kwargs):  #pylint: disable=arguments-differ
+        if request.url.startswith('https://'):
+            request.url = 'http://' + request.url[len('https://'):]
+        return super(PlainHTTPAdapter, self).send(request, *args, **kwargs)
+
+
+def serve(queue, devices, latency, jitter):
+    server = MockVmanageServer(('127.0.0.1', 0), devices=devices, latency=latency, jitter=jitter)
+    queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+class MockVmanage(object):
+    """A mock vManage running in a process of its own.
+
+    Running the server apart from the benchmark keeps its work out of the
+    client's timings and memory.  The mock speaks plain HTTP, so sessions
+    talking to it need to be passed to mount first.
+
+    """
+    def __init__(self, devices=100, latency=0.0, jitter=0.0):
+        """Start the mock vManage.
+
+        Args:
+            devices (int): Number of vEdges
+            latency (float): Seconds each response is delayed by
+            jitter (float): Up to this many seconds more are added at random
+
+        """
+
+        queue = multiprocessing.Queue()
+        self.process = multiprocessing.Process(target=serve, args=(queue, devices, latency, jitter), daemon=True)
+        self.process.start()
+        self.host = '127.0.0.1'
+        self.port = queue.get(timeout=30)
+        self.control_url = f'http://{self.host}:{self.port}/bench/'
+
+    def mount(self, session, pool_maxsize=DEFAULT_POOL_MAXSIZE):
+        """Send the HTTPS requests a session makes to the mock as plain HTTP.
+
+        Args:
+            session (obj): Requests Session object
+            pool_maxsize (int): Maximum number of connections kept to the mock
+
+        """
+
+        session.mount(f'https://{self.host}:{self.port}/', PlainHTTPAdapter(pool_maxsize=pool_maxsize))
+
+    def reset(self, devices=100, latency=0.0, jitter=0.0, empty=None):
+        """Replace the inventory of the mock (see MockVmanageServer.reset)."""
+
+        response = requests.post(f'{self.control_url}reset',
+                                 json={
+                                     'devices': devices,
+                                     'latency': latency,
+                                     'jitter': jitter,
+                                     'empty': empty
+                                 },
+                                 timeout=CONTROL_TIMEOUT)
+        response.raise_for_status()
+
+    def get_stats(self):
+        """Get the number of requests served and the paths that were not mocked."""
+
+        return requests.get(f'{self.control_url}stats', timeout=CONTROL_TIMEOUT).json()
+
+    def stop(self):
+        self.process.terminate()
+        self.process.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
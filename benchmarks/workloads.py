@@ -0,0 +1,172 @@
+"""Benchmark Workloads.
+
+Each workload has an untimed setup, which gets the mock vManage into the
+state the workload starts from, and a timed run, which returns the number
+of objects it processed.
+"""
+
+from vmanage.api.central_policy import CentralPolicy
+from vmanage.api.device import Device
+from vmanage.api.device_templates import DeviceTemplates
+from vmanage.api.feature_templates import FeatureTemplates
+from vmanage.api.local_policy import LocalPolicy
+from vmanage.api.monitor_network import MonitorNetwork
+from vmanage.api.policy_definitions import PolicyDefinitions
+from vmanage.api.policy_lists import PolicyLists
+from vmanage.apps.clean import CleanVmanage
+from vmanage.data.policy_data import PolicyData
+from vmanage.data.template_data import TemplateData
+
+
+def export_policies(bench):
+    policy_data = PolicyData(bench.session, bench.host, bench.port)
+    return {
+        'policy_lists': PolicyLists(bench.session, bench.host, bench.port).get_policy_list_list(),
+        'policy_definitions': policy_data.export_policy_definition_list(),
+        'local_policies': policy_data.export_local_policy_list(),
+        'central_policies': policy_data.export_central_policy_list(),
+    }
+
+
+def run_template_export(bench, args):  #pylint: disable=unused-argument
+    feature_templates = FeatureTemplates(bench.session, bench.host, bench.port).get_feature_template_list()
+    device_templates = TemplateData(bench.session, bench.host, bench.port).export_device_template_list()
+    return len(feature_templates) + len(device_templates)
+
+
+def setup_template_import(bench):
+    feature_templates = FeatureTemplates(bench.session, bench.host, bench.port).get_feature_template_list()
+    device_templates = TemplateData(bench.session, bench.host, bench.port).export_device_template_list()
+    bench.reset(empty=['templates'])
+    return feature_templates, device_templates
+
+
+def run_template_import(bench, args):
+    feature_templates, device_templates = args
+    template_data = TemplateData(bench.session, bench.host, bench.port)
+    updates = template_data.import_feature_template_list(feature_templates)
+    updates.extend(template_data.import_device_template_list(device_templates))
+    return len(updates)
+
+
+def setup_attachment_import(bench):
+    bench.reset(empty=['attachments'])
+    device_templates = DeviceTemplates(bench.session, bench.host, bench.port).get_device_templates()
+    attachment_list = []
+    for number, device in enumerate(Device(bench.session, bench.host, bench.port).get_device_list('vedges')):
+        attachment_list.append({
+            'template': device_templates[number % len(device_templates)]['templateName'],
+            'device_type': 'vedge',
+            'uuid': device['uuid'],
+            'host_name': device['host-name'],
+            'site_id': device['site-id'],
+            'system_ip': device['system-ip'],
+            'variables': {
+                'system_host_name': device['host-name'],
+                'system_system_ip': device['system-ip'],
+                'system_site_id': device['site-id'],
+                'vpn_if_name': 'ge0/0',
+                'vpn_if_ip': f"{device['system-ip']}/24",
+            },
+        })
+    return attachment_list
+
+
+def run_attachment_import(bench, args):
+    result = TemplateData(bench.session, bench.host, bench.port).import_attachment_list(args, update=True)
+    if result['failures']:
+        raise RuntimeError(f"{len(result['failures'])} attachments failed")
+    return len(result['updates'])
+
+
+def setup_clean_all(bench):
+    # Count what is going to be removed
+    device = Device(bench.session, bench.host, bench.port)
+    policy_definitions = PolicyDefinitions(bench.session, bench.host, bench.port)
+    return sum([
+        len(device.get_device_list('vedges')),
+        len(FeatureTemplates(bench.session, bench.host, bench.port).get_feature_template_list()),
+        len(DeviceTemplates(bench.session, bench.host, bench.port).get_device_templates()),
+        len(PolicyLists(bench.session, bench.host, bench.port).get_policy_list_list()),
+        sum(
+            len(policy_definitions.get_policy_definition_summary_list(definition_type))
+            for definition_type in policy_definitions.get_definition_types()),
+        len(LocalPolicy(bench.session, bench.host, bench.port).get_local_policy()),
+        len(CentralPolicy(bench.session, bench.host, bench.port).get_central_policy()),
+    ])
+
+
+def run_clean_all(bench, args):
+    CleanVmanage(bench.session, bench.host, bench.port).clean_all()
+    return args
+
+
+def setup_monitor_sweep(bench):
+    return [device['system-ip'] for device in Device(bench.session, bench.host, bench.port).get_device_list('vedges')]
+
+
+def run_monitor_sweep(bench, args):
+    count = 0
+    for system_ip, result in MonitorNetwork(bench.session, bench.host, bench.port).collect('get_bfd_sessions', args):
+        if isinstance(result, Exception):
+            raise RuntimeError(f"BFD sessions of {system_ip} failed: {result}")
+        count += 1
+    return count
+
+
+def run_policy_export(bench, args):  #pylint: disable=unused-argument
+    return sum(len(policies) for policies in export_policies(bench).values())
+
+
+def setup_policy_import(bench):
+    policies = export_policies(bench)
+    bench.reset(empty=['policies'])
+    return policies
+
+
+def run_policy_import(bench, args):
+    policy_data = PolicyData(bench.session, bench.host, bench.port)
+    updates = policy_data.import_policy_list_list(args['policy_lists'])
+    updates.extend(policy_data.import_policy_definition_list(args['policy_definitions']))
+    updates.extend(policy_data.import_local_policy_list(args['local_policies']))
+    updates.extend(policy_data.import_central_policy_list(args['central_policies']))
+    return len(updates)
+
+
+WORKLOADS = {
+    'template-export': {
+        'description': 'Export feature and device templates, with attachments and input',
+        'setup': None,
+        'run': run_template_export,
+    },
+    'template-import': {
+        'description': 'Import feature and device templates into an empty vManage',
+        'setup': setup_template_import,
+        'run': run_template_import,
+    },
+    'attachment-import': {
+        'description': 'Attach every device to its device template',
+        'setup': setup_attachment_import,
+        'run': run_attachment_import,
+    },
+    'clean-all': {
+        'description': 'Remove policies, attachments, devices and templates',
+        'setup': setup_clean_all,
+        'run': run_clean_all,
+    },
+    'monitor-sweep': {
+        'description': 'Query the BFD sessions of every device',
+        'setup': setup_monitor_sweep,
+        'run': run_monitor_sweep,
+    },
+    'policy-export': {
+        'description': 'Export policy lists, definitions and policies, converting IDs to names',
+        'setup': None,
+        'run': run_policy_export,
+    },
+    'policy-import': {
+        'description': 'Import policy lists, definitions and policies, converting names to IDs',
+        'setup': setup_policy_import,
+        'run': run_policy_import,
+    },
+}
@@ -0,0 +1,26 @@
+from vmanage.aio.session import AsyncSession
+from vmanage.aio.api import Device, MonitorNetwork
+import asyncio
+import pprint
+import os
+
+vmanage_host = os.environ.get('VMANAGE_HOST')
+vmanage_username = os.environ.get('VMANAGE_USERNAME')
+vmanage_password = os.environ.get('VMANAGE_PASSWORD')
+pp = pprint.PrettyPrinter(indent=2)
+
+
+async def main():
+    async with await AsyncSession.login(vmanage_host, vmanage_username, vmanage_password,
+                                        concurrency=50) as aio_session:
+        vmanage_device = Device(aio_session, vmanage_host)
+        vmanage_monitor = MonitorNetwork(aio_session, vmanage_host)
+
+        device_list = await vmanage_device.get_device_status_list()
+        system_ips = [device['system-ip'] for device in device_list if device['reachability'] == 'reachable']
+        bfd_sessions = await asyncio.gather(*[vmanage_monitor.get_bfd_sessions(ip) for ip in system_ips],
+                                            return_exceptions=True)
+        pp.pprint(dict(zip(system_ips, bfd_sessions)))
+
+
+asyncio.run(main())
@@ -0,0 +1,70 @@
+"""Shared fixtures for the unit tests.
+"""
+
+import io
+import json
+
+import pytest
+import requests
+from vmanage.api.transport import Transport
+
+HOST = 'vmanage.test'
+
+
+class FakeClock(object):
+    """Stand-in for the time module whose clock only moves when told to."""
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class FakeVmanageSession(requests.Session):
+    """Requests session answering from canned data instead of a vManage.
+
+    Attributes:
+        data (dict): The 'data' array served for each API path
+        calls (list): (method, API path) of every call made
+
+    """
+    def __init__(self, data=None):
+        super(FakeVmanageSession, self).__init__()
+        self.data = data or {}
+        self.calls = []
+        Transport(self, rate_limit=False)
+
+    def request(self, method, url, *args, **kwargs):  #pylint: disable=arguments-differ,unused-argument
+        path = url.split('/dataservice/', 1)[1]
+        self.calls.append((method, path))
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers['Content-Type'] = 'application/json'
+        response._content = json.dumps({'data': self.data.get(path, [])}).encode('utf-8')  #pylint: disable=protected-access
+        response.raw = io.BytesIO(response.content)
+        return response
+
+    def count(self, path):
+        """Get the number of calls made to an API path."""
+
+        return len([call for call in self.calls if call[1] == path])
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def fake_session():
+    return FakeVmanageSession()
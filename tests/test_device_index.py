@@ -0,0 +1,77 @@
+#pylint: disable=redefined-outer-name
+import pytest
+from vmanage.data import device_index
+from vmanage.data.device_index import DEFAULT_MAX_AGE, DeviceIndex
+
+BASE_URL = 'https://vmanage.test:443/dataservice/'
+
+
+@pytest.fixture
+def index(monkeypatch, clock, fake_session):
+    monkeypatch.setattr(device_index, 'time', clock)
+    fake_session.data['device'] = [
+        {
+            'uuid': 'a',
+            'system-ip': '1.1.1.1',
+            'host-name': 'vedge-a',
+            'site-id': 100
+        },
+        {
+            'uuid': 'b',
+            'system-ip': '1.1.1.2',
+            'host-name': 'vedge-b',
+            'site-id': 100
+        },
+    ]
+    return DeviceIndex(fake_session, 'vmanage.test')
+
+
+def test_status_list_is_fetched_once(index, fake_session):
+    assert index.get_device_status('1.1.1.1')['uuid'] == 'a'
+    assert index.get_device_status('vedge-b', key='host-name')['uuid'] == 'b'
+    assert len(index.get_device_status_list()) == 2
+    assert fake_session.count('device') == 1
+
+
+def test_lookups(index):
+    assert [device['uuid'] for device in index.get_devices('100', key='site-id')] == ['a', 'b']
+    assert index.get_device_status('9.9.9.9') == {}
+    # Keys that aren't indexed are matched by a scan
+    assert index.get_device_status('1.1.1.2', key='system-ip')['host-name'] == 'vedge-b'
+
+
+def test_refetched_once_older_than_max_age(index, fake_session, clock):
+    index.get_device_status_list()
+    clock.advance(DEFAULT_MAX_AGE)
+    index.get_device_status_list()
+    assert fake_session.count('device') == 1
+
+    clock.advance(1)
+    index.get_device_status_list()
+    assert fake_session.count('device') == 2
+
+
+@pytest.mark.parametrize('api', ['device/action/reboot', 'template/device/config/attachfeature'])
+def test_refetched_after_device_state_changes(index, fake_session, api):
+    index.get_device_status_list()
+    fake_session.transport.cache.invalidate_url('POST', BASE_URL + api)
+    index.get_device_status_list()
+
+    assert fake_session.count('device') == 2
+
+
+def test_unrelated_writes_keep_the_index(index, fake_session):
+    index.get_device_status_list()
+    fake_session.transport.cache.invalidate_url('POST', BASE_URL + 'template/policy/list/site')
+    index.get_device_status_list()
+
+    assert fake_session.count('device') == 1
+
+
+def test_refresh(index, fake_session):
+    index.get_device_status_list()
+    fake_session.data['device'] = []
+    index.refresh()
+
+    assert index.get_device_status_list() == []
+    assert fake_session.count('device') == 2
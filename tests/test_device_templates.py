@@ -0,0 +1,53 @@
+from vmanage.api.device_templates import DeviceTemplates
+
+
+def template(template_id, count):
+    return {
+        'templateId': template_id,
+        'isEdited': False,
+        'device': [{
+            'csv-deviceId': f'{template_id}-{index}'
+        } for index in range(count)],
+    }
+
+
+def device_ids(batch):
+    return [device['csv-deviceId'] for entry in batch for device in entry['device']]
+
+
+def test_small_templates_share_a_batch():
+    batches = DeviceTemplates.get_attach_batches([template('a', 2), template('b', 3)], 10)
+
+    assert len(batches) == 1
+    assert [entry['templateId'] for entry in batches[0]] == ['a', 'b']
+
+
+def test_large_template_is_spread_over_batches():
+    batches = DeviceTemplates.get_attach_batches([template('a', 25)], 10)
+
+    assert [len(device_ids(batch)) for batch in batches] == [10, 10, 5]
+    assert all(entry['templateId'] == 'a' and not entry['isEdited'] for batch in batches for entry in batch)
+
+
+def test_batches_are_filled_across_templates():
+    batches = DeviceTemplates.get_attach_batches([template('a', 7), template('b', 7)], 10)
+
+    assert [len(device_ids(batch)) for batch in batches] == [10, 4]
+    assert [(entry['templateId'], len(entry['device'])) for entry in batches[0]] == [('a', 7), ('b', 3)]
+    assert [(entry['templateId'], len(entry['device'])) for entry in batches[1]] == [('b', 4)]
+
+
+def test_every_device_is_kept_in_order():
+    device_template_list = [template('a', 13), template('b', 0), template('c', 8)]
+    batches = DeviceTemplates.get_attach_batches(device_template_list, 5)
+
+    expected = [device['csv-deviceId'] for entry in device_template_list for device in entry['device']]
+    assert [device_id for batch in batches for device_id in device_ids(batch)] == expected
+    assert all(len(device_ids(batch)) <= 5 for batch in batches)
+
+
+def test_input_is_not_changed():
+    device_template_list = [template('a', 4)]
+    DeviceTemplates.get_attach_batches(device_template_list, 3)
+
+    assert len(device_template_list[0]['device']) == 4
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+import yaml
+from vmanage.apps.export_writer import ExportWriter
+
+SECTIONS = [
+    ('vmanage_feature_templates', [{
+        'templateName': 'system',
+        'templateDefinition': {
+            'clock': {
+                'timezone': 'UTC'
+            },
+            'tags': ['a', 'b']
+        }
+    }, {
+        'templateName': 'café',
+        'devices': []
+    }]),
+    ('vmanage_device_templates', []),
+    ('vmanage_policy_lists', [{
+        'name': 'sites',
+        'entries': [{
+            'siteId': '100-200'
+        }],
+        'multiline': 'first\nsecond'
+    }]),
+]
+
+
+def write(tmpdir, name, sections, **kwargs):
+    export_file = str(tmpdir.join(name))
+    # Sections are consumed from generators, as the exports produce them
+    ExportWriter(export_file, **kwargs).write([(section, iter(items)) for section, items in sections])
+    with open(export_file, encoding='utf-8') as infile:
+        return infile.read()
+
+
+@pytest.mark.parametrize('sections', [SECTIONS, SECTIONS[1:2], []])
+def test_json_matches_json_dump(tmpdir, sections):
+    assert write(tmpdir, 'export.json', sections) == json.dumps(dict(sections), indent=4)
+
+
+@pytest.mark.parametrize('sections', [SECTIONS, SECTIONS[1:2], []])
+def test_yaml_matches_yaml_dump(tmpdir, sections):
+    assert write(tmpdir, 'export.yaml', sections) == yaml.dump(dict(sections))
+
+
+def test_yaml_options(tmpdir):
+    options = {'default_flow_style': False, 'sort_keys': False, 'allow_unicode': True}
+
+    assert write(tmpdir, 'export.yml', SECTIONS, yaml_options=options) == yaml.dump(dict(SECTIONS), **options)
+
+
+def test_failed_export_keeps_the_previous_file(tmpdir):
+    export_file = tmpdir.join('export.json')
+    export_file.write('previous')
+
+    def failing():
+        yield {'name': 'first'}
+        raise RuntimeError('lost the connection')
+
+    with pytest.raises(RuntimeError):
+        ExportWriter(str(export_file)).write([('vmanage_policy_lists', failing())])
+
+    assert export_file.read() == 'previous'
+    assert tmpdir.listdir() == [export_file]
+
+
+def test_unsupported_format(tmpdir):
+    with pytest.raises(Exception):
+        ExportWriter(str(tmpdir.join('export.txt')))
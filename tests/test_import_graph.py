@@ -0,0 +1,136 @@
+import pytest
+from vmanage.data.import_graph import ImportGraph, build_policy_graph, build_template_graph
+
+
+def names(wave, kind, key='name'):
+    return [item[key] for item in wave.get(kind, [])]
+
+
+def test_independent_objects_share_a_wave():
+    graph = ImportGraph()
+    graph.add('policy_list', {'name': 'a'})
+    graph.add('policy_list', {'name': 'b'})
+
+    waves = graph.get_waves()
+
+    assert len(waves) == 1
+    assert names(waves[0], 'policy_list') == ['a', 'b']
+
+
+def test_objects_follow_their_dependencies():
+    graph = ImportGraph()
+    first = graph.add('policy_list', {'name': 'first'})
+    second = graph.add('policy_definition', {'name': 'second'})
+    third = graph.add('central_policy', {'name': 'third'})
+    graph.add_dependency(third, second)
+    graph.add_dependency(second, first)
+
+    waves = graph.get_waves()
+
+    assert [list(wave) for wave in waves] == [['policy_list'], ['policy_definition'], ['central_policy']]
+
+
+def test_self_reference_is_ignored():
+    graph = ImportGraph()
+    node = graph.add('policy_list', {'name': 'a'})
+    graph.add_dependency(node, node)
+
+    assert len(graph.get_waves()) == 1
+
+
+def test_cycle_raises():
+    graph = ImportGraph()
+    first = graph.add('policy_definition', {'name': 'a'})
+    second = graph.add('policy_definition', {'name': 'b'})
+    graph.add('policy_list', {'name': 'c'})
+    graph.add_dependency(first, second)
+    graph.add_dependency(second, first)
+
+    with pytest.raises(RuntimeError):
+        graph.get_waves()
+
+
+def test_empty_graph_has_no_waves():
+    assert ImportGraph().get_waves() == []
+
+
+def test_template_graph():
+    feature_templates = [{'templateName': 'system'}, {'templateName': 'vpn0'}, {'templateName': 'unused'}]
+    device_templates = [{
+        'templateName':
+        'branch',
+        'generalTemplates': [
+            {
+                'templateName': 'system'
+            },
+            {
+                'templateName': 'Factory_Default_AAA',
+            },
+            {
+                'templateName': 'vpn',
+                'subTemplates': [{
+                    'templateName': 'vpn0'
+                }],
+            },
+        ],
+    }]
+
+    waves = build_template_graph(feature_templates, device_templates).get_waves()
+
+    assert names(waves[0], 'feature_template', 'templateName') == ['system', 'vpn0', 'unused']
+    assert names(waves[1], 'device_template', 'templateName') == ['branch']
+
+
+def test_policy_graph():
+    policy_lists = [{'name': 'sites', 'type': 'site'}, {'name': 'colors', 'type': 'color'}]
+    definitions = [
+        {
+            'name': 'hub',
+            'type': 'hubAndSpoke',
+            'definition': {
+                'subDefinitions': [{
+                    'tlocList': 'colors'
+                }]
+            },
+        },
+        {
+            'name': 'plain',
+            'type': 'control',
+            'sequences': [],
+        },
+    ]
+    central_policies = [{
+        'policyName': 'central',
+        'policyDefinition': {
+            'assembly': [{
+                'definitionName': 'hub',
+                'type': 'hubAndSpoke',
+                'entries': [{
+                    'siteLists': ['sites']
+                }],
+            }],
+        },
+    }]
+
+    waves = build_policy_graph(policy_lists, definitions, central_policies, [], []).get_waves()
+
+    assert names(waves[0], 'policy_list') == ['sites', 'colors']
+    assert names(waves[0], 'policy_definition') == ['plain']
+    assert names(waves[1], 'policy_definition') == ['hub']
+    assert names(waves[2], 'central_policy', 'policyName') == ['central']
+
+
+def test_policy_graph_matches_definitions_by_type():
+    definitions = [{'name': 'same', 'type': 'control'}, {'name': 'same', 'type': 'data'}]
+    local_policies = [{
+        'policyName': 'local',
+        'policyDefinition': {
+            'assembly': [{
+                'definitionName': 'same',
+                'type': 'data'
+            }]
+        },
+    }]
+    graph = build_policy_graph([], definitions, [], local_policies, [])
+
+    assert graph.dependencies[2] == {1}
@@ -0,0 +1,76 @@
+from vmanage.data.inventory_store import InventoryStore
+
+
+def device(uuid, **fields):
+    return dict({'uuid': uuid, 'reachability': 'reachable', 'lastupdated': 0}, **fields)
+
+
+def refresh(store, devices):
+    store.iter_devices = lambda: iter(devices)
+    return store.refresh()
+
+
+def uuids(devices):
+    return sorted(item['uuid'] for item in devices)
+
+
+def test_first_refresh_adds_everything(fake_session):
+    store = InventoryStore(fake_session, 'vmanage.test')
+    changes = refresh(store, [device('a'), device('b')])
+
+    assert changes['snapshot'] == 1
+    assert uuids(changes['added']) == ['a', 'b']
+    assert changes['changed'] == [] and changes['removed'] == []
+
+
+def test_changes_since_a_snapshot(fake_session):
+    store = InventoryStore(fake_session, 'vmanage.test')
+    first = refresh(store, [device('a'), device('b'), device('c')])['snapshot']
+    refresh(store, [device('a', reachability='unreachable'), device('b'), device('d')])
+
+    changes = store.changes_since(first)
+    assert changes['snapshot'] == 2
+    assert uuids(changes['added']) == ['d']
+    assert uuids(changes['changed']) == ['a']
+    assert changes['removed'] == ['c']
+    assert uuids(store.changes_since(0)['added']) == ['a', 'b', 'd']
+
+
+def test_ignored_fields_are_not_changes(fake_session):
+    store = InventoryStore(fake_session, 'vmanage.test')
+    refresh(store, [device('a')])
+    changes = refresh(store, [device('a', lastupdated=5)])
+
+    assert changes['snapshot'] == 1
+    assert changes['changed'] == []
+    assert store.get_device_dict()['a']['lastupdated'] == 5
+
+
+def test_devices_that_came_and_went_are_not_reported(fake_session):
+    store = InventoryStore(fake_session, 'vmanage.test')
+    first = refresh(store, [device('a')])['snapshot']
+    refresh(store, [device('a'), device('b')])
+    refresh(store, [device('a')])
+
+    changes = store.changes_since(first)
+    assert changes['snapshot'] == 3
+    assert changes['added'] == [] and changes['removed'] == []
+
+
+def test_removed_device_that_returns_is_added_again(fake_session):
+    store = InventoryStore(fake_session, 'vmanage.test')
+    refresh(store, [device('a'), device('b')])
+    second = refresh(store, [device('a')])['snapshot']
+    refresh(store, [device('a'), device('b')])
+
+    changes = store.changes_since(second)
+    assert uuids(changes['added']) == ['b']
+    assert changes['removed'] == []
+
+
+def test_refresh_streams_the_source(fake_session):
+    fake_session.data['device'] = [device('a'), {'no-uuid': True}]
+    store = InventoryStore(fake_session, 'vmanage.test')
+
+    assert uuids(store.refresh()['added']) == ['a']
+    assert fake_session.count('device') == 1
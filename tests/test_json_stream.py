@@ -0,0 +1,53 @@
+import json
+
+import pytest
+from vmanage.data.json_stream import iter_json_array
+
+DOCUMENT = {
+    'header': {
+        'columns': [{
+            'title': 'data [with brackets]'
+        }],
+        'data': 'not this one'
+    },
+    'data': [{
+        'host-name': 'vedge-1',
+        'note': 'quote " and backslash \\ and brace }'
+    }, 12.5, 'text', None, True, [1, 2], {
+        'name': 'café ☃'
+    }],
+}
+
+
+def chunked(data, size):
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 64, 100000])
+def test_matches_json_loads(size):
+    data = json.dumps(DOCUMENT, ensure_ascii=False).encode('utf-8')
+
+    assert list(iter_json_array(chunked(data, size))) == DOCUMENT['data']
+
+
+def test_other_key():
+    data = json.dumps({'header': {}, 'devices': [1, 2]}).encode('utf-8')
+
+    assert list(iter_json_array([data], key='devices')) == [1, 2]
+
+
+def test_missing_key():
+    assert not list(iter_json_array([b'{"header": {}}']))
+
+
+def test_empty_array():
+    assert not list(iter_json_array([b'{"data": [ ]}']))
+
+
+def test_number_split_across_chunks():
+    assert list(iter_json_array([b'{"data": [12', b'34, 5]}'])) == [1234, 5]
+
+
+def test_truncated_document():
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'{"data": [{"a": 1}, {"b"']))
@@ -0,0 +1,86 @@
+#pylint: disable=redefined-outer-name
+import pytest
+from vmanage.data import policy_index
+from vmanage.data.policy_index import DEFAULT_RELOAD_INTERVAL, PolicyIndex
+
+BASE_URL = 'https://vmanage.test:443/dataservice/'
+LISTS = 'template/policy/list'
+
+
+@pytest.fixture
+def index(monkeypatch, clock, fake_session):
+    monkeypatch.setattr(policy_index, 'time', clock)
+    fake_session.data[LISTS] = [{'listId': 'list-1', 'name': 'sites', 'type': 'site'}]
+    return PolicyIndex(fake_session, 'vmanage.test')
+
+
+def test_catalog_is_loaded_once(index, fake_session):
+    assert index.get_id('list', 'sites') == 'list-1'
+    assert index.get_name('list', 'list-1') == 'sites'
+    assert index.get_id('list', 'sites', 'site') == 'list-1'
+    assert fake_session.count(LISTS) == 1
+
+
+def test_index_is_shared_by_the_session(index, fake_session):
+    assert PolicyIndex.from_session(fake_session, 'vmanage.test') is index
+    assert PolicyIndex.from_session(fake_session, 'other.test') is not index
+
+
+def test_miss_reloads_at_most_once_per_interval(index, fake_session, clock):
+    assert index.get_id('list', 'colors') is None
+    assert fake_session.count(LISTS) == 2
+
+    fake_session.data[LISTS].append({'listId': 'list-2', 'name': 'colors', 'type': 'color'})
+    assert index.get_id('list', 'colors') is None
+    assert fake_session.count(LISTS) == 2
+
+    clock.advance(DEFAULT_RELOAD_INTERVAL)
+    assert index.get_id('list', 'colors') == 'list-2'
+    assert fake_session.count(LISTS) == 3
+
+
+def test_write_through_the_session_reloads(index, fake_session):
+    index.get_id('list', 'sites')
+    fake_session.data[LISTS] = [{'listId': 'list-3', 'name': 'sites', 'type': 'site'}]
+    fake_session.transport.cache.invalidate_url('PUT', BASE_URL + 'template/policy/list/site/list-1')
+
+    assert index.get_id('list', 'sites') == 'list-3'
+    assert fake_session.count(LISTS) == 2
+
+
+def test_objects_created_through_the_session_are_added(index, fake_session):
+    index.get_id('list', 'sites')
+    fake_session.transport.cache.invalidate_url('POST', BASE_URL + 'template/policy/list/color')
+    index.add('list', {'listId': 'list-2', 'name': 'colors', 'type': 'color'})
+
+    assert index.get_id('list', 'colors') == 'list-2'
+    assert index.get_id('list', 'sites') == 'list-1'
+    assert fake_session.count(LISTS) == 1
+
+
+def test_other_writes_are_not_hidden_by_an_add(index, fake_session):
+    index.get_id('list', 'sites')
+    fake_session.transport.cache.invalidate_url('DELETE', BASE_URL + 'template/policy/list/site/list-1')
+    fake_session.transport.cache.invalidate_url('POST', BASE_URL + 'template/policy/list/color')
+    index.add('list', {'listId': 'list-2', 'name': 'colors', 'type': 'color'})
+    fake_session.data[LISTS] = []
+
+    assert index.get_id('list', 'sites') is None
+
+
+def test_definitions_are_loaded_per_type(index, fake_session):
+    fake_session.data['template/policy/definition/data'] = [{'definitionId': 'def-1', 'name': 'dpi', 'type': 'data'}]
+
+    assert index.get_id('definition', 'dpi', 'data') == 'def-1'
+    assert index.get_id('definition', 'dpi', 'data') == 'def-1'
+    assert fake_session.count('template/policy/definition/data') == 1
+    with pytest.raises(ValueError):
+        index.get_id('definition', 'dpi')
+
+
+def test_invalidate(index, fake_session):
+    index.get_id('list', 'sites')
+    index.invalidate('list')
+    index.get_id('list', 'sites')
+
+    assert fake_session.count(LISTS) == 2
@@ -0,0 +1,102 @@
+#pylint: disable=redefined-outer-name
+import pytest
+import requests
+from vmanage.api import rate_limit
+from vmanage.api.rate_limit import MAX_THROTTLE_DELAY, RateLimiter, TokenBucket, get_retry_delay
+
+BASE_URL = 'https://vmanage.test:443/dataservice/'
+
+
+@pytest.fixture
+def fake_time(monkeypatch, clock):
+    monkeypatch.setattr(rate_limit, 'time', clock)
+    return clock
+
+
+def throttled(retry_after=None):
+    response = requests.Response()
+    response.status_code = 429
+    if retry_after is not None:
+        response.headers['Retry-After'] = retry_after
+    return response
+
+
+def test_burst_is_free(fake_time):
+    bucket = TokenBucket(rate=10, burst=5)
+    for _ in range(5):
+        bucket.acquire()
+
+    assert fake_time.now == 1000.0
+
+
+def test_calls_past_the_burst_are_paced(fake_time):
+    bucket = TokenBucket(rate=10, burst=5)
+    for _ in range(15):
+        bucket.acquire()
+
+    assert fake_time.now - 1000.0 == pytest.approx(1.0)
+
+
+def test_bucket_refills_while_idle(fake_time):
+    bucket = TokenBucket(rate=10, burst=5)
+    for _ in range(5):
+        bucket.acquire()
+    fake_time.advance(10)
+    start = fake_time.now
+    for _ in range(5):
+        bucket.acquire()
+
+    assert fake_time.now == start
+
+
+def test_throttle_holds_off_and_slows_down(fake_time):
+    bucket = TokenBucket(rate=10, burst=5)
+    bucket.throttle(2.0)
+    bucket.acquire()
+
+    assert fake_time.now - 1000.0 == pytest.approx(2.0)
+    assert bucket.rate == 5
+
+
+def test_rate_recovers(fake_time):  #pylint: disable=unused-argument
+    bucket = TokenBucket(rate=10, burst=5)
+    bucket.throttle(0)
+    for _ in range(20):
+        bucket.recover()
+
+    assert bucket.rate == 10
+
+
+def test_retry_after_seconds():
+    assert get_retry_delay(throttled('7'), 0) == 7
+
+
+def test_retry_after_is_capped():
+    assert get_retry_delay(throttled('3600'), 0) == MAX_THROTTLE_DELAY
+
+
+def test_backoff_without_retry_after():
+    assert get_retry_delay(throttled(), 0) < get_retry_delay(throttled(), 2)
+
+
+def test_families_get_their_own_bucket():
+    limiter = RateLimiter()
+
+    assert limiter.get_bucket(BASE_URL + 'device/action/status/1') is limiter.buckets['device/action']
+    assert limiter.get_bucket(BASE_URL + 'device/bfd/sessions') is limiter.buckets['device']
+    assert limiter.get_bucket(BASE_URL + 'template/feature') is limiter.buckets['template']
+    assert limiter.get_bucket(BASE_URL + 'admin/user') is limiter.default_bucket
+
+
+def test_throttled_call_is_returned_to_the_caller(fake_time):
+    limiter = RateLimiter()
+    responses = []
+
+    def send():
+        responses.append(throttled('1'))
+        return responses[-1]
+
+    assert limiter.request(BASE_URL + 'device/bfd/sessions', send) is responses[0]
+    assert len(responses) == 1
+    limiter.request(BASE_URL + 'device/bfd/sessions', send)
+    assert fake_time.now - 1000.0 == pytest.approx(1.0)
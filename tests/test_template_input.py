@@ -0,0 +1,24 @@
+from vmanage.api.template_input import get_chunks
+
+
+def test_no_items():
+    assert get_chunks([], 50) == []
+
+
+def test_fits_in_one_chunk():
+    assert get_chunks([1, 2, 3], 50) == [[1, 2, 3]]
+
+
+def test_chunks_are_evened_out():
+    chunks = get_chunks(list(range(101)), 50)
+
+    assert [len(chunk) for chunk in chunks] == [34, 34, 33]
+    assert [item for chunk in chunks for item in chunk] == list(range(101))
+
+
+def test_exact_multiple():
+    assert [len(chunk) for chunk in get_chunks(list(range(100)), 50)] == [50, 50]
+
+
+def test_chunk_size_below_one():
+    assert get_chunks([1, 2], 0) == [[1], [2]]
@@ -0,0 +1,55 @@
+import click
+import pytest
+from vmanage.__main__ import parse_timeouts as parse_timeouts_option
+from vmanage.api.timeouts import DEFAULT_CONNECT_TIMEOUT, TimeoutProfiles, parse_timeouts
+
+BASE_URL = 'https://vmanage.test:443/dataservice/'
+
+
+def test_parse_read_timeout():
+    assert parse_timeouts('device=45') == [('device', None, 45.0)]
+
+
+def test_parse_connect_and_read_timeouts():
+    assert parse_timeouts(['statistics=3:90']) == [('statistics', 3.0, 90.0)]
+
+
+def test_parse_separated_settings():
+    assert parse_timeouts(['default=20, device=45', 'template/feature=2:15']) == [
+        ('default', None, 20.0),
+        ('device', None, 45.0),
+        ('template/feature', 2.0, 15.0),
+    ]
+
+
+@pytest.mark.parametrize('spec', ['device', '=10', 'device=soon', 'device=1:soon'])
+def test_parse_invalid_setting(spec):
+    with pytest.raises(ValueError):
+        parse_timeouts(spec)
+
+
+def test_cli_option_builds_profiles():
+    profiles = parse_timeouts_option(None, None, ('default=20', 'device=3:45'))
+
+    assert profiles.get_timeout(BASE_URL + 'device/bfd/sessions') == (3.0, 45.0)
+    assert profiles.get_timeout(BASE_URL + 'template/feature') == (DEFAULT_CONNECT_TIMEOUT, 20.0)
+
+
+def test_cli_option_rejects_invalid_setting():
+    with pytest.raises(click.BadParameter):
+        parse_timeouts_option(None, None, ('device', ))
+
+
+def test_profiles_match_the_most_specific_family():
+    profiles = TimeoutProfiles()
+
+    assert profiles.get_timeout(BASE_URL + 'device/action/software/install') == (5, 600)
+    assert profiles.get_timeout(BASE_URL + 'device/action/status/123') == (5, 30)
+    assert profiles.get_timeout(BASE_URL + 'template/feature') == (profiles.connect, profiles.read)
+
+
+def test_path_prefix_wins_over_profiles():
+    profiles = TimeoutProfiles().update('device/bfd=90')
+
+    assert profiles.get_timeout(BASE_URL + 'device/bfd/sessions?deviceId=1.1.1.1') == (DEFAULT_CONNECT_TIMEOUT, 90.0)
+    assert profiles.get_timeout(BASE_URL + 'device/ospf/neighbor') == (5, 30)
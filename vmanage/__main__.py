@@ -9,7 +9,12 @@ from vmanage.cli.clean import clean
 from vmanage.cli.certificate import certificate
 from vmanage.cli.set_cmd import set_cmd
 from vmanage.cli.reset import reset
+from vmanage.cli.sync import sync
 from vmanage.api.authentication import Authentication
+from vmanage.api.instrumentation import Instrumentation, LatencyHistogram
+from vmanage.api.session_cache import SessionCache
+from vmanage.api.timeouts import TimeoutProfiles
+from vmanage.api.tracing import Tracer, get_exporter
 
 # from vmanage.api.big import vmanage_session
 
@@ -25,22 +30,57 @@ class CatchAllExceptions(click.Group):
 
 
 class Viptela(object):
-    def __init__(self, host, port, username, password):
+    def __init__(self,
+                 host,
+                 port,
+                 username,
+                 password,
+                 session_cache=True,
+                 timeouts=None,
+                 instrumentation=None,
+                 tracer=None):
         self.host = host
         self.username = username
         self.password = password
         self.port = port
+        self.session_cache = SessionCache() if session_cache else None
+        self.timeouts = timeouts
+        self.instrumentation = instrumentation
+        self.tracer = tracer
         self.__auth = None
 
     # use this to defer authentication until it's needed
     @property
     def auth(self):
         if self.__auth is None:
-            self.__auth = Authentication(host=self.host, port=self.port, user=self.username,
-                                         password=self.password).login()
+            self.__auth = Authentication(host=self.host,
+                                         port=self.port,
+                                         user=self.username,
+                                         password=self.password,
+                                         session_cache=self.session_cache,
+                                         cache=True,
+                                         timeouts=self.timeouts,
+                                         instrumentation=self.instrumentation,
+                                         tracer=self.tracer).login()
         return self.__auth
 
 
+def parse_timeouts(ctx, param, value):  #pylint: disable=unused-argument
+    try:
+        return TimeoutProfiles().update(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+
+def parse_trace(ctx, param, value):  #pylint: disable=unused-argument
+    if not value:
+        return None
+    try:
+        return Tracer(get_exporter(value))
+    except OSError as e:
+        raise click.BadParameter(str(e))
+
+
 # @click.group(cls=CatchAllExceptions)
 @click.group()
 @click.option('--host', envvar='VMANAGE_HOST', help='vManage Host (env: VMANAGE_HOST)', required=True)
@@ -56,9 +96,45 @@ class Viptela(object):
               hide_input=True,
               help='vManage Password (env: VMANAGE_PASSWORD)',
               required=True)
+@click.option('--session-cache/--no-session-cache',
+              envvar='VMANAGE_SESSION_CACHE',
+              help='Reuse the login session across commands (env: VMANAGE_SESSION_CACHE, default=on)',
+              default=True)
+@click.option('--timeout',
+              'timeouts',
+              envvar='VMANAGE_TIMEOUTS',
+              multiple=True,
+              callback=parse_timeouts,
+              help='Timeout of an endpoint as PATTERN=SECONDS or PATTERN=CONNECT:READ, where PATTERN is '
+              'an API path prefix or default (env: VMANAGE_TIMEOUTS)')
+@click.option('--profile',
+              envvar='VMANAGE_PROFILE',
+              is_flag=True,
+              default=False,
+              help='Print the call count and latency of each API endpoint at exit (env: VMANAGE_PROFILE)')
+@click.option('--trace',
+              'tracer',
+              envvar='VMANAGE_TRACE',
+              callback=parse_trace,
+              help='Record tracing spans to a file, or to the URL of an OTLP/HTTP collector (env: VMANAGE_TRACE)')
 @click.pass_context
-def vmanage(ctx, host, port, username, password):
-    ctx.obj = Viptela(host, port, username, password)
+def vmanage(ctx, host, port, username, password, session_cache, timeouts, profile, tracer):
+    instrumentation = None
+    if profile:
+        latency_histogram = LatencyHistogram()
+        instrumentation = Instrumentation()
+        instrumentation.add_hooks(after=latency_histogram.record)
+        ctx.call_on_close(lambda: click.echo(latency_histogram.format_summary(), err=True))
+    if tracer:
+        ctx.call_on_close(tracer.close)
+    ctx.obj = Viptela(host,
+                      port,
+                      username,
+                      password,
+                      session_cache=session_cache,
+                      timeouts=timeouts,
+                      instrumentation=instrumentation,
+                      tracer=tracer)
 
 
 vmanage.add_command(activate)
@@ -71,3 +147,4 @@ vmanage.add_command(certificate)
 vmanage.add_command(clean)
 vmanage.add_command(set_cmd)
 vmanage.add_command(reset)
+vmanage.add_command(sync)
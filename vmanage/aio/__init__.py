@@ -0,0 +1 @@
+name = "vmanage.aio"
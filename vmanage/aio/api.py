@@ -0,0 +1,129 @@
+"""Asyncio versions of the vManage API classes.
+"""
+
+import functools
+
+from vmanage.api.central_policy import CentralPolicy as _CentralPolicy
+from vmanage.api.certificate import Certificate as _Certificate
+from vmanage.api.cluster import Cluster as _Cluster
+from vmanage.api.device import Device as _Device
+from vmanage.api.device_templates import DeviceTemplates as _DeviceTemplates
+from vmanage.api.feature_templates import FeatureTemplates as _FeatureTemplates
+from vmanage.api.local_policy import LocalPolicy as _LocalPolicy
+from vmanage.api.monitor_network import MonitorNetwork as _MonitorNetwork
+from vmanage.api.policy_definitions import PolicyDefinitions as _PolicyDefinitions
+from vmanage.api.policy_lists import PolicyLists as _PolicyLists
+from vmanage.api.policy_updates import PolicyUpdates as _PolicyUpdates
+from vmanage.api.security_policy import SecurityPolicy as _SecurityPolicy
+from vmanage.api.settings import Settings as _Settings
+from vmanage.api.utilities import Utilities as _Utilities
+
+
+class AsyncApi(object):
+    """Base class for the asyncio API classes.
+
+    Every public method of the wrapped synchronous API class is exposed
+    as a coroutine with the same name and arguments, e.g.
+    ``await MonitorNetwork(aio_session, host).get_bfd_sessions(system_ip)``.
+
+    """
+
+    api_class = None
+
+    def __init__(self, aio_session, host, port=443):
+        """Initialize the API object with session parameters.
+
+        Args:
+            aio_session (AsyncSession): Asyncio session object
+            host (str): hostname or IP address of vManage
+            port (int): default HTTPS 443
+
+        """
+
+        self.aio_session = aio_session
+        self.host = host
+        self.port = port
+        self.api = self.api_class(aio_session.session, host, port)  #pylint: disable=not-callable
+
+    def __getattr__(self, name):
+        if name == 'api':
+            raise AttributeError(name)
+        attr = getattr(self.api, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            return await self.aio_session.run(attr, *args, **kwargs)
+
+        return call
+
+
+class CentralPolicy(AsyncApi):
+    """Asyncio vManage Central Policy API"""
+    api_class = _CentralPolicy
+
+
+class Certificate(AsyncApi):
+    """Asyncio vManage Certificate API"""
+    api_class = _Certificate
+
+
+class Cluster(AsyncApi):
+    """Asyncio vManage Cluster API"""
+    api_class = _Cluster
+
+
+class Device(AsyncApi):
+    """Asyncio vManage Device Inventory API"""
+    api_class = _Device
+
+
+class DeviceTemplates(AsyncApi):
+    """Asyncio vManage Device Templates API"""
+    api_class = _DeviceTemplates
+
+
+class FeatureTemplates(AsyncApi):
+    """Asyncio vManage Feature Templates API"""
+    api_class = _FeatureTemplates
+
+
+class LocalPolicy(AsyncApi):
+    """Asyncio vManage Local Policy API"""
+    api_class = _LocalPolicy
+
+
+class MonitorNetwork(AsyncApi):
+    """Asyncio vManage Monitor Networks API"""
+    api_class = _MonitorNetwork
+
+
+class PolicyDefinitions(AsyncApi):
+    """Asyncio vManage Policy Definitions API"""
+    api_class = _PolicyDefinitions
+
+
+class PolicyLists(AsyncApi):
+    """Asyncio vManage Policy Lists API"""
+    api_class = _PolicyLists
+
+
+class PolicyUpdates(AsyncApi):
+    """Asyncio vManage Policy Updates API"""
+    api_class = _PolicyUpdates
+
+
+class SecurityPolicy(AsyncApi):
+    """Asyncio vManage Security Policy API"""
+    api_class = _SecurityPolicy
+
+
+class Settings(AsyncApi):
+    """Asyncio vManage Settings API"""
+    api_class = _Settings
+
+
+class Utilities(AsyncApi):
+    """Asyncio vManage Utilities API"""
+    api_class = _Utilities
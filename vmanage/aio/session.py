@@ -0,0 +1,103 @@
+"""Asyncio Session for the vManage API.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from vmanage.api.authentication import Authentication
+from vmanage.api.transport import Transport
+
+DEFAULT_CONCURRENCY = 50
+
+
+class AsyncSession(object):
+    """Asyncio front end for an authenticated vManage session.
+
+    Calls are dispatched onto a worker pool that shares the session's
+    pooled Transport, and a semaphore bounds how many requests are in
+    flight against vManage at any one time.
+
+    """
+    def __init__(self, session, concurrency=DEFAULT_CONCURRENCY):
+        """Initialize AsyncSession object.
+
+        Args:
+            session (obj): Authenticated Requests Session object
+            concurrency (int): Maximum number of calls in flight
+
+        """
+
+        self.session = session
+        self.concurrency = concurrency
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+        self._semaphore = None
+
+        # Make sure the connection pool can hold every in-flight request
+        transport = Transport.from_session(session)
+        if transport.pool_maxsize < concurrency:
+            transport.resize_pool(concurrency)
+
+    @classmethod
+    async def login(cls, host, user, password, port=443, validate_certs=False, concurrency=DEFAULT_CONCURRENCY):
+        """Authenticate against vManage and return an AsyncSession.
+
+        Args:
+            host (str): hostname or IP address of vManage
+            user (str): username for authentication
+            password (str): password for authentication
+            port (int): default HTTPS port 443
+            validate_certs (bool): turn certificate validation on or off
+            concurrency (int): Maximum number of calls in flight
+
+        Returns:
+            result (AsyncSession): The authenticated session.
+
+        """
+
+        auth = Authentication(host=host,
+                              user=user,
+                              password=password,
+                              port=port,
+                              validate_certs=validate_certs,
+                              pool_maxsize=max(concurrency, 1))
+        loop = asyncio.get_running_loop()
+        session = await loop.run_in_executor(None, auth.login)
+        return cls(session, concurrency=concurrency)
+
+    @property
+    def semaphore(self):
+        # Created lazily so that it is bound to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    async def run(self, func, *args, **kwargs):
+        """Run a blocking API call without blocking the event loop.
+
+        Args:
+            func (callable): The API method to call
+            args: Positional arguments for the call
+            kwargs: Keyword arguments for the call
+
+        Returns:
+            result: Whatever the API method returns.
+
+        """
+
+        async with self.semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    def close(self):
+        """Release the worker pool.
+
+        """
+
+        self.executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
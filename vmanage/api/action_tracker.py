@@ -0,0 +1,243 @@
+"""Cisco vManage Action Tracking.
+"""
+
+import time
+from vmanage.api.http_methods import HttpMethods
+from vmanage.api.tracing import ACTION_WAIT, get_tracer
+from vmanage.api.transport import Transport
+from vmanage.data.parse_methods import ParseMethods
+from vmanage.utils import run_concurrently
+
+DEFAULT_INITIAL_INTERVAL = 1.0
+DEFAULT_MAX_INTERVAL = 10.0
+DEFAULT_BACKOFF = 1.5
+DEFAULT_POLL_WORKERS = 10
+
+
+class ActionTracker(object):
+    """Track the completion of vManage actions.
+
+    A single poll loop watches any number of action IDs.  Polling starts
+    fast and backs off while actions remain in progress, and results are
+    handed back through callbacks or an iterator as each action finishes.
+
+    """
+    def __init__(self,
+                 session,
+                 host,
+                 port=443,
+                 initial_interval=DEFAULT_INITIAL_INTERVAL,
+                 max_interval=DEFAULT_MAX_INTERVAL,
+                 backoff=DEFAULT_BACKOFF):
+        """Initialize ActionTracker object with session parameters.
+
+        Args:
+            session (obj): Requests Session object
+            host (str): hostname or IP address of vManage
+            port (int): default HTTPS 443
+            initial_interval (float): Seconds to wait before the second poll
+            max_interval (float): Longest wait between polls
+            backoff (float): Factor the wait grows by after each poll
+
+        """
+
+        self.session = session
+        self.host = host
+        self.port = port
+        self.base_url = f'https://{self.host}:{self.port}/dataservice/'
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.pending = {}
+        self.results = {}
+
+    def add(self, action_id, callback=None):
+        """Start tracking an action.
+
+        Args:
+            action_id (str): The action ID returned by vManage
+            callback (callable): Called with the action result when it completes
+
+        """
+
+        if action_id in self.results:
+            if callback:
+                callback(self.results[action_id])
+        else:
+            self.pending.setdefault(action_id, [])
+            if callback:
+                self.pending[action_id].append(callback)
+
+    def get_action_status(self, action_id):
+        """Get the current status of an action.
+
+        Args:
+            action_id (str): The action ID returned by vManage
+
+        Returns:
+            result (dict): The action status, activity, config and full response.
+
+        """
+
+        url = f"{self.base_url}device/action/status/{action_id}"
+        response = HttpMethods(self.session, url).request('GET')
+        ParseMethods.parse_data(response)
+
+        if not response['json']:
+            raise Exception("Unable to get action status: No response")
+
+        status = response['json']['summary']['status']
+        action_status = status
+        action_activity = None
+        action_config = None
+        if 'data' in response['json'] and response['json']['data']:
+            action_status = response['json']['data'][0]['statusId']
+            action_activity = response['json']['data'][0]['activity']
+            action_config = response['json']['data'][0].get('actionConfig')
+
+        return {
+            'action_response': response['json'],
+            'action_id': action_id,
+            'status': status,
+            'action_status': action_status,
+            'action_activity': action_activity,
+            'action_config': action_config
+        }
+
+    def poll(self):
+        """Poll every pending action once.
+
+        Returns:
+            result (list): The results of the actions that completed.
+
+        """
+
+        completed = []
+        action_ids = list(self.pending)
+        if len(action_ids) == 1:
+            polled = [(action_ids[0], self.get_action_status(action_ids[0]))]
+        else:
+            polled = run_concurrently(self.get_action_status, action_ids, workers=DEFAULT_POLL_WORKERS)
+
+        for action_id, result in polled:
+            if isinstance(result, Exception):
+                raise result
+            if result.pop('status') == 'in_progress':
+                continue
+            self.results[action_id] = result
+            for callback in self.pending.pop(action_id):
+                callback(result)
+            completed.append(result)
+
+        if completed:
+            # Device status fetched while the actions ran may be out of date
+            Transport.from_session(self.session).cache.invalidate_action()
+
+        return completed
+
+    def sleep(self, interval):
+        """Wait between polls, recorded as an action wait span when traced."""
+
+        with get_tracer(self.session).span('action-wait',
+                                           span_type=ACTION_WAIT,
+                                           attributes={
+                                               'vmanage.actions.pending': len(self.pending),
+                                               'vmanage.wait.seconds': interval,
+                                           }):
+            time.sleep(interval)
+
+    def iter_completed(self, timeout=None):
+        """Poll until every pending action completes.
+
+        Args:
+            timeout (float): Give up after this many seconds (default: wait forever)
+
+        Yields:
+            result (dict): The result of each action as it completes.
+
+        Raises:
+            TimeoutError: Actions were still in progress after the timeout.
+
+        """
+
+        interval = self.initial_interval
+        deadline = time.time() + timeout if timeout is not None else None
+        while self.pending:
+            for result in self.poll():
+                yield result
+            if not self.pending:
+                break
+            if deadline is not None and time.time() + interval > deadline:
+                raise TimeoutError(f"Actions still in progress: {', '.join(self.pending)}")
+            self.sleep(interval)
+            interval = min(interval * self.backoff, self.max_interval)
+
+    def wait(self, timeout=None):
+        """Wait for every pending action to complete.
+
+        Args:
+            timeout (float): Give up after this many seconds (default: wait forever)
+
+        Returns:
+            result (dict): The results of all tracked actions keyed by action ID.
+
+        """
+
+        for _ in self.iter_completed(timeout=timeout):
+            pass
+        return dict(self.results)
+
+    def get_active_count(self):
+        """Get the number of tasks vManage is running.
+
+        Returns:
+            result (int): The active task count.
+
+        """
+
+        url = f"{self.base_url}device/action/status/tasks/activeCount"
+        response = HttpMethods(self.session, url).request('GET')
+        result = ParseMethods.parse_data(response)
+        return result['activeTaskCount']
+
+    def wait_for_idle(self, timeout=None):
+        """Wait until vManage has no active tasks.
+
+        The task count is checked straight away and then with the same
+        backoff used for actions, so a vManage that is already idle costs
+        a single call.
+
+        Args:
+            timeout (float): Give up after this many seconds (default: wait forever)
+
+        Raises:
+            TimeoutError: Tasks were still active after the timeout.
+
+        """
+
+        interval = self.initial_interval
+        deadline = time.time() + timeout if timeout is not None else None
+        while self.get_active_count():
+            if deadline is not None and time.time() + interval > deadline:
+                raise TimeoutError("vManage tasks still in progress")
+            self.sleep(interval)
+            interval = min(interval * self.backoff, self.max_interval)
+
+    def wait_for(self, action_id, timeout=None):
+        """Wait for a single action to complete.
+
+        Args:
+            action_id (str): The action ID returned by vManage
+            timeout (float): Give up after this many seconds (default: wait forever)
+
+        Returns:
+            result (dict): The action status, activity, config and full response.
+
+        """
+
+        self.add(action_id)
+        if action_id not in self.results:
+            for result in self.iter_completed(timeout=timeout):
+                if result['action_id'] == action_id:
+                    break
+        return self.results[action_id]
@@ -5,6 +5,7 @@ from __future__ import (absolute_import, division, print_function)
 
 import requests
 import urllib3
+from vmanage.api.transport import Transport, DEFAULT_POOL_MAXSIZE
 from vmanage.api.utilities import Utilities
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -16,10 +17,25 @@ class Authentication(object):
     Responsible for retrieving the JSESSIONID after a username/password
     has been authenticated.  If the vManage version is >= 19.2.0 then
     the X-XSRF-TOKEN will be retrieved and added to the header.  An
-    HTTP(S) Request session object will be returned.
+    HTTP(S) Request session object will be returned.  With a session
+    cache, a session saved by an earlier login is reused while vManage
+    still accepts it.
 
     """
-    def __init__(self, host=None, user=None, password=None, port=443, validate_certs=False, timeout=10):
+    def __init__(self,
+                 host=None,
+                 user=None,
+                 password=None,
+                 port=443,
+                 validate_certs=False,
+                 timeout=10,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 cache=False,
+                 rate_limit=True,
+                 session_cache=None,
+                 timeouts=None,
+                 instrumentation=None,
+                 tracer=None):
         """Initialize Authentication object with session parameters.
 
         Args:
@@ -31,6 +47,21 @@ class Authentication(object):
                 on or off.
             timeout (int): how long Reqeusts will wait for a
                 response from the server, default 10 seconds
+            pool_maxsize (int): maximum number of pooled connections
+                kept open to vManage and shared by all API objects
+            cache (bool): cache responses from read-mostly catalog
+                endpoints such as templates and policies on every call
+                (default: only while bulk imports and exports run)
+            rate_limit (bool): pace requests to vManage and retry
+                requests that vManage throttles
+            session_cache (SessionCache): reuse and save login sessions
+                (default: always log in)
+            timeouts (TimeoutProfiles): connect and read timeouts per
+                endpoint for API calls (default: TimeoutProfiles())
+            instrumentation (Instrumentation): hooks run before and
+                after each API call (default: none)
+            tracer (Tracer): record tracing spans of operations and
+                their API calls (default: disabled)
 
         """
 
@@ -42,6 +73,14 @@ class Authentication(object):
         self.base_url = f'https://{self.host}:{self.port}/dataservice/'
         self.session = requests.Session()
         self.session.verify = validate_certs
+        self.transport = Transport(self.session,
+                                   pool_maxsize=pool_maxsize,
+                                   cache=cache,
+                                   rate_limit=rate_limit,
+                                   timeouts=timeouts,
+                                   instrumentation=instrumentation,
+                                   tracer=tracer)
+        self.session_cache = session_cache
 
     def login(self):
         """Executes login tasks against vManage to retrieve token(s).
@@ -60,6 +99,9 @@ class Authentication(object):
         """
 
         try:
+            if self.session_cache and self.resume_session():
+                return self.session
+
             api = 'j_security_check'
             url = f'{self.base_url}{api}'
             response = self.session.post(url=url,
@@ -74,13 +116,56 @@ class Authentication(object):
 
             version = Utilities(self.session, self.host, self.port).get_vmanage_version()
 
+            token = None
             if version >= '19.2.0':
                 api = 'client/token'
                 url = f'{self.base_url}{api}'
                 response = self.session.get(url=url, timeout=self.timeout)
                 self.session.headers['X-XSRF-TOKEN'] = response.content
+                token = response.text
+
+            if self.session_cache:
+                self.session_cache.save(self.host, self.port, self.user, self.password,
+                                        requests.utils.dict_from_cookiejar(self.session.cookies), token, version)
 
         except requests.exceptions.RequestException as e:
             raise ConnectionError(f'Could not connect to {self.host}: {e}')
 
         return self.session
+
+    def resume_session(self):
+        """Reuse the cached session if vManage still accepts it.
+
+        A single call checks the session instead of the three made to log
+        in: the token is fetched again for vManage version >= 19.2.0 and
+        the version is fetched otherwise.
+
+        Returns:
+            result (bool): True if the cached session was restored.
+
+        """
+
+        # A session opened with another password is not reused, so the password is checked by a full login
+        entry = self.session_cache.load(self.host, self.port, self.user, self.password)
+        if entry is None:
+            return False
+
+        self.session.cookies.update(entry['cookies'])
+        version = entry['version']
+        if version >= '19.2.0':
+            api = 'client/token'
+        else:
+            api = 'system/device/controllers?model=vmanage&&&&'
+        response = self.session.get(url=f'{self.base_url}{api}', timeout=self.timeout)
+        # vManage answers with the login page once the session has expired
+        if response.status_code != 200 or response.text.lstrip().startswith('<'):
+            self.session.cookies.clear()
+            self.session_cache.delete(self.host, self.port, self.user)
+            return False
+
+        token = None
+        if version >= '19.2.0':
+            self.session.headers['X-XSRF-TOKEN'] = response.content
+            token = response.text
+        self.session_cache.save(self.host, self.port, self.user, self.password, entry['cookies'], token, version)
+        return True
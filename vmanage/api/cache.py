@@ -0,0 +1,334 @@
+"""Response Cache for Read-Mostly vManage Endpoints.
+"""
+
+import contextlib
+import functools
+import json
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Catalog endpoints that change rarely.  Each family lists the path patterns
+# whose GET responses are cached, how long they stay fresh and the path
+# prefixes whose writes make them stale.  The devices attached to a device
+# template change as attach and detach actions run, so they are not cached.
+CACHE_FAMILIES = {
+    'template/feature': {
+        'pattern': r'^template/feature(/|$)',
+        'ttl': 300,
+        'invalidated_by': ['template/'],
+    },
+    'template/device': {
+        'pattern': r'^template/device(/(?!config/attached)|$)',
+        'ttl': 300,
+        'invalidated_by': ['template/'],
+    },
+    'template/policy/list': {
+        'pattern': r'^template/policy/list(/|$)',
+        'ttl': 300,
+        'invalidated_by': ['template/policy/'],
+    },
+    'template/policy/definition': {
+        'pattern': r'^template/policy/definition(/|$)',
+        'ttl': 300,
+        'invalidated_by': ['template/policy/'],
+    },
+    'template/policy/vedge': {
+        'pattern': r'^template/policy/vedge(/|$)',
+        'ttl': 300,
+        'invalidated_by': ['template/'],
+    },
+    'template/policy/vsmart': {
+        'pattern': r'^template/policy/vsmart(/|$)',
+        'ttl': 300,
+        'invalidated_by': ['template/policy/'],
+    },
+    'template/policy/security': {
+        'pattern': r'^template/policy/security(/|$)',
+        'ttl': 300,
+        'invalidated_by': ['template/'],
+    },
+    'device': {
+        'pattern': r'^device/?$',
+        'ttl': 30,
+        'invalidated_by': ['device/action/', 'system/device', 'template/config/', 'template/device/config/'],
+    },
+    'system/device': {
+        'pattern': r'^system/device(/|$)',
+        'ttl': 60,
+        'invalidated_by': ['system/device', 'template/config/', 'template/device/config/'],
+    },
+}
+
+# Families whose state changes while vManage runs an action, and so are
+# stale again once one completes.
+ACTION_STALE_FAMILIES = ['device', 'system/device']
+
+# POST calls that only read data and so must not invalidate anything.
+READ_ONLY_POSTS = [
+    'template/device/config/input',
+    'template/device/config/config',
+    'template/device/config/duplicateip',
+    'template/device/config/exportcsv',
+    'statistics/',
+]
+
+
+def get_api_path(url):
+    """Get the path of a URL relative to the dataservice root.
+
+    Args:
+        url (str): Full URL of the API service
+
+    Returns:
+        result (str): The path without the dataservice prefix or query.
+
+    """
+
+    path = urlsplit(url).path
+    if '/dataservice/' in path:
+        path = path.split('/dataservice/', 1)[1]
+    return path.lstrip('/')
+
+
+class ResponseCache(object):
+    """Session scoped cache of GET responses from read-mostly endpoints.
+
+    Responses are grouped into resource families, each with its own TTL.
+    A POST, PUT or DELETE that touches a family drops everything cached
+    for it.  Only the raw response body is stored and it is decoded again
+    on each hit, so callers are free to modify what they get back.
+
+    Changes made by other clients don't show until an entry expires, so
+    the cache is off unless enabled, or while an operation that makes
+    many reads runs inside enable().
+
+    """
+    def __init__(self, families=None, enabled=False):
+        """Initialize the cache.
+
+        Args:
+            families (dict): Resource families to cache (default: CACHE_FAMILIES)
+            enabled (bool): Cache responses (default: only inside enable())
+
+        """
+
+        self.families = dict(CACHE_FAMILIES if families is None else families)
+        self.enabled = enabled
+        self.scopes = 0
+        self.entries = {}
+        self.counters = {}
+        self.write_counts = {}
+        self.stale_counts = {}
+        self.lock = threading.Lock()
+        self._patterns = [(name, re.compile(family['pattern'])) for name, family in self.families.items()]
+
+    def get_family(self, url):
+        """Get the resource family a URL belongs to.
+
+        Args:
+            url (str): Full URL of the API service
+
+        Returns:
+            result (str): Family name, or None if the URL is not cached.
+
+        """
+
+        path = get_api_path(url)
+        for name, pattern in self._patterns:
+            if pattern.match(path):
+                return name
+        return None
+
+    def _count(self, family, counter):
+        self.counters.setdefault(family, {'hits': 0, 'misses': 0, 'invalidations': 0})[counter] += 1
+
+    def get(self, url):
+        """Get a cached response.
+
+        Args:
+            url (str): Full URL of the API service
+
+        Returns:
+            result (dict): The cached result, or None on a miss.
+
+        """
+
+        family = self.get_family(url)
+        if not (self.enabled or self.scopes) or family is None:
+            return None
+
+        with self.lock:
+            entry = self.entries.get(family, {}).get(url)
+            if entry is None or entry['expires'] < time.monotonic():
+                self._count(family, 'misses')
+                return None
+            self._count(family, 'hits')
+
+        result = dict(entry['result'])
+        result['json'] = json.loads(entry['text']) if entry['text'] else None
+        return result
+
+    def put(self, url, result):
+        """Store a response if its URL belongs to a cached family.
+
+        Args:
+            url (str): Full URL of the API service
+            result (dict): Result dictionary built by the transport
+
+        """
+
+        family = self.get_family(url)
+        if not (self.enabled or self.scopes) or family is None:
+            return
+
+        entry = {
+            'expires': time.monotonic() + self.families[family]['ttl'],
+            'text': result['response'].text,
+            'result': dict(result, json=None),
+        }
+        with self.lock:
+            self.entries.setdefault(family, {})[url] = entry
+
+    @contextlib.contextmanager
+    def enable(self):
+        """Cache responses while an operation runs, even when the cache is off.
+
+        What was cached is dropped once the last such operation ends,
+        unless the cache is on, so later reads go to vManage again.
+
+        """
+
+        with self.lock:
+            self.scopes += 1
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self.scopes -= 1
+                drop = not self.enabled and not self.scopes
+            if drop:
+                self.invalidate()
+
+    def invalidate(self, family=None):
+        """Drop cached responses.
+
+        Args:
+            family (str): Family to drop (default: all families)
+
+        """
+
+        with self.lock:
+            families = list(self.entries) if family is None else [family]
+            for name in families:
+                if self.entries.pop(name, None):
+                    self._count(name, 'invalidations')
+
+    def invalidate_url(self, method, url):
+        """Drop the families made stale by a write to a URL.
+
+        Args:
+            method (str): DELETE, POST, PUT
+            url (str): Full URL of the API service
+
+        """
+
+        path = get_api_path(url)
+        if method.upper() == 'POST' and any(path.startswith(prefix) for prefix in READ_ONLY_POSTS):
+            return
+
+        with self.lock:
+            for name, pattern in self._patterns:
+                if pattern.match(path):
+                    self.write_counts[name] = self.write_counts.get(name, 0) + 1
+
+        for name, family in self.families.items():
+            if any(path.startswith(prefix) for prefix in family['invalidated_by']):
+                self.mark_stale(name)
+
+    def mark_stale(self, family):
+        """Drop a family whose resources changed, and count the change.
+
+        Args:
+            family (str): Family name
+
+        """
+
+        with self.lock:
+            self.stale_counts[family] = self.stale_counts.get(family, 0) + 1
+        self.invalidate(family)
+
+    def invalidate_action(self):
+        """Drop the families made stale by a device action completing."""
+
+        for name in ACTION_STALE_FAMILIES:
+            if name in self.families:
+                self.mark_stale(name)
+
+    def get_write_count(self, family):
+        """Get the number of writes made to a family's own resources.
+
+        Writes that only make a family stale through its references (such
+        as a new definition changing list reference counts) are not
+        counted, so this tells whether the objects themselves may have
+        been created, renamed or deleted.
+
+        Args:
+            family (str): Family name
+
+        Returns:
+            result (int): Number of POST, PUT and DELETE calls seen.
+
+        """
+
+        return self.write_counts.get(family, 0)
+
+    def get_stale_count(self, family):
+        """Get the number of writes that made a family stale.
+
+        Unlike get_write_count, this counts every write listed in the
+        family's invalidated_by, such as a device action making the device
+        status stale.
+
+        Args:
+            family (str): Family name
+
+        Returns:
+            result (int): Number of POST, PUT and DELETE calls seen.
+
+        """
+
+        return self.stale_counts.get(family, 0)
+
+    @property
+    def hits(self):
+        return sum(counter['hits'] for counter in self.counters.values())
+
+    @property
+    def misses(self):
+        return sum(counter['misses'] for counter in self.counters.values())
+
+    def get_stats(self):
+        """Get the hit, miss and invalidation counters.
+
+        Returns:
+            result (dict): Counters keyed by family name.
+
+        """
+
+        with self.lock:
+            return {name: dict(counter) for name, counter in self.counters.items()}
+
+
+def cached(func):
+    """Run a method of an API object that has a session with the session's response cache enabled."""
+    @functools.wraps(func)
+    def run_cached(self, *args, **kwargs):
+        transport = getattr(self.session, 'transport', None)
+        if transport is None:
+            return func(self, *args, **kwargs)
+        with transport.cache.enable():
+            return func(self, *args, **kwargs)
+
+    return run_cached
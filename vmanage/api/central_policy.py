@@ -29,7 +29,7 @@ class CentralPolicy(object):
         self.host = host
         self.port = port
         self.base_url = f'https://{self.host}:{self.port}/dataservice/'
-        self.policy_definitions = PolicyDefinitions(self.session, self.host)
+        self.policy_definitions = PolicyDefinitions(self.session, self.host, self.port)
 
     def activate_central_policy(self, policy_name, policy_id):
         """Activates the current active centralized policy
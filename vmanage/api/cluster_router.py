@@ -0,0 +1,261 @@
+"""Spread Read-Only vManage Traffic Across Cluster Nodes.
+"""
+
+import re
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit
+from vmanage.api.authentication import Authentication
+from vmanage.api.cache import get_api_path
+from vmanage.api.cluster import Cluster
+from vmanage.api.exceptions import VmanageConnectionError, VmanageTimeoutError
+from vmanage.api.transport import Transport
+
+# Read-only monitoring endpoints that any node in the cluster can answer.
+# Device actions are left on the node that started them.
+READ_ONLY_PATTERNS = [
+    r'^device(?!/action)(/|$)',
+    r'^statistics/',
+    r'^alarms(/|$)',
+    r'^event(/|$)',
+    r'^network/',
+    r'^system/device(/|$)',
+]
+# Fields of the cluster health status that hold each node's address and health
+NODE_ADDRESS_KEYS = ['deviceIP', 'configIP', 'systemIp', 'ip']
+HEALTHY_STATES = ['healthy', 'normal', 'green', 'up', 'ready']
+STRATEGIES = ['round_robin', 'least_loaded']
+# Seconds a node that couldn't be reached is left out of the rotation
+DEFAULT_RETRY_AFTER = 60
+# vManage answers with the login page, or one of these, once a session has expired
+LOGGED_OUT_STATUS_CODES = [401, 403]
+
+
+class ClusterNode(object):
+    """A vManage node that read-only requests can be sent to."""
+    def __init__(self, host, port, session=None, primary=False):
+        self.host = host
+        self.port = port
+        self.session = session
+        self.primary = primary
+        self.healthy = True
+        self.failed_at = None
+        self.in_flight = 0
+        self.login_lock = threading.Lock()
+
+    def get_url(self, url):
+        """Get the URL of the same API service on this node."""
+
+        if self.primary:
+            return url
+        parts = urlsplit(url)
+        return urlunsplit((parts.scheme, f'{self.host}:{self.port}', parts.path, parts.query, parts.fragment))
+
+
+class ClusterRouter(object):
+    """Route read-only monitoring calls across the nodes of a vManage cluster.
+
+    Once attached to a session, GET calls to monitoring endpoints are sent
+    to the healthy cluster nodes in turn, or to the node with the fewest
+    calls in flight, while every write and every other call stays on the
+    node the session logged in to.  Sessions are not shared between nodes,
+    so each node is logged in to the first time a call is routed to it,
+    with the timeouts, certificate validation, instrumentation and tracer
+    of the primary node's transport, and logged in to again once its
+    session expires.  A node that can't be reached or logged in to is
+    taken out of the rotation, and tried again after a cooldown.
+
+    """
+    def __init__(self,
+                 session,
+                 host,
+                 user,
+                 password,
+                 port=443,
+                 nodes=None,
+                 strategy='round_robin',
+                 validate_certs=None,
+                 patterns=None,
+                 retry_after=DEFAULT_RETRY_AFTER):
+        """Initialize the router.
+
+        Args:
+            session (obj): Requests Session object logged in to the primary node
+            host (str): hostname or IP address of the primary vManage node
+            user (str): username for the other nodes
+            password (str): password for the other nodes
+            port (int): default HTTPS 443
+            nodes (list): Addresses of the other nodes (default: discover
+                the healthy nodes from the cluster health status)
+            strategy (str): round_robin or least_loaded
+            validate_certs (bool): turn certificate validation on or off
+                (default: as on the primary node's session)
+            patterns (list): API path patterns that can be routed
+                (default: READ_ONLY_PATTERNS)
+            retry_after (float): Seconds before a node that couldn't be
+                reached is tried again
+
+        """
+
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown routing strategy {strategy}")
+        self.session = session
+        self.host = host
+        self.user = user
+        self.password = password
+        self.port = port
+        self.strategy = strategy
+        self.validate_certs = session.verify if validate_certs is None else validate_certs
+        self.retry_after = retry_after
+        self._patterns = [re.compile(pattern) for pattern in (READ_ONLY_PATTERNS if patterns is None else patterns)]
+        self.lock = threading.Lock()
+        self.next_node = 0
+        self.nodes = [ClusterNode(host, port, session=session, primary=True)]
+        for node in (self.discover() if nodes is None else nodes):
+            if node != host:
+                self.nodes.append(ClusterNode(node, port))
+
+    def discover(self):
+        """Get the healthy nodes of the cluster.
+
+        Returns:
+            result (list): The addresses of the healthy nodes.
+
+        """
+
+        nodes = []
+        for status in Cluster(self.session, self.host, self.port).get_cluster_health_status_list():
+            address = next((status[key] for key in NODE_ADDRESS_KEYS if status.get(key)), None)
+            if address and str(status.get('status', 'healthy')).lower() in HEALTHY_STATES:
+                nodes.append(address)
+        return nodes
+
+    def attach(self):
+        """Route the calls made through the session's transport.
+
+        Returns:
+            router (ClusterRouter): This router.
+
+        """
+
+        Transport.from_session(self.session).router = self
+        return self
+
+    def is_routable(self, method, url):
+        """Check whether a call can be answered by any node.
+
+        Args:
+            method (str): DELETE, GET, POST, PUT
+            url (str): Full URL of the API service
+
+        Returns:
+            result (bool): True for read-only monitoring calls.
+
+        """
+
+        if method.upper() != 'GET':
+            return False
+        path = get_api_path(url)
+        return any(pattern.match(path) for pattern in self._patterns)
+
+    def _pick(self):
+        now = time.monotonic()
+        for node in self.nodes:
+            if not node.healthy and now - node.failed_at >= self.retry_after:
+                # Give the node another chance.  It's taken out again if it still can't be reached.
+                node.healthy = True
+        healthy = [node for node in self.nodes if node.healthy]
+        self.next_node = (self.next_node + 1) % len(healthy)
+        # Start from the next node in turn so that ties are spread out too
+        ordered = healthy[self.next_node:] + healthy[:self.next_node]
+        if self.strategy == 'least_loaded':
+            return min(ordered, key=lambda node: node.in_flight)
+        return ordered[0]
+
+    def acquire(self, method, url):
+        """Pick the node to send a call to.
+
+        Args:
+            method (str): DELETE, GET, POST, PUT
+            url (str): Full URL of the API service
+
+        Returns:
+            result (ClusterNode): The node, or None to send the call to the
+                primary node as usual.
+
+        """
+
+        if len(self.nodes) == 1 or not self.is_routable(method, url):
+            return None
+        with self.lock:
+            node = self._pick()
+            node.in_flight += 1
+        if node.primary:
+            return node
+        try:
+            self.login(node)
+        except (ConnectionError, VmanageConnectionError, VmanageTimeoutError):
+            self.release(node, healthy=False)
+            return self.acquire(method, url)
+        return node
+
+    def login(self, node, expired=None):
+        """Log in to a node unless it already has a session.
+
+        Calls routed to the node at the same time wait for a single login.
+
+        Args:
+            node (ClusterNode): The node to log in to
+            expired (obj): A session of the node that vManage no longer
+                accepts, to be replaced unless another call already did
+
+        Raises:
+            ConnectionError: If the node can't be reached or logged in to.
+
+        """
+
+        with node.login_lock:
+            if node.session is not None and node.session is not expired:
+                return
+            transport = Transport.from_session(self.session)
+            node.session = Authentication(host=node.host,
+                                          user=self.user,
+                                          password=self.password,
+                                          port=node.port,
+                                          validate_certs=self.validate_certs,
+                                          pool_maxsize=transport.pool_maxsize,
+                                          timeouts=transport.timeouts,
+                                          instrumentation=transport.instrumentation,
+                                          tracer=transport.tracer).login()
+
+    @staticmethod
+    def is_logged_out(response):
+        """Check whether a node turned a call away because its session expired.
+
+        Args:
+            response (obj): Requests response object
+
+        Returns:
+            result (bool): True if vManage answered with the login page or
+                refused the session.
+
+        """
+
+        if response.status_code in LOGGED_OUT_STATUS_CODES:
+            return True
+        return response.headers.get('Content-Type', '').startswith('text/html')
+
+    def release(self, node, healthy=True):
+        """Record that a call to a node has finished.
+
+        Args:
+            node (ClusterNode): The node returned by acquire
+            healthy (bool): False if the node could not be reached
+
+        """
+
+        with self.lock:
+            node.in_flight -= 1
+            if not healthy and not node.primary:
+                node.healthy = False
+                node.failed_at = time.monotonic()
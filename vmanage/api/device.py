@@ -86,7 +86,7 @@ class Device(object):
 
         result = self.get_device_status_list()
 
-        return list_to_dict(result.json, key_name=key_name, remove_key=remove_key)
+        return list_to_dict(result, key_name=key_name, remove_key=remove_key)
 
     def get_device_status(self, value, key='system-ip'):
         """Get the status of a specific device
@@ -176,18 +176,22 @@ class Device(object):
 
         return list_to_dict(device_list, key_name=key_name, remove_key=remove_key)
 
-    def get_device_data(self, path, device_ip):
+    def get_device_data(self, path, device_ip, stream=False):
         """Get the data from a device
 
         Args:
             path (str): The path of the data
             device_ip (str): The IP address of the device
+            stream (bool): Return an iterator that yields rows as they are
+                parsed instead of loading the whole response
 
         Returns:
             result (dict): All data associated with a response.
         """
 
         url = f"{self.base_url}device/{path}?deviceId={device_ip}"
+        if stream:
+            return HttpMethods(self.session, url).stream('GET')
         response = HttpMethods(self.session, url).request('GET')
         result = ParseMethods.parse_data(response)
         return result
@@ -2,13 +2,20 @@
 """
 
 import json
-import re
+from collections import deque
+from vmanage.api.action_tracker import ActionTracker
 from vmanage.api.feature_templates import FeatureTemplates
 from vmanage.api.http_methods import HttpMethods
+from vmanage.api.template_input import TemplateInput, get_input_columns
+from vmanage.api.tracing import get_tracer, traced
 from vmanage.data.parse_methods import ParseMethods
 from vmanage.utils import list_to_dict
 from vmanage.api.utilities import Utilities
 
+# Devices per attach call, and attach actions left running at once, when attaching in batches
+DEFAULT_ATTACH_BATCH_SIZE = 200
+DEFAULT_BATCHES_IN_FLIGHT = 4
+
 
 class DeviceTemplates(object):
     """vManage Device Templates API
@@ -182,21 +189,7 @@ class DeviceTemplates(object):
 
         if 'json' in response:
             if 'header' in response['json'] and 'columns' in response['json']['header']:
-                column_list = response['json']['header']['columns']
-
-                regex = re.compile(r'\((?P<variable>[^(]+)\)$')
-
-                for column in column_list:
-                    if column['editable']:
-                        match = regex.search(column['title'])
-                        if match:
-                            variable = match.groups('variable')[0]
-                        else:
-                            # If the variable is not found, use toolTip as variable name
-                            variable = column.get("toolTip")
-
-                        entry = {'title': column['title'], 'property': column['property'], 'variable': variable}
-                        return_dict['columns'].append(entry)
+                return_dict['columns'] = get_input_columns(response['json']['header']['columns'])
             if 'data' in response['json'] and response['json']['data']:
                 return_dict['data'] = response['json']['data']
 
@@ -288,15 +281,18 @@ class DeviceTemplates(object):
             action_id (str): Returns the action id of the attachment
 
         """
-        device_list = self.get_template_attachments(template_id, key='uuid')
-        template_input = self.get_template_input(template_id, device_list)
+        # Get the input of every attached device, in chunks fetched concurrently
+        template_input = TemplateInput(self.session, self.host, self.port).get_input({template_id: None})
+        device_input = [
+            template_input['data'][(template_id, device_id)] for device_id in template_input['devices'][template_id]
+        ]
 
         # Then we feed that to the attach
-        if 'data' in template_input and template_input['data']:
+        if device_input:
             payload = {
                 "deviceTemplateList": [{
                     "templateId": template_id,
-                    "device": template_input['data'],
+                    "device": device_input,
                     "isEdited": is_edited,
                     "isMasterEdited": is_master_edited
                 }]
@@ -316,17 +312,81 @@ class DeviceTemplates(object):
             raise RuntimeError(f"Could not retrieve input for template {template_id}")
         return action_id
 
-    def attach_to_template(self, template_id, config_type, uuid):
+    def attach_to_template(self, template_id, config_type, uuid, wait=True):
         """Attach and device to a template
 
         Args:
             template_id (str): The template ID to attach to
             config_type (str): Type of template i.e. device or CLI template
             uuid (dict): The UUIDs of the device to attach and mapping for corresponding variables, system-ip, host-name
+            wait (bool): Wait for the attachment to complete before returning
 
         Returns:
             action_id (str): Returns the action id of the attachment
 
+        """
+        payload = {
+            "deviceTemplateList": [{
+                "templateId": template_id,
+                "device": self.get_attach_device_list(template_id, uuid),
+                "isEdited": False,
+                "isMasterEdited": False
+            }]
+        }
+        url = self.get_attach_url(config_type)
+
+        response = HttpMethods(self.session, url).request('POST', payload=json.dumps(payload))
+        action_id = ParseMethods.parse_id(response)
+        if wait:
+            utils = Utilities(self.session, self.host, self.port)
+            utils.waitfor_action_completion(action_id)
+
+        return action_id
+
+    def attach_to_template_in_batches(self,
+                                      template_id,
+                                      config_type,
+                                      uuid,
+                                      batch_size=DEFAULT_ATTACH_BATCH_SIZE,
+                                      batches_in_flight=DEFAULT_BATCHES_IN_FLIGHT,
+                                      timeout=None):
+        """Attach devices to a template in batches, waiting for all of them.
+
+        Args:
+            template_id (str): The template ID to attach to
+            config_type (str): Type of template i.e. device or CLI template
+            uuid (dict): The UUIDs of the device to attach and mapping for corresponding variables, system-ip, host-name
+            batch_size (int): The most devices to attach in one call
+            batches_in_flight (int): The most batches to leave running on vManage at once
+            timeout (float): Give up waiting after this many seconds (default: wait forever)
+
+        Returns:
+            result (dict): The result of attach_in_batches.
+
+        """
+        device_template_list = [{
+            "templateId": template_id,
+            "device": self.get_attach_device_list(template_id, uuid),
+            "isEdited": False,
+            "isMasterEdited": False
+        }]
+
+        return self.attach_in_batches(self.get_attach_url(config_type),
+                                      device_template_list,
+                                      batch_size=batch_size,
+                                      batches_in_flight=batches_in_flight,
+                                      timeout=timeout)
+
+    def get_attach_device_list(self, template_id, uuid):
+        """Get the input rows to attach devices to a template with.
+
+        Args:
+            template_id (str): The template ID to attach to
+            uuid (dict): The UUIDs of the device to attach and mapping for corresponding variables, system-ip, host-name
+
+        Returns:
+            result (list): The input row of each device.
+
         """
         # Construct the variable payload
 
@@ -358,28 +418,124 @@ class DeviceTemplates(object):
 
             device_template_var_list.append(device_template_variables)
 
-        payload = {
-            "deviceTemplateList": [{
-                "templateId": template_id,
-                "device": device_template_var_list,
-                "isEdited": False,
-                "isMasterEdited": False
-            }]
-        }
+        return device_template_var_list
+
+    def get_attach_url(self, config_type):
+        """Get the URL to attach devices to a template of a config type.
+
+        Args:
+            config_type (str): Type of template i.e. device or CLI template
+
+        Returns:
+            result (str): The attachfeature or attachcli URL.
+
+        """
 
         if config_type == 'file':
-            url = f"{self.base_url}template/device/config/attachcli"
-        elif config_type == 'template':
-            url = f"{self.base_url}template/device/config/attachfeature"
-        else:
-            raise RuntimeError('Got invalid Config Type')
+            return f"{self.base_url}template/device/config/attachcli"
+        if config_type == 'template':
+            return f"{self.base_url}template/device/config/attachfeature"
+        raise RuntimeError('Got invalid Config Type')
 
-        utils = Utilities(self.session, self.host, self.port)
-        response = HttpMethods(self.session, url).request('POST', payload=json.dumps(payload))
-        action_id = ParseMethods.parse_id(response)
-        utils.waitfor_action_completion(action_id)
+    @staticmethod
+    def get_attach_batches(device_template_list, batch_size):
+        """Split the devices of a device template list into batches.
 
-        return action_id
+        Templates with few devices share a batch, and the devices of a
+        template with many are spread over several.
+
+        Args:
+            device_template_list (list): Device template entries of an attach payload
+            batch_size (int): The most devices in a batch
+
+        Returns:
+            result (list): The device template list of each batch.
+
+        """
+
+        batches = []
+        batch = []
+        count = 0
+        for device_template in device_template_list:
+            devices = device_template['device']
+            start = 0
+            while start < len(devices):
+                end = start + min(batch_size - count, len(devices) - start)
+                batch.append(dict(device_template, device=devices[start:end]))
+                count += end - start
+                start = end
+                if count >= batch_size:
+                    batches.append(batch)
+                    batch = []
+                    count = 0
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def attach_in_batches(self,
+                          url,
+                          device_template_list,
+                          batch_size=DEFAULT_ATTACH_BATCH_SIZE,
+                          batches_in_flight=DEFAULT_BATCHES_IN_FLIGHT,
+                          timeout=None):
+        """Attach devices in batches, a few batches running on vManage at a time.
+
+        A new batch is sent as each running one completes, so a large
+        rollout keeps going without handing vManage one huge task, and
+        a batch that fails only fails its own devices.
+
+        Args:
+            url (str): The attachfeature or attachcli URL
+            device_template_list (list): Device template entries of an attach payload
+            batch_size (int): The most devices to attach in one call
+            batches_in_flight (int): The most batches to leave running on vManage at once
+            timeout (float): Give up waiting after this many seconds (default: wait forever)
+
+        Returns:
+            result (dict): The devices of each action ID, and the activity of each device
+                attached ('updates') or error of each device that was not ('failures'),
+                keyed by device UUID.
+
+        """
+
+        action_tracker = ActionTracker(self.session, self.host, self.port)
+        tracer = get_tracer(self.session)
+        batches = deque(self.get_attach_batches(device_template_list, max(batch_size, 1)))
+        actions = {}
+        updates = {}
+        failures = {}
+
+        def submit_batches():
+            while batches and len(action_tracker.pending) < max(batches_in_flight, 1):
+                batch = batches.popleft()
+                device_ids = [row['csv-deviceId'] for device_template in batch for row in device_template['device']]
+                payload = {'deviceTemplateList': batch}
+                try:
+                    with tracer.span('attach-batch', attributes={'vmanage.devices': len(device_ids)}):
+                        response = HttpMethods(self.session, url).request('POST', payload=json.dumps(payload))
+                        action_id = ParseMethods.parse_id(response)
+                except Exception as e:
+                    # The batch was never started, so report it against each of its devices
+                    failures.update({device_id: str(e) for device_id in device_ids})
+                    continue
+                actions[action_id] = device_ids
+                action_tracker.add(action_id)
+
+        submit_batches()
+        for result in action_tracker.iter_completed(timeout=timeout):
+            reported = set()
+            for entry in result['action_response'].get('data') or []:
+                reported.add(entry['uuid'])
+                if entry.get('statusId', result['action_status']) == 'failure':
+                    failures[entry['uuid']] = entry.get('currentActivity')
+                else:
+                    updates[entry['uuid']] = entry.get('currentActivity')
+            for device_id in actions[result['action_id']]:
+                if device_id not in reported:
+                    failures[device_id] = f"No status reported by action {result['action_id']}"
+            submit_batches()
+
+        return {'actions': actions, 'updates': updates, 'failures': failures}
 
     def detach_from_template(self, uuid, device_ip, device_type):
         """Detach a device from a template (i.e. Put in CLI mode)
@@ -441,6 +597,7 @@ class DeviceTemplates(object):
         response = HttpMethods(self.session, url).request('GET')
         return ParseMethods.parse_config(response)
 
+    @traced
     def reattach_multi_device_templates(self, template_ids):
         """Re-Attach a template to the devices it it attached to.
 
@@ -456,43 +613,119 @@ class DeviceTemplates(object):
 
         """
 
-        payload = self.get_multi_attach_payload(template_ids)
+        tracer = get_tracer(self.session)
+        with tracer.span('get-input', attributes={'vmanage.templates': len(template_ids)}):
+            payload = self.get_multi_attach_payload(template_ids)
+        # Templates without attached devices have nothing to re-attach
+        payload['deviceTemplateList'] = [
+            device_template for device_template in payload['deviceTemplateList'] if device_template['device']
+        ]
 
-        if payload['deviceTemplateList'][0]['device']:
+        if payload['deviceTemplateList']:
             url = f"{self.base_url}template/device/config/attachfeature"
 
             utils = Utilities(self.session, self.host, self.port)
-            response = HttpMethods(self.session, url).request('POST', payload=json.dumps(payload))
-            action_id = ParseMethods.parse_id(response)
-            utils.waitfor_action_completion(action_id)
+            with tracer.span('attach'):
+                response = HttpMethods(self.session, url).request('POST', payload=json.dumps(payload))
+                action_id = ParseMethods.parse_id(response)
+            with tracer.span('wait', attributes={'vmanage.action.id': action_id}):
+                utils.waitfor_action_completion(action_id)
         else:
             raise RuntimeError(f"Could not retrieve input for template {template_ids}")
         return action_id
 
+    def reattach_device_templates(self, template_ids):
+        """Re-Attach templates of any config type to the devices they are attached to.
+
+        Templates built from feature templates are re-attached with one
+        call, and CLI templates one after the other.  Templates without
+        attached devices are skipped.
+
+        Args:
+            template_ids (list): The template IDs to re-attach
+
+        Returns:
+            action_ids (list): Returns the action id of each attachment
+
+        """
+
+        feature_template_ids = []
+        action_ids = []
+        for template_id in template_ids:
+            if not self.get_attachments(template_id, key='uuid'):
+                continue
+            obj = self.get_device_template_object(template_id)
+            if obj['configType'] == 'template':
+                feature_template_ids.append(template_id)
+            else:
+                action_ids.append(self.reattach_device_template(template_id, obj['configType']))
+        if feature_template_ids:
+            action_ids.append(self.reattach_multi_device_templates(feature_template_ids))
+        if template_ids and not action_ids:
+            raise RuntimeError(f"Could not retrieve input for template {template_ids}")
+        return action_ids
+
+    @traced
+    def reattach_multi_device_templates_in_batches(self,
+                                                   template_ids,
+                                                   batch_size=DEFAULT_ATTACH_BATCH_SIZE,
+                                                   batches_in_flight=DEFAULT_BATCHES_IN_FLIGHT,
+                                                   timeout=None):
+        """Re-Attach templates to the devices they are attached to in batches, waiting for all of them.
+
+        Args:
+            template_ids (list): The template IDs to re-attach
+            batch_size (int): The most devices to re-attach in one call
+            batches_in_flight (int): The most batches to leave running on vManage at once
+            timeout (float): Give up waiting after this many seconds (default: wait forever)
+
+        Returns:
+            result (dict): The result of attach_in_batches.
+
+        """
+
+        tracer = get_tracer(self.session)
+        with tracer.span('get-input', attributes={'vmanage.templates': len(template_ids)}):
+            payload = self.get_multi_attach_payload(template_ids)
+
+        if not any(device_template['device'] for device_template in payload['deviceTemplateList']):
+            raise RuntimeError(f"Could not retrieve input for template {template_ids}")
+        return self.attach_in_batches(f"{self.base_url}template/device/config/attachfeature",
+                                      payload['deviceTemplateList'],
+                                      batch_size=batch_size,
+                                      batches_in_flight=batches_in_flight,
+                                      timeout=timeout)
+
     def get_multi_attach_payload(self, template_ids):
+        """Get the payload to re-attach templates to the devices they are attached to.
+
+        The input of the devices of every template is fetched in chunks,
+        with the calls of all templates running concurrently.
+
+        Args:
+            template_ids (list): The template IDs to re-attach
+
+        Returns:
+            result (dict): The attachfeature payload, with a device template entry per template.
+
+        """
+
+        template_devices = {template_id: None for template_id in template_ids}
+        template_input = TemplateInput(self.session, self.host, self.port).get_input(template_devices)
 
         return_dict = {"deviceTemplateList": []}
-        i = 0
-        for template_id in template_ids:
+        for template_id in dict.fromkeys(template_ids):
             return_dict['deviceTemplateList'].append({
-                "templateId": template_id,
-                "device": [],
-                "isEdited": True,
-                "isMasterEdited": False
+                "templateId":
+                template_id,
+                "device": [
+                    template_input['data'][(template_id, device_id)]
+                    for device_id in template_input['devices'][template_id]
+                ],
+                "isEdited":
+                True,
+                "isMasterEdited":
+                False
             })
-            url = f"{self.base_url}template/device/config/attached/{template_id}"
-            attach_resp = HttpMethods(self.session, url).request('GET')
-            device_list = attach_resp['json']['data']
-            for device in device_list:
-                payload = {
-                    "templateId": template_id,
-                    "deviceIds": [device['uuid']],
-                    "isEdited": False,
-                    "isMasterEdited": False
-                }
-                url = f"{self.base_url}template/device/config/input"
-                input_resp = HttpMethods(self.session, url).request('POST', payload=json.dumps(payload))
-                return_dict['deviceTemplateList'][i]['device'].append(input_resp['json']['data'][0])
-            i += 1
 
         return return_dict
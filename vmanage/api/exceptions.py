@@ -0,0 +1,48 @@
+"""Exceptions Raised by vManage API Interaction.
+"""
+
+
+class VmanageError(Exception):
+    """Base class for errors talking to vManage.
+
+    Attributes:
+        url (str): URL of the API service being called
+
+    """
+    def __init__(self, message, url=None):
+        super(VmanageError, self).__init__(message)
+        self.url = url
+
+
+class VmanageRequestError(VmanageError):
+    """The request could not be completed (HTTP error, bad URL, redirects)."""
+
+
+class VmanageConnectionError(VmanageRequestError, ConnectionError):
+    """vManage could not be reached."""
+
+
+class VmanageTimeoutError(VmanageRequestError, TimeoutError):
+    """The request timed out."""
+
+
+class VmanagePayloadError(VmanageError, ValueError):
+    """The response could not be decoded."""
+
+
+class VmanageHTTPError(VmanageError):
+    """vManage returned an error status code.
+
+    Attributes:
+        status_code (int): The HTTP status code
+        status (str): The HTTP status name
+        error (str): The error message returned by vManage, if any
+        details (str): The error details returned by vManage, if any
+
+    """
+    def __init__(self, message, url=None, status_code=None, status=None, error=None, details=None):
+        super(VmanageHTTPError, self).__init__(message, url=url)
+        self.status_code = status_code
+        self.status = status
+        self.error = error
+        self.details = details
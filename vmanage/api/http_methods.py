@@ -1,17 +1,15 @@
-import json
+from vmanage.api.transport import Transport, STANDARD_HEADERS, STANDARD_TIMEOUT, VALID_STATUS_CODES
 
-import requests
-
-STANDARD_HEADERS = {'Connection': 'keep-alive', 'Content-Type': 'application/json'}
-STANDARD_TIMEOUT = 10
-VALID_STATUS_CODES = [200, 201, 202, 203, 204, 205, 206, 207, 208, 226]
+__all__ = ['HttpMethods', 'STANDARD_HEADERS', 'STANDARD_TIMEOUT', 'VALID_STATUS_CODES']
 
 
 class HttpMethods(object):
     """HTTP Methods for vManage API Interaction
 
     Provides a consistent interaction with the vManage REST API.  Contains
-    error handling for common HTTP interaction issues.
+    error handling for common HTTP interaction issues.  Requests are sent
+    through the Transport shared by the session, so creating an HttpMethods
+    object per call is cheap and reuses pooled connections.
 
     """
     def __init__(self, session, url):
@@ -25,8 +23,9 @@ class HttpMethods(object):
 
         self.session = session
         self.url = url
+        self.transport = Transport.from_session(session)
 
-    def request(self, method, headers=None, payload=None, files=None, timeout=STANDARD_TIMEOUT):
+    def request(self, method, headers=None, payload=None, files=None, timeout=None, cache=True, retry=None):
         """Performs HTTP REST API Call.
 
         Args:
@@ -36,76 +35,49 @@ class HttpMethods(object):
             payload (str): A formatted string to be delivered to
                 vManage via POST or PUT REST call
             file (obj): A file to be sent to vManage
+            timeout (int): Request timeout in seconds (default: the
+                timeouts of the endpoint's profile)
+            cache (bool): Use a cached response if one is available
+            retry (bool): Retry the call if it fails in passing.  GET, PUT,
+                DELETE and read-only POSTs are retried by default; pass True
+                for a POST that is known to be safe to send again.
 
         Returns:
             result (dict): A parsable dictionary containing the full
                 response from vManage for an interaction
 
         Raises:
-            JSONDecodeError: Payload format error.
-            ConnectionError: Connection error.
-            HTTPError: An HTTP error occurred.
-            URLRequired: A valid URL is required to make a request.
-            TooManyRedirects: Too many redirects.
-            Timeout: The request timed out.
-            RequestException: There was an ambiguous exception.
+            VmanagePayloadError: Payload format error.
+            VmanageConnectionError: Connection error.
+            VmanageTimeoutError: The request timed out.
+            VmanageRequestError: HTTP error, bad URL, too many redirects or
+                an ambiguous exception.
+            VmanageHTTPError: vManage returned an error status code.
+
+        """
+
+        return self.transport.request(method,
+                                      self.url,
+                                      headers=headers,
+                                      payload=payload,
+                                      files=files,
+                                      timeout=timeout,
+                                      cache=cache,
+                                      retry=retry)
+
+    def stream(self, method='GET', headers=None, payload=None, timeout=None, key='data'):
+        """Performs HTTP REST API Call, yielding the response data as it is parsed.
+
+        Args:
+            method (str): DELETE, GET, POST, PUT
+            headers (dict): Custom header for specific API interaction
+            payload (str): A formatted string to be delivered to
+                vManage via POST or PUT REST call
+            key (str): The top level key of the array to stream
+
+        Returns:
+            result (iterator): The elements of the response data.
 
         """
 
-        if headers is None:
-            headers = STANDARD_HEADERS
-        result = {}
-        error = None
-        data = None
-        details = None
-        result_json = None
-
-        if payload:
-            if isinstance(payload, str):
-                data = payload.replace("\'", "\"")
-            else:
-                data = payload
-
-        if files:
-            headers = None
-
-        try:
-            response = self.session.request(method, self.url, headers=headers, files=files, data=data, timeout=timeout)
-
-        except requests.exceptions.ConnectionError as e:
-            raise Exception(f'Connection error to {self.url}: {e}')
-        except requests.exceptions.HTTPError as e:
-            raise Exception(f'An HTTP error occurred: {e}')
-        except requests.exceptions.URLRequired as e:
-            raise Exception(f'A valid URL is required to make a request: {e}')
-        except requests.exceptions.TooManyRedirects as e:
-            raise Exception(f'Too many redirects: {e}')
-        except requests.exceptions.Timeout as e:
-            raise Exception(f'The request timed out: {e}')
-        except requests.exceptions.RequestException as e:
-            raise Exception(f'There was an ambiguous exception: {e}')
-
-        if response.text:
-            try:
-                result_json = json.loads(response.text)
-            except json.JSONDecodeError as e:
-                raise Exception(f'Payload format error: {e}')
-
-        result = {
-            'status_code': response.status_code,
-            'status': requests.status_codes._codes[response.status_code][0],  #pylint: disable=protected-access
-            'details': details,
-            'error': error,
-            'json': result_json,
-            'response': response,
-        }
-
-        if response.status_code not in VALID_STATUS_CODES:
-            if result_json and 'error' in result_json:
-                details = result_json['error']['details']
-                error = result_json['error']['message']
-                raise Exception(f"{self.url}: Error {result['status_code']} ({result['status']}) - {error}: {details}")
-            else:
-                raise Exception(f"{self.url}: Error {result['status_code']} ({result['status']})")
-
-        return result
+        return self.transport.stream(method, self.url, headers=headers, payload=payload, timeout=timeout, key=key)
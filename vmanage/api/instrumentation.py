@@ -0,0 +1,233 @@
+"""Instrumentation Hooks for vManage API Calls.
+"""
+
+import bisect
+import re
+import threading
+import time
+from vmanage.api.cache import get_api_path
+
+# Path segments that name an object rather than an endpoint: numbers, IP
+# addresses, long hex IDs and anything holding a UUID (such as action IDs)
+ID_SEGMENT = re.compile(r'^(\d+|\d+(\.\d+){3}|[0-9a-f]{16,})$|[0-9a-f]{8}(-[0-9a-f]{4}){3}-[0-9a-f]{12}', re.IGNORECASE)
+MASKED_ID = '{id}'
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600]
+PERCENTILES = [50, 90, 99]
+
+
+def get_endpoint(url):
+    """Get the endpoint of a call, with the IDs in its path masked.
+
+    Args:
+        url (str): Full URL of the API service
+
+    Returns:
+        result (str): The API path, e.g. template/device/object/{id}.
+
+    """
+
+    return '/'.join(MASKED_ID if ID_SEGMENT.search(segment) else segment for segment in get_api_path(url).split('/'))
+
+
+class Instrumentation(object):
+    """Hooks called before and after each API call made through a transport.
+
+    Each call is described by a dictionary holding its method, url,
+    endpoint (the path with IDs masked) and bytes_sent.  Before hooks get
+    it as the call is about to be sent.  After hooks get it once the call
+    is done, with status_code (None if no response came back),
+    bytes_received, latency (in seconds, across retries), retries and
+    error (the exception raised, if any) filled in.  Hooks run on the
+    thread making the call, so they have to be thread safe and quick.
+    Calls are not timed at all while there are no hooks.
+
+    """
+    def __init__(self):
+        self.before_hooks = []
+        self.after_hooks = []
+
+    @property
+    def enabled(self):
+        return bool(self.before_hooks or self.after_hooks)
+
+    def add_hooks(self, before=None, after=None):
+        """Add hooks.
+
+        Args:
+            before (callable): Called with the call before it is sent
+            after (callable): Called with the call once it is done
+
+        """
+
+        # Replace the lists rather than changing them, calls in flight keep the hooks they started with
+        if before is not None:
+            self.before_hooks = self.before_hooks + [before]
+        if after is not None:
+            self.after_hooks = self.after_hooks + [after]
+
+    def remove_hooks(self, before=None, after=None):
+        """Remove hooks added by add_hooks."""
+
+        if before is not None:
+            self.before_hooks = [hook for hook in self.before_hooks if hook != before]
+        if after is not None:
+            self.after_hooks = [hook for hook in self.after_hooks if hook != after]
+
+    def start(self, method, url, data=None):
+        """Describe a call and run the before hooks.
+
+        Args:
+            method (str): DELETE, GET, POST, PUT
+            url (str): URL of the API service being called
+            data (str): The payload as it will be sent
+
+        Returns:
+            call (dict): The call, to be passed to finish.
+
+        """
+
+        call = {
+            'method': method.upper(),
+            'url': url,
+            'endpoint': get_endpoint(url),
+            'bytes_sent': len(data) if isinstance(data, (str, bytes)) else 0,
+            'status_code': None,
+            'bytes_received': 0,
+            'latency': None,
+            'retries': 0,
+            'error': None,
+        }
+        for hook in self.before_hooks:
+            hook(call)
+        call['started'] = time.perf_counter()
+        return call
+
+    def finish(self, call, response=None, error=None, stream=False):
+        """Fill in the outcome of a call and run the after hooks.
+
+        Args:
+            call (dict): The call returned by start
+            response (obj): Requests response object, if one came back
+            error (Exception): The exception raised by the call, if any
+            stream (bool): The response body has not been read yet
+
+        """
+
+        call['latency'] = time.perf_counter() - call.pop('started')
+        call['error'] = error
+        if response is not None:
+            call['status_code'] = response.status_code
+            if stream:
+                call['bytes_received'] = int(response.headers.get('Content-Length') or 0)
+            else:
+                call['bytes_received'] = len(response.content or b'')
+        for hook in self.after_hooks:
+            hook(call)
+
+
+class LatencyHistogram(object):
+    """Latency histogram and call counts per endpoint, built from after hooks.
+
+    Percentiles are read from the histogram buckets, so they are the upper
+    bound of the bucket the percentile falls in (or the slowest call, if
+    that is lower).
+
+    """
+    def __init__(self, buckets=None):
+        """Initialize the histogram.
+
+        Args:
+            buckets (list): Upper bounds of the buckets in seconds (default: LATENCY_BUCKETS)
+
+        """
+
+        self.buckets = list(LATENCY_BUCKETS if buckets is None else buckets)
+        self.lock = threading.Lock()
+        self.endpoints = {}
+
+    def record(self, call):
+        """Add a finished call to the histogram (an after hook)."""
+
+        key = (call['method'], call['endpoint'])
+        with self.lock:
+            stats = self.endpoints.get(key)
+            if stats is None:
+                stats = self.endpoints[key] = {
+                    'calls': 0,
+                    'errors': 0,
+                    'retries': 0,
+                    'seconds': 0.0,
+                    'max': 0.0,
+                    'bytes_sent': 0,
+                    'bytes_received': 0,
+                    'counts': [0] * (len(self.buckets) + 1),
+                }
+            stats['calls'] += 1
+            stats['errors'] += 1 if call['error'] is not None or (call['status_code'] or 0) >= 400 else 0
+            stats['retries'] += call['retries']
+            stats['seconds'] += call['latency']
+            stats['max'] = max(stats['max'], call['latency'])
+            stats['bytes_sent'] += call['bytes_sent']
+            stats['bytes_received'] += call['bytes_received']
+            stats['counts'][bisect.bisect_left(self.buckets, call['latency'])] += 1
+
+    def get_percentile(self, stats, percentile):
+        rank = percentile / 100.0 * stats['calls']
+        seen = 0
+        for bucket, count in enumerate(stats['counts']):
+            seen += count
+            if count and seen >= rank:
+                return min(self.buckets[bucket], stats['max']) if bucket < len(self.buckets) else stats['max']
+        return stats['max']
+
+    def get_summary(self):
+        """Summarize the calls per endpoint.
+
+        Returns:
+            result (list): Calls, errors, retries, bytes and latency (total,
+                mean, percentiles and max, in seconds) of each method and
+                endpoint, the endpoints taking the most time first.
+
+        """
+
+        summary = []
+        with self.lock:
+            for (method, endpoint), stats in self.endpoints.items():
+                entry = {
+                    'method': method,
+                    'endpoint': endpoint,
+                    'calls': stats['calls'],
+                    'errors': stats['errors'],
+                    'retries': stats['retries'],
+                    'bytes_sent': stats['bytes_sent'],
+                    'bytes_received': stats['bytes_received'],
+                    'total': stats['seconds'],
+                    'mean': stats['seconds'] / stats['calls'],
+                    'max': stats['max'],
+                }
+                for percentile in PERCENTILES:
+                    entry[f'p{percentile}'] = self.get_percentile(stats, percentile)
+                summary.append(entry)
+        return sorted(summary, key=lambda entry: entry['total'], reverse=True)
+
+    def format_summary(self):
+        """Format the summary as a table, with latencies in milliseconds.
+
+        Returns:
+            result (str): The table.
+
+        """
+
+        summary = self.get_summary()
+        columns = ['Calls', 'Errors', 'Retries', 'Total s'] + [f'p{percentile} ms'
+                                                               for percentile in PERCENTILES] + ['Max ms', 'KB in']
+        width = max([len('Endpoint')] + [len(entry['method']) + len(entry['endpoint']) + 1 for entry in summary])
+        lines = ['  '.join(['Endpoint'.ljust(width)] + [column.rjust(8) for column in columns])]
+        for entry in summary:
+            values = [str(entry['calls']), str(entry['errors']), str(entry['retries']), f"{entry['total']:.2f}"]
+            values.extend(f"{entry[f'p{percentile}'] * 1000:.1f}" for percentile in PERCENTILES)
+            values.extend([f"{entry['max'] * 1000:.1f}", f"{entry['bytes_received'] / 1024.0:.1f}"])
+            name = f"{entry['method']} {entry['endpoint']}"
+            lines.append('  '.join([name.ljust(width)] + [value.rjust(8) for value in values]))
+        return '\n'.join(lines)
@@ -30,7 +30,7 @@ class LocalPolicy(object):
         self.host = host
         self.port = port
         self.base_url = f'https://{self.host}:{self.port}/dataservice/'
-        self.policy_definitions = PolicyDefinitions(self.session, self.host)
+        self.policy_definitions = PolicyDefinitions(self.session, self.host, self.port)
 
     # Need to decide where this goes
 
@@ -1,9 +1,14 @@
 """Cisco vManage Monitor Networks API Methods.
 """
 
+import functools
+
 from six.moves.urllib.parse import urlencode
 from vmanage.api.http_methods import HttpMethods
 from vmanage.data.parse_methods import ParseMethods
+from vmanage.utils import run_concurrently
+
+DEFAULT_COLLECT_WORKERS = 20
 
 
 class MonitorNetwork(object):
@@ -28,6 +33,26 @@ class MonitorNetwork(object):
         self.port = port
         self.base_url = f'https://{self.host}:{self.port}/dataservice/'
 
+    def collect(self, method, system_ips, workers=DEFAULT_COLLECT_WORKERS, **kwargs):
+        """Run a per-device query across many devices in parallel.
+
+        Args:
+            method (str): Name of a per-device method (e.g. 'get_bfd_sessions')
+            system_ips (list): Device System IPs to query
+            workers (int): Number of queries to run concurrently
+            kwargs: Optional arguments passed to each query
+
+        Yields:
+            result (tuple): (system_ip, rows) as each query finishes, or
+                (system_ip, exception) if the query for that device failed.
+        """
+
+        query = getattr(self, method)
+        if kwargs:
+            query = functools.partial(query, **kwargs)
+        for system_ip, result in run_concurrently(query, system_ips, workers=workers):
+            yield system_ip, result
+
     def _get_device_type(self, system_ip):
         device_model = self.get_device_system_info(system_ip)[0]['device-model']
         url = f"{self.base_url}device/models"
@@ -82,6 +107,8 @@ class MonitorNetwork(object):
             system_ip (str): Device System IP
             remote_system_ip (str): (Optional) Remote System IP
             remote_color (str): (Optional) Remote Color
+            stream (bool): (Optional) Return an iterator that yields rows as they are
+                parsed instead of loading the whole response
 
         Returns:
             result (dict): Device BFD history data.
@@ -95,6 +122,8 @@ class MonitorNetwork(object):
         if 'remote_color' in kwargs:
             query_params.append(('color', kwargs['remote_color']))
         url += '?' + urlencode(query_params)
+        if kwargs.get('stream'):
+            return HttpMethods(self.session, url).stream('GET')
         response = HttpMethods(self.session, url).request('GET')
         result = ParseMethods.parse_data(response)
         return result
@@ -373,6 +402,8 @@ class MonitorNetwork(object):
             system_ip (str): Device System IP
             interface_name (str): Interface name values: ge0/0 - ge0/7, system, , eth0
             primary_dns_ipv4 (str): Primary DNS IP
+            stream (bool): (Optional) Return an iterator that yields rows as they are
+                parsed instead of loading the whole response
 
         Returns:
             result (dict): All data associated with a response.
@@ -386,6 +417,8 @@ class MonitorNetwork(object):
         if 'primary_dns_ipv4' in kwargs:
             query_params.append(('ipv4-dns-pri', kwargs['primary_dns_ipv4']))
         url += '?' + urlencode(query_params)
+        if kwargs.get('stream'):
+            return HttpMethods(self.session, url).stream('GET')
         response = HttpMethods(self.session, url).request('GET')
         result = ParseMethods.parse_data(response)
         return result
@@ -469,6 +502,8 @@ class MonitorNetwork(object):
             peer_type (str): Peer type (vedge, vsmart, vmanage, vbond)
             peer_system_ip (str): Peer System IP
             local_color (str): Local Color
+            stream (bool): (Optional) Return an iterator that yields rows as they are
+                parsed instead of loading the whole response
 
         Returns:
             result (dict): All data associated with a response.
@@ -484,6 +519,8 @@ class MonitorNetwork(object):
         if 'local_color' in kwargs:
             query_params.append(('local-color', kwargs['local_color']))
         url += '?' + urlencode(query_params)
+        if kwargs.get('stream'):
+            return HttpMethods(self.session, url).stream('GET')
         response = HttpMethods(self.session, url).request('GET')
         result = ParseMethods.parse_data(response)
         return result
@@ -824,6 +861,8 @@ class MonitorNetwork(object):
             source_ip (str): Source IP
             application (str): Application
             family (str): Family
+            stream (bool): (Optional) Return an iterator that yields rows as they are
+                parsed instead of loading the whole response
 
         Returns:
             result (dict): All data associated with a response.
@@ -841,6 +880,8 @@ class MonitorNetwork(object):
         if 'family' in kwargs:
             query_params.append(('family', kwargs['family']))
         url += '?' + urlencode(query_params)
+        if kwargs.get('stream'):
+            return HttpMethods(self.session, url).stream('GET')
         response = HttpMethods(self.session, url).request('GET')
         result = ParseMethods.parse_data(response)
         return result
@@ -1135,6 +1176,8 @@ class MonitorNetwork(object):
             source_protocol (str): Source Protocol
             next_hop_address (str): Next-Hop Address (cEdge Only)
             next_hop_oif (str): Next-Hop Outgoing Interface (cEdge Only)
+            stream (bool): (Optional) Return an iterator that yields rows as they are
+                parsed instead of loading the whole response
 
         Returns:
             result (dict): All data associated with a response.
@@ -1170,6 +1213,8 @@ class MonitorNetwork(object):
         else:
             raise Exception(f"Could not retrieve device type {device_type} for {system_ip}")
         url += '?' + urlencode(query_params)
+        if kwargs.get('stream'):
+            return HttpMethods(self.session, url).stream('GET', timeout=60)
         response = HttpMethods(self.session, url).request('GET', timeout=60)
         result = ParseMethods.parse_data(response)
         return result
@@ -1425,6 +1470,8 @@ class MonitorNetwork(object):
             system_ip (str): Device System IP
             vpn_id (str): VPN ID
             prefix (str): Prefix
+            stream (bool): (Optional) Return an iterator that yields rows as they are
+                parsed instead of loading the whole response
 
         Returns:
             result (dict): All data associated with a response.
@@ -1438,6 +1485,8 @@ class MonitorNetwork(object):
         if 'prefix' in kwargs:
             query_params.append(('prefix', kwargs['prefix']))
         url += '?' + urlencode(query_params)
+        if kwargs.get('stream'):
+            return HttpMethods(self.session, url).stream('GET', timeout=60)
         response = HttpMethods(self.session, url).request('GET', timeout=60)
         result = ParseMethods.parse_data(response)
         return result
@@ -82,11 +82,10 @@ class PolicyDefinitions(object):
         HttpMethods(self.session, url).request('DELETE')
 
     def add_policy_definition(self, policy_definition):
-        """Delete a Policy Definition from vManage.
+        """Add a Policy Definition to vManage.
 
         Args:
-            definition_type (str): The defintion type of the requested policy definition
-            definition_id (str): The defintion ID of the requested policy definition
+            policy_definition (dict): The Policy Definition
 
         Returns:
             result (dict): All data associated with a response.
@@ -94,7 +93,8 @@ class PolicyDefinitions(object):
         """
 
         url = f"{self.base_url}template/policy/definition/{policy_definition['type'].lower()}"
-        HttpMethods(self.session, url).request('POST', payload=json.dumps(policy_definition))
+        response = HttpMethods(self.session, url).request('POST', payload=json.dumps(policy_definition))
+        return response
 
     def update_policy_definition(self, policy_definition, policy_definition_id):
         """Update a Policy Definition from vManage.
@@ -152,18 +152,34 @@ class PolicyDefinitions(object):
 
         definition_list = []
 
-        if definition_type == "advancedMalwareProtection":
-            url = f"{self.base_url}template/policy/definition/{definition_type}"
-        else:
-            url = f"{self.base_url}template/policy/definition/{definition_type.lower()}"
-        response = HttpMethods(self.session, url).request('GET')
-        result = ParseMethods.parse_data(response)
+        result = self.get_policy_definition_summary_list(definition_type)
         for definition in result:
             definition_detail = self.get_policy_definition(definition_type, definition['definitionId'])
             if definition_detail:
                 definition_list.append(definition_detail)
         return definition_list
 
+    def get_policy_definition_summary_list(self, definition_type):
+        """Get the summary of each Policy Definition of a type from vManage.
+
+        The summaries hold the name, type and ID of each definition, but
+        not the definition itself.
+
+        Args:
+            definition_type (string): The type of Definition List to retreive
+
+        Returns:
+            response (list): The summaries of the definitions.
+
+        """
+
+        if definition_type == "advancedMalwareProtection":
+            url = f"{self.base_url}template/policy/definition/{definition_type}"
+        else:
+            url = f"{self.base_url}template/policy/definition/{definition_type.lower()}"
+        response = HttpMethods(self.session, url).request('GET')
+        return ParseMethods.parse_data(response)
+
     def get_policy_definition_dict(self, definition_type, key_name='name', remove_key=False):
         """Get all Policy Definition Lists from vManage.
 
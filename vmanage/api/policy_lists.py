@@ -3,6 +3,7 @@
 
 import json
 from vmanage.api.http_methods import HttpMethods
+from vmanage.api.transport import Transport
 from vmanage.data.parse_methods import ParseMethods
 from vmanage.utils import list_to_dict
 
@@ -28,7 +29,7 @@ class PolicyLists(object):
         self.host = host
         self.port = port
         self.base_url = f'https://{self.host}:{self.port}/dataservice/'
-        self.policy_list_cache = {}
+        self.transport = Transport.from_session(self.session)
 
     def delete_data_prefix_list(self, listid):
         """Delete a Data Prefix List from vManage.
@@ -139,7 +140,11 @@ class PolicyLists(object):
         return result
 
     def clear_policy_list_cache(self):
-        self.policy_list_cache = {}
+        """Drop the cached policy lists so that the next lookup refetches them.
+
+        """
+
+        self.transport.cache.invalidate('template/policy/list')
 
     def get_policy_list_list(self, policy_list_type='all', cache=True):
         """Get a list of policy lists
@@ -152,19 +157,12 @@ class PolicyLists(object):
             result (dict): All data associated with a response.
 
         """
-        if cache and policy_list_type in self.policy_list_cache:
-            response = self.policy_list_cache[policy_list_type.lower()]
+        if policy_list_type == 'all':
+            url = f"{self.base_url}template/policy/list"
         else:
-            if policy_list_type == 'all':
-                url = f"{self.base_url}template/policy/list"
-                # result = self.request('/template/policy/list', status_codes=[200])
-            else:
-                url = f"{self.base_url}template/policy/list/{policy_list_type.lower()}"
-                # result = self.request('/template/policy/list/{0}'.format(type.lower()), status_codes=[200, 404])
-
-            response = HttpMethods(self.session, url).request('GET')
+            url = f"{self.base_url}template/policy/list/{policy_list_type.lower()}"
 
-        self.policy_list_cache[policy_list_type.lower()] = response
+        response = HttpMethods(self.session, url).request('GET', cache=cache)
         return response['json']['data']
 
     def get_policy_list_dict(self, policy_list_type='all', key_name='name', remove_key=False, cache=True):
@@ -238,11 +236,25 @@ class PolicyLists(object):
             response (dict): Results from attempting to add a new
                 prefix list.
 
+        """
+        return ParseMethods.parse_status(self.add_policy_list_response(policy_list))
+
+    def add_policy_list_response(self, policy_list):
+        """Add a new Policy List to vManage, returning the whole response.
+
+        Args:
+            policy_list (dict): The Policy List
+
+        Returns:
+            response (dict): All data associated with the response,
+                including the listId of the new list.
+
         """
         policy_list_type = policy_list['type'].lower()
         url = f"{self.base_url}template/policy/list/{policy_list_type}"
         response = HttpMethods(self.session, url).request('POST', payload=json.dumps(policy_list))
-        return ParseMethods.parse_status(response)
+        ParseMethods.parse_status(response)
+        return response
 
     def update_policy_list(self, policy_list):
         """Update an existing Policy List on vManage.
@@ -5,6 +5,7 @@ import json
 import time
 import sys
 from vmanage.api.http_methods import HttpMethods
+from vmanage.api.template_input import TemplateInput
 from vmanage.data.parse_methods import ParseMethods
 
 
@@ -63,15 +64,28 @@ class PolicyUpdates(object):
 
         """
 
-        payload = {"templateId": template_id, "deviceIds": device_ids, "isEdited": True, "isMasterEdited": False}
+        return self.get_template_device_inputs({template_id: device_ids})[template_id]
 
-        api = "template/device/config/input"
-        url = self.base_url + api
-        response = HttpMethods(self.session, url).request('POST', payload=json.dumps(payload))
-        result = ParseMethods.parse_data(response)
+    def get_template_device_inputs(self, template_devices):
+        """GET device inputs of many templates from vManage.
 
-        for item in result:
-            item['csv-templateId'] = template_id
+        Args:
+            template_devices (dict): vManage assigned device ids keyed by template
+                identifier, or None for every device attached to the template.
+
+        Returns:
+            response (dict): device inputs keyed by template identifier.
+
+        """
+
+        template_input = TemplateInput(self.session, self.host, self.port).get_input(template_devices, is_edited=True)
+        result = {}
+        for template_id, device_ids in template_input['devices'].items():
+            result[template_id] = []
+            for device_id in device_ids:
+                item = template_input['data'][(template_id, device_id)]
+                item['csv-templateId'] = template_id
+                result[template_id].append(item)
 
         return result
 
@@ -166,16 +180,11 @@ class PolicyUpdates(object):
 
         # Get device uuid and csv variables for each template id which is affected by prefix list edit operation
 
-        inputs = []
-
-        for template_id in master_templates_affected:
-            device_ids = self.get_device_ids(template_id)
-            device_inputs = self.get_device_inputs(template_id, device_ids)
-            inputs.append((template_id, device_inputs))
+        inputs = self.get_template_device_inputs({template_id: None for template_id in master_templates_affected})
 
         device_template_list = []
 
-        for (template_id, device_input) in inputs:
+        for template_id, device_input in inputs.items():
             device_template_list.append({'templateId': template_id, 'isEdited': True, 'device': device_input})
 
         #api for CLI template 'template/device/config/attachcli'
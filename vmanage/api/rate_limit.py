@@ -0,0 +1,254 @@
+"""Client Side Rate Limiting for vManage API Calls.
+"""
+
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from vmanage.api.cache import get_api_path
+
+# Request rates per endpoint family, in calls per second with a burst
+# allowance.  Realtime device calls are relayed to the devices themselves,
+# so they get the lowest rate, with a burst that still covers a full round
+# of MonitorNetwork.collect workers.  The first matching family is used.
+RATE_LIMIT_FAMILIES = {
+    'device/action': {
+        'pattern': r'^device/action(/|$)',
+        'rate': 20,
+        'burst': 40,
+    },
+    'device': {
+        'pattern': r'^device(/|$)',
+        'rate': 40,
+        'burst': 40,
+    },
+    'template': {
+        'pattern': r'^template(/|$)',
+        'rate': 50,
+        'burst': 100,
+    },
+}
+DEFAULT_RATE = 50
+DEFAULT_BURST = 100
+
+# Status codes vManage uses to push back on clients.  The transport's retry
+# policy retries throttled calls, so the limiter itself only retries them
+# for callers without a retry layer of their own.
+THROTTLE_STATUS_CODES = [429, 503]
+DEFAULT_THROTTLE_RETRIES = 3
+DEFAULT_THROTTLE_DELAY = 1.0
+MAX_THROTTLE_DELAY = 60.0
+# The rate is cut by this factor when vManage pushes back and recovers by
+# this fraction of the configured rate after each accepted call.
+RATE_DECREASE = 0.5
+RATE_RECOVERY = 0.05
+MIN_RATE = 0.5
+TOKEN_EPSILON = 1e-9
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_retry_delay(response, attempt):
+    """Get how long to wait before retrying a throttled request.
+
+    Args:
+        response (obj): Requests response object
+        attempt (int): The number of retries already made
+
+    Returns:
+        result (float): Seconds to wait, from the Retry-After header if
+            vManage sent one and an exponential backoff otherwise.
+
+    """
+
+    retry_after = response.headers.get('Retry-After')
+    delay = None
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                delay = None
+    if delay is None:
+        delay = DEFAULT_THROTTLE_DELAY * 2**attempt
+    return min(max(delay, 0), MAX_THROTTLE_DELAY)
+
+
+class TokenBucket(object):
+    """Token bucket limiting the rate of calls to one endpoint family.
+
+    The rate backs off when vManage throttles a call and creeps back up to
+    the configured rate as calls are accepted again.
+
+    """
+    def __init__(self, rate, burst):
+        """Initialize a full bucket.
+
+        Args:
+            rate (float): Calls per second
+            burst (int): Calls that can be made at once after a quiet period
+
+        """
+
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.tokens + (now - self.updated) * self.rate, self.burst)
+        self.updated = now
+
+    def acquire(self):
+        """Wait until a call can be made."""
+
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self.blocked_until - now
+                if wait <= 0:
+                    # Allow for rounding, or a token short by a hair would be waited for forever
+                    if self.tokens >= 1 - TOKEN_EPSILON:
+                        self.tokens = max(self.tokens - 1, 0)
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def throttle(self, delay):
+        """Hold off all calls for a while and lower the rate.
+
+        Args:
+            delay (float): Seconds before the next call can be made
+
+        """
+
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.rate * RATE_DECREASE, min(MIN_RATE, self.max_rate))
+            self.tokens = 0
+            self.blocked_until = max(self.blocked_until, now + delay)
+
+    def recover(self):
+        """Raise the rate back towards the configured rate after an accepted call."""
+
+        if self.rate < self.max_rate:
+            with self.lock:
+                self.rate = min(self.rate + self.max_rate * RATE_RECOVERY, self.max_rate)
+
+
+class RateLimiter(object):
+    """Rate limiter for the API calls made to one vManage.
+
+    Each endpoint family has its own token bucket, and calls that match no
+    family share a default bucket.  A throttled call (429 or 503) holds
+    off its family for the Retry-After time, or an exponential backoff,
+    and lowers the family's rate.  Whoever sent the call decides whether
+    to send it again.
+
+    """
+    def __init__(self, families=None, rate=DEFAULT_RATE, burst=DEFAULT_BURST, retries=0):
+        """Initialize the rate limiter.
+
+        Args:
+            families (dict): Endpoint families with their rate and burst
+                (default: RATE_LIMIT_FAMILIES)
+            rate (float): Calls per second for calls in no family
+            burst (int): Burst allowance for calls in no family
+            retries (int): Times to retry a throttled call before returning it
+                (default: none, the caller retries)
+
+        """
+
+        self.families = dict(RATE_LIMIT_FAMILIES if families is None else families)
+        self.retries = retries
+        self.buckets = {name: TokenBucket(family['rate'], family['burst']) for name, family in self.families.items()}
+        self.default_bucket = TokenBucket(rate, burst)
+        self._patterns = [(name, re.compile(family['pattern'])) for name, family in self.families.items()]
+
+    def get_bucket(self, url):
+        """Get the token bucket for a URL.
+
+        Args:
+            url (str): Full URL of the API service
+
+        Returns:
+            result (TokenBucket): The bucket of the URL's family.
+
+        """
+
+        path = get_api_path(url)
+        for name, pattern in self._patterns:
+            if pattern.match(path):
+                return self.buckets[name]
+        return self.default_bucket
+
+    def request(self, url, send, retries=None, attempt=0):
+        """Make a call when the rate allows, holding off its family while vManage throttles it.
+
+        Args:
+            url (str): Full URL of the API service
+            send (callable): Makes the call and returns the Requests response
+            retries (int): Times to retry a throttled call (default: the limiter's setting)
+            attempt (int): The number of times the caller already sent the call,
+                which sets the backoff when vManage sends no Retry-After
+
+        Returns:
+            response (obj): Requests response object.  The last throttled
+                response is returned once the retries run out.
+
+        """
+
+        bucket = self.get_bucket(url)
+        retries = self.retries if retries is None else retries
+        retries += attempt
+        while True:
+            bucket.acquire()
+            response = send()
+            if response.status_code not in THROTTLE_STATUS_CODES:
+                bucket.recover()
+                return response
+            bucket.throttle(get_retry_delay(response, attempt))
+            if attempt >= retries:
+                return response
+            response.close()
+            attempt += 1
+
+
+def get_rate_limiter(url):
+    """Get the rate limiter shared by everything calling a vManage.
+
+    Args:
+        url (str): Any URL on the vManage
+
+    Returns:
+        result (RateLimiter): The rate limiter for the URL's host.
+
+    """
+
+    host = urlsplit(url).hostname
+    with _rate_limiters_lock:
+        if host not in _rate_limiters:
+            _rate_limiters[host] = RateLimiter()
+        return _rate_limiters[host]
+
+
+def set_rate_limiter(host, rate_limiter):
+    """Replace the rate limiter for a vManage, e.g. to change its rates.
+
+    Args:
+        host (str): hostname or IP address of vManage
+        rate_limiter (RateLimiter): The rate limiter to use for the host
+
+    """
+
+    with _rate_limiters_lock:
+        _rate_limiters[host] = rate_limiter
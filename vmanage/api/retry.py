@@ -0,0 +1,84 @@
+"""Retry Policy for vManage API Calls.
+"""
+
+import random
+from vmanage.api.cache import READ_ONLY_POSTS, get_api_path
+
+# Methods that can be sent again without changing the outcome
+IDEMPOTENT_METHODS = ['GET', 'PUT', 'DELETE']
+# Gateway errors raised while vManage itself is restarting or failing over.
+# Throttled calls (429 and 503) are always retried by the transport.
+RETRY_STATUS_CODES = [502, 504]
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+DEFAULT_MAX_BACKOFF = 30.0
+
+
+class RetryPolicy(object):
+    """Decide which failed calls are retried and how long to wait in between.
+
+    Calls that fail to connect, time out or hit a gateway error are
+    retried when sending them again is safe: idempotent methods always,
+    and POSTs when they only read data or the caller says so.  The wait
+    grows exponentially with full jitter, so many workers retrying at once
+    don't hit vManage together.  Calls that vManage throttled or that never
+    reached it are sent again whatever the method, within the same number
+    of retries.
+
+    """
+    def __init__(self,
+                 retries=DEFAULT_RETRIES,
+                 backoff=DEFAULT_BACKOFF,
+                 max_backoff=DEFAULT_MAX_BACKOFF,
+                 methods=None,
+                 safe_posts=None):
+        """Initialize the retry policy.
+
+        Args:
+            retries (int): Times to retry a failed call
+            backoff (float): Base wait in seconds, doubled after each retry
+            max_backoff (float): Longest wait between retries
+            methods (list): Methods that are always retried (default: IDEMPOTENT_METHODS)
+            safe_posts (list): API path prefixes of POSTs that are safe to
+                retry (default: the read-only POSTs)
+
+        """
+
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.methods = [method.upper() for method in (IDEMPOTENT_METHODS if methods is None else methods)]
+        self.safe_posts = list(READ_ONLY_POSTS if safe_posts is None else safe_posts)
+
+    def is_retryable(self, method, url, retry=None):
+        """Check whether a call may be sent again.
+
+        Args:
+            method (str): DELETE, GET, POST, PUT
+            url (str): Full URL of the API service
+            retry (bool): Override the policy for this call
+
+        Returns:
+            result (bool): True if the call can be retried.
+
+        """
+
+        if retry is not None:
+            return retry
+        if method.upper() in self.methods:
+            return True
+        path = get_api_path(url)
+        return method.upper() == 'POST' and any(path.startswith(prefix) for prefix in self.safe_posts)
+
+    def get_delay(self, attempt):
+        """Get how long to wait before a retry.
+
+        Args:
+            attempt (int): The number of retries already made
+
+        Returns:
+            result (float): Seconds to wait.
+
+        """
+
+        return random.uniform(0, min(self.backoff * 2**attempt, self.max_backoff))
@@ -30,7 +30,7 @@ class SecurityPolicy(object):
         self.host = host
         self.port = port
         self.base_url = f'https://{self.host}:{self.port}/dataservice/'
-        self.policy_definitions = PolicyDefinitions(self.session, self.host)
+        self.policy_definitions = PolicyDefinitions(self.session, self.host, self.port)
 
     def add_security_policy(self, policy):
         """Add a Security Policy from vManage.
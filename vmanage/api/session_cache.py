@@ -0,0 +1,161 @@
+"""On-Disk Cache of vManage Login Sessions.
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import stat
+import time
+import warnings
+
+DEFAULT_SESSION_CACHE_DIR = os.path.join('~', '.cache', 'vmanage')
+# vManage drops sessions after 30 minutes without a call, so cached
+# sessions are only reused for a little less than that.
+DEFAULT_SESSION_TTL = 25 * 60
+# The hash only has to keep a session from being resumed with another
+# password, since the cookies next to it grant access on their own.
+PASSWORD_HASH_ITERATIONS = 10000
+
+
+def hash_password(password, salt):
+    return hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, PASSWORD_HASH_ITERATIONS).hex()
+
+
+class SessionCache(object):
+    """Cache of login sessions shared by separate runs of the CLI.
+
+    Each entry holds the session cookies, the XSRF token and the vManage
+    version for one host, port and user, and expires when vManage would
+    drop the session.  A salted hash of the password the session was
+    opened with is kept as well, and the session is only handed back
+    for that password.  Entries are only readable by the current user
+    since the cookies are as good as the password until they expire.
+    A cache that can't be read or written is skipped with a warning, and
+    the session is used without it.
+
+    """
+    def __init__(self, cache_dir=None, ttl=DEFAULT_SESSION_TTL):
+        """Initialize the session cache.
+
+        Args:
+            cache_dir (str): Directory to keep sessions in (default:
+                $VMANAGE_CACHE_DIR, or ~/.cache/vmanage)
+            ttl (int): Seconds a session stays valid after it was last used
+
+        """
+
+        self.cache_dir = os.path.expanduser(cache_dir or os.environ.get('VMANAGE_CACHE_DIR')
+                                            or DEFAULT_SESSION_CACHE_DIR)
+        self.ttl = ttl
+
+    def get_path(self, host, port, user):
+        """Get the file holding the session for a host, port and user.
+
+        Returns:
+            result (str): The path of the session file.
+
+        """
+
+        key = hashlib.sha256(f'{host}:{port}:{user}'.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f'session-{key}.json')
+
+    def load(self, host, port, user, password):
+        """Load a cached session.
+
+        Args:
+            host (str): hostname or IP address of vManage
+            port (int): vManage port
+            user (str): username the session belongs to
+            password (str): password the session must have been opened with
+
+        Returns:
+            result (dict): The cookies, token and version of the session,
+                or None if there is no session for the password or it has expired.
+
+        """
+
+        try:
+            with open(self.get_path(host, port, user)) as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            warnings.warn(f"Could not load the session from {self.cache_dir}: {e}")
+            return None
+        if entry.get('host') != host or entry.get('user') != user or entry.get('expires', 0) < time.time():
+            return None
+        try:
+            password_hash = hash_password(password or '', bytes.fromhex(entry['salt']))
+        except (KeyError, TypeError, ValueError):
+            return None
+        if not hmac.compare_digest(password_hash, entry.get('password_hash') or ''):
+            return None
+        return entry
+
+    def save(self, host, port, user, password, cookies, token=None, version=None):
+        """Save a session, replacing any cached session for the host, port and user.
+
+        Args:
+            host (str): hostname or IP address of vManage
+            port (int): vManage port
+            user (str): username the session belongs to
+            password (str): password the session was opened with
+            cookies (dict): Session cookies, including JSESSIONID
+            token (str): X-XSRF-TOKEN for vManage version >= 19.2.0
+            version (str): vManage version
+
+        """
+
+        salt = os.urandom(16)
+        entry = {
+            'host': host,
+            'port': port,
+            'user': user,
+            'salt': salt.hex(),
+            'password_hash': hash_password(password or '', salt),
+            'cookies': cookies,
+            'token': token,
+            'version': version,
+            'expires': time.time() + self.ttl,
+        }
+        path = self.get_path(host, port, user)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            self.make_private_dir()
+            # Create the file with owner only permissions before anything is written to it
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            warnings.warn(f"Could not save the session in {self.cache_dir}: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def make_private_dir(self):
+        """Create the cache directory, or make an existing one private to the current user.
+
+        Raises:
+            OSError: The directory can't be created, belongs to another
+                user or can't be made private.
+
+        """
+
+        os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+        # makedirs leaves the mode of an existing directory as it is
+        dir_stat = os.stat(self.cache_dir)
+        if hasattr(os, 'getuid') and dir_stat.st_uid != os.getuid():
+            raise PermissionError(f"{self.cache_dir} belongs to another user")
+        if stat.S_IMODE(dir_stat.st_mode) & 0o077:
+            os.chmod(self.cache_dir, 0o700)
+
+    def delete(self, host, port, user):
+        """Drop the cached session for a host, port and user."""
+
+        try:
+            os.remove(self.get_path(host, port, user))
+        except OSError:
+            pass
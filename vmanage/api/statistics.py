@@ -0,0 +1,189 @@
+"""Cisco vManage Statistics API Methods.
+"""
+
+import calendar
+import datetime
+import json
+
+from six.moves.urllib.parse import urlencode
+from vmanage.api.http_methods import HttpMethods
+from vmanage.data.parse_methods import ParseMethods
+
+# vManage returns at most 10000 rows per page
+DEFAULT_PAGE_SIZE = 10000
+DEFAULT_WINDOW = datetime.timedelta(hours=1)
+STATISTICS_TIME_FORMAT = '%Y-%m-%dT%H:%M:%S UTC'
+
+
+class Statistics(object):
+    """vManage Statistics API
+
+    Responsible for queries against the vManage statistics database, such
+    as app route (BFD tunnel loss, latency and jitter), DPI and interface
+    statistics.  Unlike the real time device queries, the statistics
+    database can be walked in time windows and pages, so long histories
+    don't have to come back in one response.
+
+    """
+    def __init__(self, session, host, port=443):
+        """Initialize Statistics object with session parameters.
+
+        Args:
+            session (obj): Requests Session object
+            host (str): hostname or IP address of vManage
+            port (int): default HTTPS 443
+
+        """
+
+        self.session = session
+        self.host = host
+        self.port = port
+        self.base_url = f'https://{self.host}:{self.port}/dataservice/'
+
+    @staticmethod
+    def format_time(value):
+        """Format a time for a statistics query.  Naive datetimes are taken as UTC."""
+
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return value.strftime(STATISTICS_TIME_FORMAT)
+
+    @staticmethod
+    def get_entry_time(value):
+        """Get the entry_time (milliseconds since the epoch) a time is queried as."""
+
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return calendar.timegm(value.timetuple()) * 1000
+
+    def build_query(self, start, end, system_ip=None, rules=None, page_size=DEFAULT_PAGE_SIZE):
+        """Build a statistics query for a time range.
+
+        Args:
+            start (datetime): Start of the time range
+            end (datetime): End of the time range
+            system_ip (str): (Optional) Only return rows of this device
+            rules (list): (Optional) Further query rules, as vManage takes them
+            page_size (int): Rows per page
+
+        Returns:
+            result (dict): The query.
+
+        """
+
+        query_rules = [{
+            'value': [self.format_time(start), self.format_time(end)],
+            'field': 'entry_time',
+            'type': 'date',
+            'operator': 'between',
+        }]
+        if system_ip:
+            query_rules.append({'value': [system_ip], 'field': 'vdevice_name', 'type': 'string', 'operator': 'in'})
+        if rules:
+            query_rules.extend(rules)
+        return {'query': {'condition': 'AND', 'rules': query_rules}, 'size': page_size}
+
+    def iter_pages(self, stat_type, query, page_size=DEFAULT_PAGE_SIZE):
+        """Walk the result of a statistics query one page at a time.
+
+        Args:
+            stat_type (str): Statistics type (e.g. approute, dpi, interface)
+            query (dict): The query, as returned by build_query
+            page_size (int): Rows per page
+
+        Yields:
+            result (list): The rows of each page, as soon as it arrives.
+
+        """
+
+        scroll_id = None
+        payload = json.dumps(query)
+        while True:
+            query_params = [('count', page_size)]
+            if scroll_id:
+                query_params.insert(0, ('scrollId', scroll_id))
+            url = f"{self.base_url}statistics/{stat_type}/page?{urlencode(query_params)}"
+            # Each call with a scroll ID moves the cursor on, so retrying one that
+            # got through but whose response was lost would skip a page.
+            response = HttpMethods(self.session, url).request('POST',
+                                                              payload=payload,
+                                                              retry=False if scroll_id else None)
+            rows = ParseMethods.parse_data(response)
+            if rows:
+                yield rows
+            page_info = response['json'].get('pageInfo', {}) if response['json'] else {}
+            scroll_id = page_info.get('scrollId')
+            if not rows or not page_info.get('hasMoreData') or not scroll_id:
+                break
+
+    def iter_windows(self,
+                     stat_type,
+                     start,
+                     end=None,
+                     window=DEFAULT_WINDOW,
+                     system_ip=None,
+                     rules=None,
+                     page_size=DEFAULT_PAGE_SIZE):
+        """Walk a time range of statistics one time window at a time.
+
+        Args:
+            stat_type (str): Statistics type (e.g. approute, dpi, interface)
+            start (datetime): Start of the time range
+            end (datetime): End of the time range (default: now)
+            window (timedelta): Length of each window
+            system_ip (str): (Optional) Only return rows of this device
+            rules (list): (Optional) Further query rules, as vManage takes them
+            page_size (int): Rows per page
+
+        Yields:
+            result (tuple): (window_start, window_end, rows) for each window,
+                as soon as all of its pages have arrived.  Rows at the end of a
+                window are left to the next one, so no row comes back twice.
+
+        """
+
+        if end is None:
+            end = datetime.datetime.now(datetime.timezone.utc) if start.tzinfo else datetime.datetime.utcnow()
+        window_start = start
+        while window_start < end:
+            window_end = min(window_start + window, end)
+            query = self.build_query(window_start, window_end, system_ip=system_ip, rules=rules, page_size=page_size)
+            rows = []
+            for page in self.iter_pages(stat_type, query, page_size=page_size):
+                rows.extend(page)
+            if window_end < end:
+                # between includes both ends, and the end of this window starts the next
+                boundary = self.get_entry_time(window_end)
+                rows = [row for row in rows if row.get('entry_time', boundary - 1) < boundary]
+            yield window_start, window_end, rows
+            window_start = window_end
+
+    def get_bfd_history(self, system_ip, start, end=None, window=DEFAULT_WINDOW):
+        """Walk the app route (BFD tunnel) history of a device in time windows.
+
+        Args:
+            system_ip (str): Device System IP
+            start (datetime): Start of the time range
+            end (datetime): End of the time range (default: now)
+            window (timedelta): Length of each window
+
+        Returns:
+            result (iterator): (window_start, window_end, rows) for each window.
+        """
+
+        return self.iter_windows('approute', start, end=end, window=window, system_ip=system_ip)
+
+    def get_dpi_flows(self, system_ip, start, end=None, window=DEFAULT_WINDOW):
+        """Walk the DPI flow history of a device in time windows.
+
+        Args:
+            system_ip (str): Device System IP
+            start (datetime): Start of the time range
+            end (datetime): End of the time range (default: now)
+            window (timedelta): Length of each window
+
+        Returns:
+            result (iterator): (window_start, window_end, rows) for each window.
+        """
+
+        return self.iter_windows('dpi', start, end=end, window=window, system_ip=system_ip)
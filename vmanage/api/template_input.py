@@ -0,0 +1,193 @@
+"""Cisco vManage Template Input Methods.
+"""
+
+import json
+import re
+from vmanage.api.http_methods import HttpMethods
+from vmanage.data.parse_methods import ParseMethods
+from vmanage.utils import DEFAULT_WORKERS, run_concurrently
+
+# Devices per input call.  vManage renders the input of each device in a
+# call on one thread, so calls much larger than this get slow and risk the
+# read timeout, while much smaller ones waste round trips.
+DEFAULT_CHUNK_SIZE = 50
+
+VARIABLE_REGEX = re.compile(r'\((?P<variable>[^(]+)\)$')
+
+
+def get_input_columns(column_list):
+    """Get the variables of the editable columns of a template input header.
+
+    Args:
+        column_list (list): The columns of the header returned by vManage
+
+    Returns:
+        result (list): The title, property and variable name of each editable column.
+
+    """
+
+    columns = []
+    for column in column_list:
+        if column['editable']:
+            match = VARIABLE_REGEX.search(column['title'])
+            if match:
+                variable = match.groups('variable')[0]
+            else:
+                # If the variable is not found, use toolTip as variable name
+                variable = column.get("toolTip")
+
+            columns.append({'title': column['title'], 'property': column['property'], 'variable': variable})
+    return columns
+
+
+def get_chunks(items, chunk_size):
+    """Split a list into the fewest chunks of at most chunk_size items, evening out their sizes.
+
+    Args:
+        items (list): The items to split
+        chunk_size (int): The largest chunk
+
+    Returns:
+        result (list): The chunks, in order.
+
+    """
+
+    if not items:
+        return []
+    count = -(-len(items) // max(chunk_size, 1))
+    size = -(-len(items) // count)
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+class TemplateInput(object):
+    """Fetch the input of many devices across many templates.
+
+    The devices of each template are split into chunks fetched with one
+    input call each, and the calls of every template run concurrently.
+    The input of each device is indexed by template ID and device ID.
+
+    """
+    def __init__(self, session, host, port=443, chunk_size=DEFAULT_CHUNK_SIZE, workers=DEFAULT_WORKERS):
+        """Initialize TemplateInput object with session parameters.
+
+        Args:
+            session (obj): Requests Session object
+            host (str): hostname or IP address of vManage
+            port (int): default HTTPS 443
+            chunk_size (int): The most devices to fetch in one call
+            workers (int): The number of calls to run concurrently
+
+        """
+
+        self.session = session
+        self.host = host
+        self.port = port
+        self.base_url = f'https://{self.host}:{self.port}/dataservice/'
+        self.chunk_size = chunk_size
+        self.workers = workers
+
+    def get_attached_devices(self, template_id):
+        """Get the UUIDs of the devices attached to a template.
+
+        Args:
+            template_id (str): Template ID
+
+        Returns:
+            result (list): The UUID of each attached device.
+
+        """
+
+        url = f"{self.base_url}template/device/config/attached/{template_id}"
+        response = HttpMethods(self.session, url).request('GET')
+        result = ParseMethods.parse_data(response)
+        return [device['uuid'] for device in result]
+
+    def get_chunk_input(self, template_id, device_ids, is_edited=False, is_master_edited=False):
+        """Get the input of a chunk of the devices of a template.
+
+        Args:
+            template_id (str): Template ID
+            device_ids (list): UUIDs of the devices
+            is_edited (bool): The template has been edited
+            is_master_edited (bool): The device template itself has been edited
+
+        Returns:
+            result (dict): The columns of the template and the input rows of the devices.
+
+        """
+
+        payload = {
+            "deviceIds": device_ids,
+            "isEdited": is_edited,
+            "isMasterEdited": is_master_edited,
+            "templateId": template_id
+        }
+        url = f"{self.base_url}template/device/config/input"
+        response = HttpMethods(self.session, url).request('POST', payload=json.dumps(payload))
+        ParseMethods.parse_status(response)
+
+        result = {"columns": [], "data": []}
+        if response['json']:
+            if 'header' in response['json'] and 'columns' in response['json']['header']:
+                result['columns'] = get_input_columns(response['json']['header']['columns'])
+            if response['json'].get('data'):
+                result['data'] = response['json']['data']
+        return result
+
+    def get_input(self, template_devices, is_edited=False, is_master_edited=False):
+        """Get the input of the devices of many templates.
+
+        Args:
+            template_devices (dict): The device UUIDs to get input for keyed by template ID.  A
+                template mapped to None gets the input of every device attached to it.
+            is_edited (bool): The templates have been edited
+            is_master_edited (bool): The device templates themselves have been edited
+
+        Returns:
+            result (dict): The columns of each template keyed by template ID, the devices of
+                each template in order, and the input row of each device keyed by
+                (template ID, device ID).  Devices vManage returns no input for are left out.
+
+        Raises:
+            Exception: The first call that failed.
+
+        """
+
+        device_map = {
+            template_id: list(dict.fromkeys(device_ids))
+            for template_id, device_ids in template_devices.items() if device_ids is not None
+        }
+        unlisted = [template_id for template_id, device_ids in template_devices.items() if device_ids is None]
+        for template_id, result in run_concurrently(self.get_attached_devices, unlisted, workers=self.workers):
+            if isinstance(result, Exception):
+                raise result
+            device_map[template_id] = result
+
+        chunks = [(template_id, tuple(chunk)) for template_id in template_devices
+                  for chunk in get_chunks(device_map[template_id], self.chunk_size)]
+
+        def get_chunk(item):
+            template_id, chunk = item
+            return self.get_chunk_input(template_id, list(chunk), is_edited, is_master_edited)
+
+        chunk_results = {}
+        for item, result in run_concurrently(get_chunk, chunks, workers=self.workers):
+            if isinstance(result, Exception):
+                raise result
+            chunk_results[item] = result
+
+        # Merge the chunks in the order the devices were asked for
+        return_dict = {"columns": {}, "devices": {}, "data": {}}
+        for template_id in template_devices:
+            return_dict['columns'][template_id] = []
+            return_dict['devices'][template_id] = []
+        for template_id, chunk in chunks:
+            result = chunk_results[(template_id, chunk)]
+            if result['columns']:
+                return_dict['columns'][template_id] = result['columns']
+            rows = {row.get('csv-deviceId'): row for row in result['data']}
+            for device_id in chunk:
+                if device_id in rows:
+                    return_dict['devices'][template_id].append(device_id)
+                    return_dict['data'][(template_id, device_id)] = rows[device_id]
+        return return_dict
@@ -0,0 +1,166 @@
+"""Per-Endpoint Timeouts for vManage API Calls.
+"""
+
+import re
+from vmanage.api.cache import get_api_path
+
+# Connect and read timeouts in seconds per endpoint family.  Calls that
+# make vManage push configuration or software to devices, or relay a query
+# to a device, get the time they need; everything else uses the defaults
+# and fails fast.  The first matching profile is used.
+TIMEOUT_PROFILES = {
+    'device/action/software': {
+        'pattern': r'^device/action/software(/|$)',
+        'connect': 5,
+        'read': 600,
+    },
+    'device/action': {
+        'pattern': r'^device/action(/|$)',
+        'connect': 5,
+        'read': 30,
+    },
+    'device': {
+        'pattern': r'^device(/|$)',
+        'connect': 5,
+        'read': 30,
+    },
+    'template/device/config/attach': {
+        'pattern': r'^template/device/config/attach',
+        'connect': 5,
+        'read': 120,
+    },
+    'template/device/config/preview': {
+        'pattern': r'^template/device/config/(input|config|duplicateip|exportcsv)(/|$)',
+        'connect': 5,
+        'read': 60,
+    },
+    'system/device/fileupload': {
+        'pattern': r'^system/device/fileupload(/|$)',
+        'connect': 5,
+        'read': 120,
+    },
+    'statistics': {
+        'pattern': r'^statistics(/|$)',
+        'connect': 5,
+        'read': 60,
+    },
+}
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 10
+
+
+def parse_timeouts(specs):
+    """Parse timeout settings given as strings.
+
+    Each setting is PATTERN=READ or PATTERN=CONNECT:READ, where PATTERN is
+    the name of a profile, an API path prefix or 'default'.  Settings may
+    also be separated by commas or spaces within a string.
+
+    Args:
+        specs (list): Timeout settings, or a single string of them
+
+    Returns:
+        result (list): (pattern, connect, read) for each setting, with
+            connect set to None when it was not given.
+
+    Raises:
+        ValueError: A setting could not be parsed.
+
+    """
+
+    if isinstance(specs, str):
+        specs = [specs]
+    result = []
+    for spec in specs:
+        for setting in re.split(r'[,\s]+', spec.strip()):
+            if not setting:
+                continue
+            pattern, separator, value = setting.rpartition('=')
+            if not separator or not pattern:
+                raise ValueError(f"Timeout setting {setting} is not PATTERN=SECONDS")
+            connect, _, read = value.rpartition(':')
+            result.append((pattern, float(connect) if connect else None, float(read)))
+    return result
+
+
+class TimeoutProfiles(object):
+    """Pick the connect and read timeouts of a call from its endpoint.
+
+    Explicit timeouts passed to a call still win.  Profiles can be changed
+    or added by name or API path prefix, from code or from the settings
+    accepted by parse_timeouts.
+
+    """
+    def __init__(self, profiles=None, connect=DEFAULT_CONNECT_TIMEOUT, read=DEFAULT_READ_TIMEOUT):
+        """Initialize the timeout profiles.
+
+        Args:
+            profiles (dict): Timeouts per endpoint family (default: TIMEOUT_PROFILES)
+            connect (float): Connect timeout of calls that match no profile
+            read (float): Read timeout of calls that match no profile
+
+        """
+
+        self.profiles = {
+            name: dict(profile)
+            for name, profile in (TIMEOUT_PROFILES if profiles is None else profiles).items()
+        }
+        self.connect = connect
+        self.read = read
+        self._patterns = [(name, re.compile(profile['pattern'])) for name, profile in self.profiles.items()]
+
+    def get_timeout(self, url):
+        """Get the timeouts of a call.
+
+        Args:
+            url (str): Full URL of the API service
+
+        Returns:
+            result (tuple): (connect, read) timeouts in seconds.
+
+        """
+
+        path = get_api_path(url)
+        for name, pattern in self._patterns:
+            if pattern.match(path):
+                return (self.profiles[name]['connect'], self.profiles[name]['read'])
+        return (self.connect, self.read)
+
+    def set_timeout(self, pattern, read, connect=None):
+        """Change the timeouts of a profile, or add one for an API path prefix.
+
+        Args:
+            pattern (str): Profile name, API path prefix or 'default'
+            read (float): Read timeout in seconds
+            connect (float): Connect timeout in seconds (default: unchanged,
+                or the default connect timeout for a new profile)
+
+        """
+
+        if pattern == 'default':
+            self.read = read
+            self.connect = self.connect if connect is None else connect
+        elif pattern in self.profiles:
+            self.profiles[pattern]['read'] = read
+            if connect is not None:
+                self.profiles[pattern]['connect'] = connect
+        else:
+            # A prefix given by the user is more specific than the built in profiles
+            self.profiles[pattern] = {
+                'pattern': '^' + re.escape(pattern.strip('/')),
+                'connect': self.connect if connect is None else connect,
+                'read': read,
+            }
+            self._patterns.insert(0, (pattern, re.compile(self.profiles[pattern]['pattern'])))
+
+    def update(self, specs):
+        """Apply timeout settings given as strings (see parse_timeouts).
+
+        Returns:
+            profiles (TimeoutProfiles): These profiles.
+
+        """
+
+        for pattern, connect, read in parse_timeouts(specs):
+            self.set_timeout(pattern, read, connect=connect)
+        return self
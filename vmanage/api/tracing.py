@@ -0,0 +1,372 @@
+"""Tracing Spans for vManage Operations.
+
+Spans follow the OpenTelemetry data model and are exported in the OTLP
+JSON encoding, either to a file of JSON lines (as read by the collector's
+otlpjsonfile receiver) or to the OTLP/HTTP endpoint of a collector.
+"""
+
+import functools
+import json
+import os
+import random
+import threading
+import time
+import warnings
+
+import requests
+
+# Span types, recorded as the vmanage.span.type attribute
+OPERATION = 'operation'
+PHASE = 'phase'
+HTTP = 'http'
+ACTION_WAIT = 'action-wait'
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+# Spans are exported when an operation completes, or sooner once this many are waiting
+MAX_BATCH_SIZE = 512
+EXPORT_TIMEOUT = 10
+SCOPE_NAME = 'vmanage'
+
+_context = threading.local()
+
+
+def get_time():
+    return int(time.time() * 1e9)
+
+
+def get_current_span():
+    """Get the span in progress on this thread, if any."""
+
+    return getattr(_context, 'span', None)
+
+
+def propagate(func):
+    """Make the span in progress on this thread the parent of spans started by func on another thread.
+
+    Args:
+        func (callable): A function about to be handed to a thread pool
+
+    Returns:
+        result (callable): func itself when nothing is being traced.
+
+    """
+
+    parent = get_current_span()
+    if parent is None:
+        return func
+
+    @functools.wraps(func)
+    def run_in_span(*args, **kwargs):
+        previous = get_current_span()
+        _context.span = parent
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _context.span = previous
+
+    return run_in_span
+
+
+def format_attributes(attributes):
+    formatted = []
+    for key, value in attributes.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            formatted.append({'key': key, 'value': {'boolValue': value}})
+        elif isinstance(value, int):
+            formatted.append({'key': key, 'value': {'intValue': str(value)}})
+        elif isinstance(value, float):
+            formatted.append({'key': key, 'value': {'doubleValue': value}})
+        else:
+            formatted.append({'key': key, 'value': {'stringValue': str(value)}})
+    return formatted
+
+
+class NullSpan(object):
+    """The span handed out while tracing is disabled, which records nothing."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def set_attribute(self, key, value):
+        pass
+
+    def end(self, error=None):
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+class Span(object):
+    """A timed step of an operation.
+
+    Used as a context manager the span becomes the parent of the spans
+    started on the same thread until it exits, and records any exception
+    raised through it as an error.
+
+    """
+    def __init__(self, tracer, name, span_type=PHASE, attributes=None, parent=None, kind=SPAN_KIND_INTERNAL):
+        self.tracer = tracer
+        self.name = name
+        self.kind = kind
+        self.parent = parent
+        self.trace_id = parent.trace_id if parent else '%032x' % random.getrandbits(128)
+        self.span_id = '%016x' % random.getrandbits(64)
+        self.attributes = {'vmanage.span.type': span_type}
+        self.attributes.update(attributes or {})
+        self.start_time = get_time()
+        self.end_time = None
+        self.error = None
+        self.previous = None
+
+    def __enter__(self):
+        self.previous = get_current_span()
+        _context.span = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _context.span = self.previous
+        self.end(error=exc_value)
+        return False
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def end(self, error=None):
+        """End the span and hand it to the tracer for export.
+
+        Args:
+            error (Exception): The error the step failed with, if any
+
+        """
+
+        if self.end_time is None:
+            self.end_time = get_time()
+            self.error = error
+            self.tracer.on_end(self)
+
+    def to_otlp(self):
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'parentSpanId': self.parent.span_id if self.parent else '',
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': str(self.start_time),
+            'endTimeUnixNano': str(self.end_time),
+            'attributes': format_attributes(self.attributes),
+            'status': {
+                'code': STATUS_OK
+            },
+        }
+        if self.error is not None:
+            span['status'] = {'code': STATUS_ERROR, 'message': str(self.error) or type(self.error).__name__}
+        return span
+
+
+class FileExporter(object):
+    """Append spans to a file, one OTLP JSON export request per line."""
+    def __init__(self, path):
+        self.path = path
+        # Open the file up front so a bad path fails before any work is done
+        self.file = open(path, 'a')
+        self.lock = threading.Lock()
+
+    def export(self, request):
+        with self.lock:
+            self.file.write(json.dumps(request, separators=(',', ':')) + '\n')
+            self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class OtlpHttpExporter(object):
+    """Send spans to the OTLP/HTTP endpoint of an OpenTelemetry collector."""
+    def __init__(self, endpoint, timeout=EXPORT_TIMEOUT):
+        self.url = endpoint if endpoint.rstrip('/').endswith('/v1/traces') else f"{endpoint.rstrip('/')}/v1/traces"
+        self.timeout = timeout
+        # Spans go out on a session of their own, outside the instrumented transport
+        self.session = requests.Session()
+
+    def export(self, request):
+        response = self.session.post(self.url,
+                                     data=json.dumps(request),
+                                     headers={'Content-Type': 'application/json'},
+                                     timeout=self.timeout)
+        response.raise_for_status()
+
+    def close(self):
+        self.session.close()
+
+
+def get_exporter(target):
+    """Get the exporter for a trace target.
+
+    Args:
+        target (str): URL of an OTLP/HTTP collector, or the file to write spans to
+
+    Returns:
+        result (obj): The exporter.
+
+    """
+
+    if target.startswith(('http://', 'https://')):
+        return OtlpHttpExporter(target)
+    return FileExporter(os.path.expanduser(target))
+
+
+class Tracer(object):
+    """Record the spans of SDK operations and export them.
+
+    Without an exporter the tracer is disabled: spans are not created,
+    and a transport given a disabled tracer doesn't time its calls.  When
+    enabled, the tracer's call hooks add a span for each API call made
+    through the transport, under the span in progress on that thread.
+
+    """
+    def __init__(self, exporter=None, service_name='vmanage'):
+        """Initialize the tracer.
+
+        Args:
+            exporter (obj): Where to send spans, e.g. FileExporter or OtlpHttpExporter (default: disabled)
+            service_name (str): The service.name resource attribute of the spans
+
+        """
+
+        self.exporter = exporter
+        self.service_name = service_name
+        self.lock = threading.Lock()
+        self.finished = []
+
+    @property
+    def enabled(self):
+        return self.exporter is not None
+
+    def span(self, name, span_type=PHASE, attributes=None):
+        """Start a span under the span in progress on this thread.
+
+        Args:
+            name (str): Name of the operation or step
+            span_type (str): OPERATION, PHASE, HTTP or ACTION_WAIT
+            attributes (dict): Attributes of the span
+
+        Returns:
+            result (Span): The span, to be used as a context manager.
+
+        """
+
+        if self.exporter is None:
+            return NULL_SPAN
+        return Span(self, name, span_type=span_type, attributes=attributes, parent=get_current_span())
+
+    def start_call(self, call):
+        """Start the span of an API call (a before hook)."""
+
+        call['span'] = Span(self,
+                            f"{call['method']} {call['endpoint']}",
+                            span_type=HTTP,
+                            attributes={
+                                'http.request.method': call['method'],
+                                'url.full': call['url'],
+                                'vmanage.endpoint': call['endpoint'],
+                            },
+                            parent=get_current_span(),
+                            kind=SPAN_KIND_CLIENT)
+
+    def finish_call(self, call):
+        """End the span of an API call (an after hook)."""
+
+        span = call.get('span')
+        if span is None:
+            return
+        span.attributes.update({
+            'http.response.status_code': call['status_code'],
+            'http.request.body.size': call['bytes_sent'],
+            'http.response.body.size': call['bytes_received'],
+            'vmanage.retries': call['retries'],
+        })
+        error = call['error']
+        if error is None and (call['status_code'] or 0) >= 400:
+            error = f"HTTP {call['status_code']}"
+        span.end(error=error)
+
+    def on_end(self, span):
+        with self.lock:
+            self.finished.append(span)
+            ready = len(self.finished) >= MAX_BATCH_SIZE or (span.parent is None and span.kind != SPAN_KIND_CLIENT)
+        if ready:
+            self.flush()
+
+    def flush(self):
+        """Export the spans that have ended."""
+
+        with self.lock:
+            spans, self.finished = self.finished, []
+        if not spans or self.exporter is None:
+            return
+        request = {
+            'resourceSpans': [{
+                'resource': {
+                    'attributes': format_attributes({'service.name': self.service_name})
+                },
+                'scopeSpans': [{
+                    'scope': {
+                        'name': SCOPE_NAME
+                    },
+                    'spans': [span.to_otlp() for span in spans],
+                }],
+            }]
+        }
+        try:
+            self.exporter.export(request)
+        except (OSError, requests.exceptions.RequestException) as e:
+            # Losing spans must not fail the operation being traced
+            warnings.warn(f"Could not export {len(spans)} spans: {e}")
+
+    def close(self):
+        """Export the remaining spans and close the exporter."""
+
+        self.flush()
+        if self.exporter is not None:
+            self.exporter.close()
+
+
+NULL_TRACER = Tracer()
+
+
+def get_tracer(session):
+    """Get the tracer of the transport attached to a session.
+
+    Args:
+        session (obj): Requests Session object
+
+    Returns:
+        result (Tracer): The tracer, disabled if the session has none.
+
+    """
+
+    transport = getattr(session, 'transport', None)
+    return getattr(transport, 'tracer', None) or NULL_TRACER
+
+
+def traced(func):
+    """Run a method of an API object that has a session in an operation span."""
+    @functools.wraps(func)
+    def run_traced(self, *args, **kwargs):
+        tracer = get_tracer(self.session)
+        if not tracer.enabled:
+            return func(self, *args, **kwargs)
+        with tracer.span(func.__qualname__, span_type=OPERATION):
+            return func(self, *args, **kwargs)
+
+    return run_traced
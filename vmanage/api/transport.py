@@ -0,0 +1,485 @@
+"""Shared HTTP Transport for vManage API Interaction.
+"""
+
+import json
+import socket
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.retry import Retry
+from vmanage.api.cache import ResponseCache
+from vmanage.api.exceptions import (VmanageConnectionError, VmanageHTTPError, VmanagePayloadError, VmanageRequestError,
+                                    VmanageTimeoutError)
+from vmanage.api.instrumentation import Instrumentation
+from vmanage.api.rate_limit import THROTTLE_STATUS_CODES, get_rate_limiter, get_retry_delay
+from vmanage.api.retry import RETRY_STATUS_CODES, RetryPolicy
+from vmanage.api.timeouts import DEFAULT_READ_TIMEOUT, TimeoutProfiles
+from vmanage.api.tracing import NULL_TRACER
+from vmanage.data.json_stream import iter_json_array
+
+STANDARD_HEADERS = {'Connection': 'keep-alive', 'Content-Type': 'application/json'}
+STANDARD_TIMEOUT = DEFAULT_READ_TIMEOUT
+VALID_STATUS_CODES = [200, 201, 202, 203, 204, 205, 206, 207, 208, 226]
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 64
+# Retries are made by the retry policy, urllib3 doesn't add its own
+DEFAULT_CONNECT_RETRIES = 0
+DEFAULT_RETRY_BACKOFF = 0.3
+STREAM_CHUNK_SIZE = 65536
+
+# Ordered most specific first since several of these subclass each other.
+# Connection errors and timeouts are worth retrying, the rest are not.
+REQUEST_EXCEPTIONS = [
+    (requests.exceptions.ConnectionError, VmanageConnectionError, 'Connection error to {url}: {error}'),
+    (requests.exceptions.HTTPError, VmanageRequestError, 'An HTTP error occurred: {error}'),
+    (requests.exceptions.URLRequired, VmanageRequestError, 'A valid URL is required to make a request: {error}'),
+    (requests.exceptions.TooManyRedirects, VmanageRequestError, 'Too many redirects: {error}'),
+    (requests.exceptions.Timeout, VmanageTimeoutError, 'The request timed out: {error}'),
+    (requests.exceptions.RequestException, VmanageRequestError, 'There was an ambiguous exception: {error}'),
+]
+RETRY_EXCEPTIONS = (VmanageConnectionError, VmanageTimeoutError)
+
+
+def is_unsent(error):
+    """Check whether a failed call never reached vManage, so any call can be sent again.
+
+    Args:
+        error (Exception): The error raised by send_to
+
+    Returns:
+        result (bool): True if the connection could not be established.
+
+    """
+
+    cause = error.__cause__
+    if isinstance(cause, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(cause.args[0], 'reason', None) if cause is not None and cause.args else None
+    return isinstance(cause, requests.exceptions.ConnectionError) and isinstance(reason, NewConnectionError)
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """Requests adapter that enables TCP keep-alive on pooled connections.
+
+    vManage drops idle connections fairly aggressively, so keep-alive
+    probes help long running jobs hold on to their pooled sockets.
+
+    """
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+        super(KeepAliveAdapter, self).init_poolmanager(*args, **kwargs)
+
+
+class Transport(object):
+    """Long-lived HTTP transport shared by all vManage API objects.
+
+    A single transport is attached to each Requests session.  It owns a
+    tuned connection pool and the response cache, and performs the header
+    selection, payload preparation and error mapping for every request
+    made through HttpMethods, so API objects created with the same session
+    share connections and cached catalogs instead of churning them.
+    Requests are paced by the rate limiter shared by every session talking
+    to the same vManage, and calls that fail in passing are retried when
+    the retry policy says they are safe to send again.  The retry policy is
+    the only layer that retries: calls throttled by vManage and calls that
+    could not connect are always retried, within the same retry budget.  Calls made without
+    an explicit timeout get the timeouts of their endpoint's profile, and
+    every call sent is passed to the instrumentation hooks.  An enabled
+    tracer adds hooks of its own to record a span for each call.
+
+    """
+    def __init__(self,
+                 session,
+                 pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 connect_retries=DEFAULT_CONNECT_RETRIES,
+                 cache=False,
+                 rate_limit=True,
+                 retry_policy=None,
+                 timeouts=None,
+                 instrumentation=None,
+                 tracer=None):
+        """Initialize Transport object and mount its adapter on the session.
+
+        Args:
+            session (obj): Requests Session object
+            pool_connections (int): Number of host connection pools to cache
+            pool_maxsize (int): Maximum number of connections kept per host
+            connect_retries (int): Number of times urllib3 retries establishing
+                a connection, on top of the retry policy (default: none)
+            cache (bool): Cache responses from read-mostly catalog endpoints on every
+                call, not only in bulk operations
+            rate_limit (bool): Pace requests and hold off endpoints throttled by vManage
+            retry_policy (RetryPolicy): Which failed calls to retry (default: RetryPolicy())
+            timeouts (TimeoutProfiles): Timeouts per endpoint (default: TimeoutProfiles())
+            instrumentation (Instrumentation): Hooks run around each call (default: none)
+            tracer (Tracer): Records spans of operations and their calls (default: disabled)
+
+        """
+
+        self.session = session
+        self.cache = ResponseCache(enabled=cache)
+        self.rate_limit = rate_limit
+        self.retry_policy = RetryPolicy() if retry_policy is None else retry_policy
+        self.timeouts = TimeoutProfiles() if timeouts is None else timeouts
+        self.instrumentation = Instrumentation() if instrumentation is None else instrumentation
+        self.tracer = NULL_TRACER if tracer is None else tracer
+        if self.tracer.enabled and self.tracer.start_call not in self.instrumentation.before_hooks:
+            self.instrumentation.add_hooks(before=self.tracer.start_call, after=self.tracer.finish_call)
+        self.router = None
+        self.pool_maxsize = pool_maxsize
+        self.adapter = KeepAliveAdapter(pool_connections=pool_connections,
+                                        pool_maxsize=pool_maxsize,
+                                        max_retries=Retry(total=connect_retries,
+                                                          connect=connect_retries,
+                                                          read=0,
+                                                          status=0,
+                                                          backoff_factor=DEFAULT_RETRY_BACKOFF,
+                                                          respect_retry_after_header=False))
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+        self.session.transport = self
+
+    def resize_pool(self, pool_maxsize):
+        """Grow or shrink the connection pools of the adapters mounted on the session.
+
+        Everything else about the transport, such as its cache, rate limit,
+        timeouts and router, is kept.  Idle pooled connections are closed.
+
+        Args:
+            pool_maxsize (int): Maximum number of connections kept per host
+
+        """
+
+        self.pool_maxsize = pool_maxsize
+        for adapter in set(self.session.adapters.values()):
+            if isinstance(adapter, HTTPAdapter):
+                #pylint: disable=protected-access
+                adapter.poolmanager.clear()
+                adapter.init_poolmanager(adapter._pool_connections, pool_maxsize, block=adapter._pool_block)
+                adapter._pool_maxsize = pool_maxsize
+
+    @classmethod
+    def from_session(cls, session):
+        """Get the transport attached to a session, attaching a default one if needed.
+
+        Args:
+            session (obj): Requests Session object
+
+        Returns:
+            transport (Transport): The transport shared by the session.
+
+        """
+
+        transport = getattr(session, 'transport', None)
+        if transport is None:
+            transport = cls(session)
+        return transport
+
+    @staticmethod
+    def prepare_payload(payload):
+        """Prepare a payload for delivery.
+
+        String payloads built in the API modules use single quotes, so
+        they are converted to valid JSON.  Anything else is passed through.
+
+        """
+
+        if payload and isinstance(payload, str):
+            return payload.replace("\'", "\"")
+        return payload or None
+
+    def request(self, method, url, headers=None, payload=None, files=None, timeout=None, cache=True, retry=None):
+        """Performs HTTP REST API Call.
+
+        GET responses from cached endpoint families are served from the
+        response cache while fresh.  Any other method drops the families
+        it makes stale.
+
+        Args:
+            method (str): DELETE, GET, POST, PUT
+            url (str): URL of the API service being called
+            headers (dict): Use standard vManage header provided in
+                module or custom header for specific API interaction
+            payload (str): A formatted string to be delivered to
+                vManage via POST or PUT REST call
+            files (obj): A file to be sent to vManage
+            timeout (int): Request timeout in seconds (default: the
+                timeouts of the endpoint's profile)
+            cache (bool): Use a cached response if one is available
+            retry (bool): Retry the call if it fails in passing (default:
+                decided by the retry policy from the method and URL)
+
+        Returns:
+            result (dict): A parsable dictionary containing the full
+                response from vManage for an interaction
+
+        Raises:
+            VmanageError: Connection, HTTP, payload or status error.
+
+        """
+
+        if method.upper() == 'GET':
+            result = self.cache.get(url) if cache else None
+            if result is None:
+                response = self.send(method,
+                                     url,
+                                     headers=headers,
+                                     payload=payload,
+                                     files=files,
+                                     timeout=timeout,
+                                     retry=retry)
+                result = self.build_result(url, response)
+                self.cache.put(url, result)
+            return result
+
+        try:
+            response = self.send(method,
+                                 url,
+                                 headers=headers,
+                                 payload=payload,
+                                 files=files,
+                                 timeout=timeout,
+                                 retry=retry)
+            return self.build_result(url, response)
+        finally:
+            # Drop stale entries even when the write failed part way through
+            self.cache.invalidate_url(method, url)
+
+    def send(self, method, url, headers=None, payload=None, files=None, timeout=None, stream=False, retry=None):
+        """Send a request through the rate limiter, retrying calls that fail in passing.
+
+        Returns:
+            response (obj): Requests response object
+
+        Raises:
+            VmanageError: Connection or HTTP error.
+
+        """
+
+        if timeout is None:
+            timeout = self.timeouts.get_timeout(url)
+        if not self.instrumentation.enabled:
+            return self.send_with_retries(method, url, headers, payload, files, timeout, stream, retry)
+
+        call = self.instrumentation.start(method, url, data=self.prepare_payload(payload))
+        try:
+            response = self.send_with_retries(method, url, headers, payload, files, timeout, stream, retry, call=call)
+        except Exception as e:
+            self.instrumentation.finish(call, error=e)
+            raise
+        self.instrumentation.finish(call, response=response, stream=stream)
+        return response
+
+    def send_with_retries(self, method, url, headers, payload, files, timeout, stream, retry, call=None):
+        """Send a request, retrying it while it fails in passing and the retry policy allows.
+
+        Returns:
+            response (obj): Requests response object
+
+        Raises:
+            VmanageError: Connection or HTTP error.
+
+        """
+
+        # A file that has been read once can't be sent again
+        retryable = not files and self.retry_policy.is_retryable(method, url, retry)
+        attempt = 0
+        while True:
+            try:
+                response = self.send_once(method,
+                                          url,
+                                          headers=headers,
+                                          payload=payload,
+                                          files=files,
+                                          timeout=timeout,
+                                          stream=stream,
+                                          attempt=attempt)
+            except RETRY_EXCEPTIONS as e:
+                if files or not (retryable or is_unsent(e)) or attempt >= self.retry_policy.retries:
+                    raise
+                delay = self.retry_policy.get_delay(attempt)
+            else:
+                if attempt >= self.retry_policy.retries:
+                    return response
+                if response.status_code in THROTTLE_STATUS_CODES and not files:
+                    # vManage turned the call away, so it can be sent again.  The
+                    # rate limiter already holds off the endpoint for long enough.
+                    delay = 0 if self.rate_limit else get_retry_delay(response, attempt)
+                elif response.status_code in RETRY_STATUS_CODES and retryable:
+                    delay = self.retry_policy.get_delay(attempt)
+                else:
+                    return response
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+            if call is not None:
+                call['retries'] = attempt
+
+    def send_once(self, method, url, headers=None, payload=None, files=None, timeout=None, stream=False, attempt=0):
+        """Send a request to the node picked by the cluster router, if there is one.
+
+        Returns:
+            response (obj): Requests response object
+
+        Raises:
+            VmanageError: Connection or HTTP error.
+
+        """
+
+        node = self.router.acquire(method, url) if self.router else None
+        if node is None:
+            return self.send_to(self.session, method, url, headers, payload, files, timeout, stream, attempt)
+
+        healthy = True
+        try:
+            session = node.session
+            response = self.send_to(session, method, node.get_url(url), headers, payload, files, timeout, stream,
+                                    attempt)
+            if node.primary or not self.router.is_logged_out(response):
+                return response
+            # The node's session expired, so log in again and resend the call once
+            response.close()
+            self.router.login(node, expired=session)
+            response = self.send_to(node.session, method, node.get_url(url), headers, payload, files, timeout, stream,
+                                    attempt)
+            if self.router.is_logged_out(response):
+                response.close()
+                raise VmanageConnectionError(f'Could not log in to {node.host}', url=url)
+            return response
+        except RETRY_EXCEPTIONS:
+            healthy = False
+            raise
+        except ConnectionError as e:
+            # Raised by the login
+            healthy = False
+            raise VmanageConnectionError(f'Could not log in to {node.host}: {e}', url=url) from e
+        finally:
+            self.router.release(node, healthy=healthy)
+
+    def send_to(self, session, method, url, headers, payload, files, timeout, stream, attempt=0):
+        """Send a request on a session through the rate limiter and map Requests exceptions.
+
+        Returns:
+            response (obj): Requests response object
+
+        Raises:
+            VmanageError: Connection or HTTP error.
+
+        """
+
+        if files:
+            headers = None
+        elif headers is None:
+            headers = STANDARD_HEADERS
+
+        data = self.prepare_payload(payload)
+
+        def send_request():
+            return session.request(method, url, headers=headers, files=files, data=data, timeout=timeout, stream=stream)
+
+        try:
+            if not self.rate_limit:
+                return send_request()
+            # Throttled calls are retried by send_with_retries
+            return get_rate_limiter(url).request(url, send_request, retries=0, attempt=attempt)
+        except requests.exceptions.RequestException as e:
+            for exception_class, error_class, message in REQUEST_EXCEPTIONS:
+                if isinstance(e, exception_class):
+                    raise error_class(message.format(url=url, error=e), url=url) from e
+            raise
+
+    def stream(self, method, url, headers=None, payload=None, timeout=None, key='data'):
+        """Performs HTTP REST API Call and streams the elements of the response data.
+
+        The response body is parsed incrementally, so memory use stays flat
+        and the first elements are available before the whole response
+        has arrived.
+
+        Args:
+            method (str): DELETE, GET, POST, PUT
+            url (str): URL of the API service being called
+            headers (dict): Custom header for specific API interaction
+            payload (str): A formatted string to be delivered to
+                vManage via POST or PUT REST call
+            timeout (int): Request timeout in seconds (default: the
+                timeouts of the endpoint's profile)
+            key (str): The top level key of the array to stream
+
+        Yields:
+            item (dict): Each element of the response data.
+
+        Raises:
+            VmanageError: Connection, HTTP, payload or status error.
+
+        """
+
+        response = self.send(method, url, headers=headers, payload=payload, timeout=timeout, stream=True)
+        with response:
+            if response.status_code not in VALID_STATUS_CODES:
+                # Errors are small, so read the whole body to build the usual message
+                self.build_result(url, response)
+            try:
+                for item in iter_json_array(response.iter_content(chunk_size=STREAM_CHUNK_SIZE),
+                                            key=key,
+                                            encoding=response.encoding or 'utf-8'):
+                    yield item
+            except ValueError as e:
+                raise VmanagePayloadError(f'Payload format error: {e}', url=url)
+
+    @staticmethod
+    def build_result(url, response):
+        """Build the result dictionary for a response and map error status codes.
+
+        Args:
+            url (str): URL of the API service that was called
+            response (obj): Requests response object
+
+        Returns:
+            result (dict): A parsable dictionary containing the full
+                response from vManage for an interaction
+
+        Raises:
+            VmanagePayloadError: Payload format error.
+            VmanageHTTPError: Status error.
+
+        """
+
+        result_json = None
+        if response.text:
+            try:
+                result_json = json.loads(response.text)
+            except json.JSONDecodeError as e:
+                raise VmanagePayloadError(f'Payload format error: {e}', url=url)
+
+        result = {
+            'status_code': response.status_code,
+            'status': requests.status_codes._codes[response.status_code][0],  #pylint: disable=protected-access
+            'details': None,
+            'error': None,
+            'json': result_json,
+            'response': response,
+        }
+
+        if response.status_code not in VALID_STATUS_CODES:
+            if result_json and 'error' in result_json:
+                details = result_json['error']['details']
+                error = result_json['error']['message']
+                raise VmanageHTTPError(
+                    f"{url}: Error {result['status_code']} ({result['status']}) - {error}: {details}",
+                    url=url,
+                    status_code=result['status_code'],
+                    status=result['status'],
+                    error=error,
+                    details=details)
+            else:
+                raise VmanageHTTPError(f"{url}: Error {result['status_code']} ({result['status']})",
+                                       url=url,
+                                       status_code=result['status_code'],
+                                       status=result['status'])
+
+        return result
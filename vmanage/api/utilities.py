@@ -1,7 +1,7 @@
 """Cisco vManage Utilities API Methods.
 """
 
-import time
+from vmanage.api.action_tracker import ActionTracker
 from vmanage.api.http_methods import HttpMethods
 from vmanage.data.parse_methods import ParseMethods
 
@@ -50,39 +50,21 @@ class Utilities(object):
         version = result[0]['version']
         return version
 
-    def waitfor_action_completion(self, action_id):
-        status = 'in_progress'
-        response = {}
-        action_status = None
-        action_activity = None
-        action_config = None
-        while status == "in_progress":
-            url = f"{self.base_url}device/action/status/{action_id}"
-            response = HttpMethods(self.session, url).request('GET')
-            ParseMethods.parse_data(response)
-
-            if 'json' in response:
-                status = response['json']['summary']['status']
-                if 'data' in response['json'] and response['json']['data']:
-                    action_status = response['json']['data'][0]['statusId']
-                    action_activity = response['json']['data'][0]['activity']
-                    if 'actionConfig' in response['json']['data'][0]:
-                        action_config = response['json']['data'][0]['actionConfig']
-                    else:
-                        action_config = None
-                else:
-                    action_status = status
-            else:
-                raise Exception(msg="Unable to get action status: No response")
-            time.sleep(10)
-
-        return {
-            'action_response': response['json'],
-            'action_id': action_id,
-            'action_status': action_status,
-            'action_activity': action_activity,
-            'action_config': action_config
-        }
+    def waitfor_action_completion(self, action_id, timeout=None):
+        """Wait for an action to complete.
+
+        Polling starts fast and backs off while the action is in progress.
+        Use ActionTracker directly to wait on many actions at once.
+
+        Args:
+            action_id (str): The action ID returned by vManage
+            timeout (float): Give up after this many seconds (default: wait forever)
+
+        Returns:
+            result (dict): The action status, activity, config and full response.
+        """
+
+        return ActionTracker(self.session, self.host, self.port).wait_for(action_id, timeout=timeout)
 
     def upload_file(self, input_file):
         """Upload a file to vManage.
@@ -1,7 +1,7 @@
 """Clean vManage Resources.
 """
 
-import time
+from vmanage.api.action_tracker import ActionTracker
 from vmanage.api.utilities import Utilities
 from vmanage.api.central_policy import CentralPolicy
 from vmanage.api.device import Device
@@ -11,22 +11,27 @@ from vmanage.api.local_policy import LocalPolicy
 from vmanage.api.security_policy import SecurityPolicy
 from vmanage.api.policy_definitions import PolicyDefinitions
 from vmanage.api.policy_lists import PolicyLists
+from vmanage.utils import DEFAULT_WORKERS, map_concurrently
 
 
 class CleanVmanage(object):
     """Reset all configurations on a vManage instance.
 
     Executes the necessary REST calls in specific order to remove
-    configurations applied to a vManage instance.
+    configurations applied to a vManage instance.  Objects are removed in
+    tiers, where nothing left in vManage references the objects in a tier
+    once the earlier tiers are gone, and the calls within a tier are made
+    concurrently.
 
     """
-    def __init__(self, session, host, port=443):
+    def __init__(self, session, host, port=443, workers=DEFAULT_WORKERS):
         """Initialize Reset vManage object with session parameters.
 
         Args:
             session (obj): Requests Session object
             host (str): hostname or IP address of vManage
             port (int): default HTTPS 443
+            workers (int): The number of objects to remove concurrently
 
         """
 
@@ -34,50 +39,97 @@ class CleanVmanage(object):
         self.host = host
         self.port = port
         self.base_url = f'https://{self.host}:{self.port}/dataservice/'
-        self.utilities = Utilities(self.session, self.host)
-        self.central_policy = CentralPolicy(self.session, self.host)
-        self.local_policy = LocalPolicy(self.session, self.host)
-        self.device = Device(self.session, self.host)
-        self.device_templates = DeviceTemplates(self.session, self.host)
-        self.feature_templates = FeatureTemplates(self.session, self.host)
-        self.sec_pol = SecurityPolicy(self.session, self.host)
-        self.policy_definitions = PolicyDefinitions(self.session, self.host)
-        self.policy_lists = PolicyLists(self.session, self.host)
+        self.utilities = Utilities(self.session, self.host, self.port)
+        self.central_policy = CentralPolicy(self.session, self.host, self.port)
+        self.local_policy = LocalPolicy(self.session, self.host, self.port)
+        self.device = Device(self.session, self.host, self.port)
+        self.device_templates = DeviceTemplates(self.session, self.host, self.port)
+        self.feature_templates = FeatureTemplates(self.session, self.host, self.port)
+        self.sec_pol = SecurityPolicy(self.session, self.host, self.port)
+        self.policy_definitions = PolicyDefinitions(self.session, self.host, self.port)
+        self.policy_lists = PolicyLists(self.session, self.host, self.port)
+        self.action_tracker = ActionTracker(self.session, self.host, self.port)
+        self.workers = workers
 
     def active_count_delay(self):
         """Delay while there are active tasks.
 
         """
-        activeCount = 1
-        while activeCount != 0:
-            time.sleep(1.0)
-            data = self.utilities.get_active_count()
-            activeCount = data["activeTaskCount"]
+        self.action_tracker.wait_for_idle()
 
-    def clean_vedge_attachments(self):
+    def run_concurrently(self, func, items):
+        """Call a function for each item on the worker pool.
+
+        Args:
+            func (callable): The function to call with each item
+            items (list): The items to process
+
+        Raises:
+            Exception: The first exception raised by a call.
+
+        """
+        for _ in map_concurrently(func, items, workers=self.workers):
+            pass
+
+    def delete_in_tiers(self, get_items, delete):
+        """Delete objects that can be referenced by objects of the same kind.
+
+        The objects with no references are deleted concurrently and the
+        rest are fetched again, until nothing is left.  Whatever is still
+        referenced once no more progress can be made is deleted anyway so
+        that vManage reports why it can't be removed.
+
+        Args:
+            get_items (callable): Returns the objects left to delete
+            delete (callable): Deletes one object
+
+        """
+        items = get_items()
+        while items:
+            tier = [item for item in items if not item.get('referenceCount')]
+            if not tier:
+                self.run_concurrently(delete, items)
+                break
+            self.run_concurrently(delete, tier)
+            remaining = get_items()
+            if len(remaining) >= len(items):
+                # No progress, so let vManage report why the rest can't be removed
+                self.run_concurrently(delete, remaining)
+                break
+            items = remaining
+
+    def clean_tier(self, *clean_methods):
+        """Run clean methods that don't depend on each other at the same time.
+
+        Args:
+            clean_methods (callable): The clean methods to run
+
+        """
+        self.run_concurrently(lambda clean_method: clean_method(wait=False), clean_methods)
+        self.active_count_delay()
+
+    def clean_vedge_attachments(self, wait=True):
         """Clean all vedge attachments
 
         """
         data = self.device.get_device_list('vedges')
-        for device in data:
-            if (('uuid' in device) and (device['configOperationMode'] == 'vmanage')):
-                deviceId = device['uuid']
-                deviceType = device['deviceType']
-                self.device.post_device_cli_mode(deviceId, deviceType)
-        self.active_count_delay()
+        devices = [device for device in data if 'uuid' in device and device['configOperationMode'] == 'vmanage']
+        self.run_concurrently(lambda device: self.device.post_device_cli_mode(device['uuid'], device['deviceType']),
+                              devices)
+        if wait:
+            self.active_count_delay()
 
-    def clean_vedge(self):
+    def clean_vedge(self, wait=True):
         """Clean all vedges
 
         """
         data = self.device.get_device_list('vedges')
-        for device in data:
-            if ('uuid' in device):
-                deviceId = device['uuid']
-                self.device.put_decommission_device(deviceId)
-        self.active_count_delay()
+        devices = [device for device in data if 'uuid' in device]
+        self.run_concurrently(lambda device: self.device.put_device_decommission(device['uuid']), devices)
+        if wait:
+            self.active_count_delay()
 
-    def clean_controller_attachments(self):
+    def clean_controller_attachments(self, wait=True):
         """Clean all controller attachments
 
         """
@@ -89,88 +141,102 @@ class CleanVmanage(object):
                 self.device.post_device_cli_mode(deviceId, deviceType)
                 # Requires pause between controllers
                 self.active_count_delay()
-        self.active_count_delay()
+        if wait:
+            self.active_count_delay()
 
-    def clean_device_templates(self):
+    def clean_device_templates(self, wait=True):
         """Clean all device templates
 
         """
         data = self.device_templates.get_device_templates()
-        for device in data:
-            if 'factoryDefault' in device and device['factoryDefault'] is not True:
-                templateId = device['templateId']
-                self.device_templates.delete_device_template(templateId)
-        self.active_count_delay()
+        templates = [device for device in data if 'factoryDefault' in device and device['factoryDefault'] is not True]
+        self.run_concurrently(lambda template: self.device_templates.delete_device_template(template['templateId']),
+                              templates)
+        if wait:
+            self.active_count_delay()
 
-    def clean_feature_templates(self):
+    def clean_feature_templates(self, wait=True):
         """Clean all feature templates
 
         """
         data = self.feature_templates.get_feature_templates()
-        for device in data:
-            #pylint: disable=no-else-continue
-            if device['factoryDefault']:
-                continue
-            else:
-                templateId = device['templateId']
-                self.feature_templates.delete_feature_template(templateId)
-        self.active_count_delay()
+        templates = [device for device in data if not device['factoryDefault']]
+        self.run_concurrently(lambda template: self.feature_templates.delete_feature_template(template['templateId']),
+                              templates)
+        if wait:
+            self.active_count_delay()
 
-    def clean_central_policy(self):
+    def clean_central_policy(self, wait=True):
         """Clean all central policy
 
         """
         data = self.central_policy.get_central_policy()
-        for policy in data:
-            policy_id = policy['policyId']
-            if policy['isPolicyActivated']:
-                action_id = self.central_policy.deactivate_central_policy(policy_id)
-                if action_id:
-                    self.utilities.waitfor_action_completion(action_id)
-            self.central_policy.delete_central_policy(policy_id)
-        self.active_count_delay()
+        activated = [policy['policyId'] for policy in data if policy['isPolicyActivated']]
+        for action_id in map_concurrently(self.central_policy.deactivate_central_policy,
+                                          activated,
+                                          workers=self.workers):
+            if action_id:
+                self.action_tracker.add(action_id)
+        self.action_tracker.wait()
+        self.run_concurrently(lambda policy: self.central_policy.delete_central_policy(policy['policyId']), data)
+        if wait:
+            self.active_count_delay()
 
-    def clean_local_policy(self):
+    def clean_local_policy(self, wait=True):
         """Clean all local policy
 
         """
         data = self.local_policy.get_local_policy()
-        for policy in data:
-            policyId = policy['policyId']
-            self.local_policy.delete_local_policy(policyId)
-        self.active_count_delay()
+        self.run_concurrently(lambda policy: self.local_policy.delete_local_policy(policy['policyId']), data)
+        if wait:
+            self.active_count_delay()
 
-    def clean_policy_definitions(self):
+    def clean_policy_definitions(self, wait=True):
         """Clean all policy definitions
 
         """
-        policy_definition_list = self.policy_definitions.get_policy_definition_list()
-        for policy_definition in policy_definition_list:
-            self.policy_definitions.delete_policy_definition(policy_definition['type'],
-                                                             policy_definition['definitionId'])
-        self.active_count_delay()
+        def get_policy_definitions():
+            # The summaries hold everything needed to delete a definition
+            policy_definition_list = []
+            for summary_list in map_concurrently(self.policy_definitions.get_policy_definition_summary_list,
+                                                 self.policy_definitions.definition_types,
+                                                 workers=self.workers):
+                policy_definition_list.extend(summary_list)
+            return policy_definition_list
+
+        self.delete_in_tiers(
+            get_policy_definitions, lambda policy_definition: self.policy_definitions.delete_policy_definition(
+                policy_definition['type'], policy_definition['definitionId']))
+        if wait:
+            self.active_count_delay()
 
-    def clean_policy_lists(self):
+    def clean_policy_lists(self, wait=True):
         """Clean all policy lists
 
         """
-        policy_list_list = self.policy_lists.get_policy_list_list()
-        for policy_list in policy_list_list:
-            if not policy_list['readOnly'] and policy_list['owner'] != 'system':
-                self.policy_lists.delete_policy_list(policy_list['type'], policy_list['listId'])
-        self.active_count_delay()
+        def get_policy_lists():
+            policy_list_list = self.policy_lists.get_policy_list_list(cache=False)
+            return [
+                policy_list for policy_list in policy_list_list
+                if not policy_list['readOnly'] and policy_list['owner'] != 'system'
+            ]
+
+        self.delete_in_tiers(
+            get_policy_lists,
+            lambda policy_list: self.policy_lists.delete_policy_list(policy_list['type'], policy_list['listId']))
+        if wait:
+            self.active_count_delay()
 
-    def clean_security_policy(self):
+    def clean_security_policy(self, wait=True):
         """Clean all security policy
 
         """
         version = self.utilities.get_vmanage_version()
         if version >= '18.2.0':
             data = self.sec_pol.get_security_policy()
-            for policy in data:
-                policyId = policy['policyId']
-                self.sec_pol.delete_security_policy(policyId)
-            self.active_count_delay()
+            self.run_concurrently(lambda policy: self.sec_pol.delete_security_policy(policy['policyId']), data)
+            if wait:
+                self.active_count_delay()
 
         # # Step 11 - Delete All UTD Specific Security Policies
         # version = self.utilities.get_vmanage_version()
@@ -208,26 +274,24 @@ class CleanVmanage(object):
         """Clean everything in vManage
 
         """
-        # Step 1 - Deactivate Central Policy
+        # Step 1 - Deactivate and Delete All Centralized Policies
         self.clean_central_policy()
 
         # Step 2 - Detach vedges from template
         self.clean_vedge_attachments()
 
-        # Step 2 - Decommission vedges
+        # Step 3 - Decommission vedges
         self.clean_vedge()
 
-        # Step 3 - Detach controllers from template
+        # Step 4 - Detach controllers from template
         self.clean_controller_attachments()
 
-        # Step 4 - Delete All Device Templates
+        # Step 5 - Delete All Device Templates
         self.clean_device_templates()
 
-        # Step 5 - Delete All Feature Templates
-        self.clean_feature_templates()
-
-        # Step 6 - Delete All Centralized Policies
-        self.clean_central_policy()
+        # Step 6 - Delete All Feature Templates, Local Policies and Security Policies
+        # (these are only referenced by device templates)
+        self.clean_tier(self.clean_feature_templates, self.clean_local_policy, self.clean_security_policy)
 
         # Step 7 - Delete All Policy Definitions
         self.clean_policy_definitions()
@@ -235,10 +299,4 @@ class CleanVmanage(object):
         # Step 8 - Delete All Policy Lists
         self.clean_policy_lists()
 
-        # Step 9 - Delete All Local Policies
-        self.clean_local_policy()
-
-        # Step 10 - Delete All Security Policies
-        self.clean_security_policy()
-
         return ('Reset Complete')
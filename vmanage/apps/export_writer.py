@@ -0,0 +1,104 @@
+"""Incremental Export File Writer.
+"""
+
+import json
+import os
+import shutil
+import yaml
+
+JSON_ITEM_INDENT = ' ' * 8
+
+
+class ExportWriter(object):
+    """Write an export document one object at a time.
+
+    The document is a mapping of section names to lists of objects, written
+    in the same layout as dumping the whole document with json.dump or
+    yaml.dump.  Each section is consumed from an iterable and every object
+    is written as soon as it is produced, so exports don't have to be held
+    in memory and the file fills in while the slower objects are converted.
+    The objects go to a temporary file next to the export file, which only
+    replaces it once every section is written, so an export that fails
+    part way leaves the previous file as it was.
+
+    """
+    def __init__(self, export_file, yaml_options=None):
+        """Initialize the writer.
+
+        Args:
+            export_file (str): The name of the export file.  The format is
+                taken from the '.json', '.yaml' or '.yml' extension.
+            yaml_options (dict): Keyword arguments for yaml.dump
+
+        Raises:
+            Exception: The file format is not supported.
+
+        """
+
+        self.export_file = export_file
+        self.yaml_options = yaml_options or {}
+        if export_file.endswith('.json'):
+            self.file_format = 'json'
+        elif export_file.endswith(('.yaml', '.yml')):
+            self.file_format = 'yaml'
+        else:
+            raise Exception("File format not supported")
+
+    def write(self, sections):
+        """Write the export file.
+
+        Args:
+            sections (list): (name, iterable) pairs in document order.  When
+                the YAML options sort keys, the sections are written sorted
+                by name to match yaml.dump.
+
+        """
+
+        if self.file_format == 'yaml' and self.yaml_options.get('sort_keys', True):
+            sections = sorted(sections, key=lambda section: section[0])
+
+        temp_file = f'{self.export_file}.{os.getpid()}.tmp'
+        try:
+            with open(temp_file, 'w') as outfile:
+                if self.file_format == 'json':
+                    self._write_json(outfile, sections)
+                else:
+                    self._write_yaml(outfile, sections)
+            if os.path.exists(self.export_file):
+                shutil.copymode(self.export_file, temp_file)
+            os.replace(temp_file, self.export_file)
+        except BaseException:
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def _write_json(outfile, sections):
+        outfile.write('{')
+        for section_index, (name, items) in enumerate(sections):
+            outfile.write(',\n' if section_index else '\n')
+            outfile.write(f'    {json.dumps(name)}: [')
+            count = 0
+            for count, item in enumerate(items, 1):
+                outfile.write(',\n' if count > 1 else '\n')
+                outfile.write('\n'.join(JSON_ITEM_INDENT + line for line in json.dumps(item, indent=4).split('\n')))
+            outfile.write('\n    ]' if count else ']')
+        outfile.write('\n}' if sections else '}')
+
+    def _write_yaml(self, outfile, sections):
+        if not sections:
+            outfile.write('{}\n')
+            return
+        for name, items in sections:
+            key = yaml.dump({name: None}, **self.yaml_options).rsplit(':', 1)[0]
+            empty = True
+            for item in items:
+                if empty:
+                    outfile.write(f'{key}:\n')
+                    empty = False
+                # Sequences in a mapping are not indented, so each element is dumped as a one item list
+                outfile.write(yaml.dump([item], **self.yaml_options))
+            if empty:
+                outfile.write(f'{key}: []\n')
@@ -4,7 +4,7 @@
 import json
 import os
 import yaml
-from vmanage.api.device_templates import DeviceTemplates
+from vmanage.api.device_templates import DeviceTemplates, DEFAULT_BATCHES_IN_FLIGHT
 from vmanage.api.feature_templates import FeatureTemplates
 from vmanage.data.template_data import TemplateData
 from vmanage.data.policy_data import PolicyData
@@ -14,7 +14,11 @@ from vmanage.api.local_policy import LocalPolicy
 from vmanage.api.central_policy import CentralPolicy
 from vmanage.api.security_policy import SecurityPolicy
 from vmanage.api.device import Device
-from vmanage.utils import list_to_dict
+from vmanage.api.cache import cached
+from vmanage.api.tracing import get_tracer, traced
+from vmanage.apps.export_writer import ExportWriter
+from vmanage.data.import_graph import build_policy_graph, build_template_graph
+from vmanage.utils import list_to_dict, map_concurrently
 
 
 class Files(object):
@@ -47,6 +51,7 @@ class Files(object):
         self.security_policy = SecurityPolicy(self.session, self.host, self.port)
         self.vmanage_device = Device(self.session, self.host, self.port)
 
+    @cached
     def export_templates_to_file(self, export_file, name_list=None, template_type=None):
         """Export templates to a file.  All object IDs will be translated to names.  Use
         a '.yml' extention to export as YAML and a '.json' extension to export as JSON.
@@ -58,38 +63,40 @@ class Files(object):
 
         """
 
-        template_export = {}
-        #pylint: disable=too-many-nested-blocks
+        sections = []
+        feature_name_list = []
+
+        def export_device_templates():
+            for device_template in self.template_data.iter_device_template_export(name_list=name_list):
+                if 'generalTemplates' in device_template:
+                    for general_template in device_template['generalTemplates']:
+                        if 'templateName' in general_template:
+                            feature_name_list.append(general_template['templateName'])
+                        if 'subTemplates' in general_template:
+                            for sub_template in general_template['subTemplates']:
+                                if 'templateName' in sub_template:
+                                    feature_name_list.append(sub_template['templateName'])
+                yield device_template
+
+        def export_feature_templates():
+            # This runs after the device templates have been written, so their feature templates are known
+            feature_template_name_list = name_list
+            if template_type != 'feature' and name_list:
+                feature_template_name_list = list(set(feature_name_list))
+            for feature_template in self.feature_templates.get_feature_template_list(
+                    name_list=feature_template_name_list):
+                yield feature_template
+
         if template_type != 'feature':
             # Export the device templates and associated feature templates
-            device_template_list = self.template_data.export_device_template_list(name_list=name_list)
-            template_export.update({'vmanage_device_templates': device_template_list})
-            feature_name_list = []
-            if name_list:
-                for device_template in device_template_list:
-                    if 'generalTemplates' in device_template:
-                        for general_template in device_template['generalTemplates']:
-                            if 'templateName' in general_template:
-                                feature_name_list.append(general_template['templateName'])
-                            if 'subTemplates' in general_template:
-                                for sub_template in general_template['subTemplates']:
-                                    if 'templateName' in sub_template:
-                                        feature_name_list.append(sub_template['templateName'])
-                name_list = list(set(feature_name_list))
+            sections.append(('vmanage_device_templates', export_device_templates()))
         # Since device templates depend on feature templates, we always add them.
-        feature_template_list = self.feature_templates.get_feature_template_list(name_list=name_list)
-        template_export.update({'vmanage_feature_templates': feature_template_list})
+        sections.append(('vmanage_feature_templates', export_feature_templates()))
 
-        if export_file.endswith('.json'):
-            with open(export_file, 'w') as outfile:
-                json.dump(template_export, outfile, indent=4, sort_keys=False)
-        elif export_file.endswith('.yaml') or export_file.endswith('.yml'):
-            with open(export_file, 'w') as outfile:
-                yaml.dump(template_export, outfile, indent=4, sort_keys=False)
-        else:
-            raise Exception("File format not supported")
+        ExportWriter(export_file, yaml_options={'indent': 4, 'sort_keys': False}).write(sections)
 
     #pylint: disable=unused-argument
+    @cached
     def import_templates_from_file(self,
                                    import_file,
                                    update=False,
@@ -159,24 +166,50 @@ class Files(object):
                 # Otherwise, we hope the feature list is already there (e.g. Factory Default)
             imported_feature_template_list = pruned_feature_template_list
 
-        # Process the feature templates
-        feature_template_updates = self.template_data.import_feature_template_list(imported_feature_template_list,
-                                                                                   check_mode=check_mode,
-                                                                                   update=update)
-
-        # Process the device templates
-        device_template_updates = self.template_data.import_device_template_list(imported_device_template_list,
-                                                                                 check_mode=check_mode,
-                                                                                 update=update)
+        import_methods = {
+            'feature_template': self.template_data.import_feature_template_list,
+            'device_template': self.template_data.import_device_template_list,
+        }
+        updates = {kind: [] for kind in import_methods}
+        # Device templates are pushed as soon as the feature templates they use are in place
+        graph = build_template_graph(imported_feature_template_list, imported_device_template_list)
+        for wave in graph.get_waves():
+            for kind, wave_updates in self.import_wave(import_methods, wave, check_mode=check_mode, update=update):
+                updates[kind].extend(wave_updates)
+        feature_template_updates = updates['feature_template']
+        device_template_updates = updates['device_template']
 
         return {
             'feature_template_updates': feature_template_updates,
             'device_template_updates': device_template_updates,
         }
 
+    @staticmethod
+    def import_wave(import_methods, wave, **kwargs):
+        """Import one wave of a dependency ordered import.
+
+        The objects in a wave don't reference each other, so every kind of
+        object in the wave is imported at the same time.
+
+        Args:
+            import_methods (dict): The import method for each kind of object
+            wave (dict): The objects to import keyed by kind
+            kwargs: Options passed to each import method
+
+        Returns:
+            result (list): (kind, updates) for each kind in the wave.
+
+        """
+
+        kinds = [kind for kind in import_methods if kind in wave]
+        return list(
+            zip(kinds,
+                map_concurrently(lambda kind: import_methods[kind](wave[kind], **kwargs), kinds, workers=len(kinds))))
+
     #
     # Policy
     #
+    @cached
     def export_policy_to_file(self, export_file):
         """Export policy to a file.  All object IDs will be translated to names.  Use
         a '.yml' extention to export as YAML and a '.json' extension to export as JSON.
@@ -186,29 +219,17 @@ class Files(object):
 
         """
 
-        policy_lists_list = self.policy_lists.get_policy_list_list()
-        policy_definitions_list = self.policy_data.export_policy_definition_list()
-        central_policies_list = self.policy_data.export_central_policy_list()
-        local_policies_list = self.local_policy.get_local_policy_list()
-        security_policies_list = self.policy_data.export_security_policy_list()
-
-        policy_export = {
-            'vmanage_policy_lists': policy_lists_list,
-            'vmanage_policy_definitions': policy_definitions_list,
-            'vmanage_central_policies': central_policies_list,
-            'vmanage_local_policies': local_policies_list,
-            'vmanage_security_policies': security_policies_list
-        }
+        policy_export = [
+            ('vmanage_policy_lists', self.policy_lists.get_policy_list_list()),
+            ('vmanage_policy_definitions', self.policy_data.iter_policy_definition_export()),
+            ('vmanage_central_policies', self.policy_data.export_central_policy_list()),
+            ('vmanage_local_policies', self.local_policy.get_local_policy_list()),
+            ('vmanage_security_policies', self.policy_data.export_security_policy_list()),
+        ]
 
-        if export_file.endswith('.json'):
-            with open(export_file, 'w') as outfile:
-                json.dump(policy_export, outfile, indent=4, sort_keys=False)
-        elif export_file.endswith(('.yaml', 'yml')):
-            with open(export_file, 'w') as outfile:
-                yaml.dump(policy_export, outfile, default_flow_style=False)
-        else:
-            raise Exception("File format not supported")
+        ExportWriter(export_file, yaml_options={'default_flow_style': False}).write(policy_export)
 
+    @cached
     def import_policy_from_file(self, file, update=False, check_mode=False, push=False):
         """Import policy from a file.  All object Names will be translated to IDs.
 
@@ -257,29 +278,36 @@ class Files(object):
         else:
             security_policy_data = []
 
-        policy_list_updates = self.policy_data.import_policy_list_list(policy_list_data,
-                                                                       check_mode=check_mode,
-                                                                       update=update,
-                                                                       push=push)
-
-        self.policy_lists.clear_policy_list_cache()
-
-        policy_definition_updates = self.policy_data.import_policy_definition_list(policy_definition_data,
-                                                                                   check_mode=check_mode,
-                                                                                   update=update,
-                                                                                   push=push)
-        central_policy_updates = self.policy_data.import_central_policy_list(central_policy_data,
-                                                                             check_mode=check_mode,
-                                                                             update=update,
-                                                                             push=push)
-        local_policy_updates = self.policy_data.import_local_policy_list(local_policy_data,
-                                                                         check_mode=check_mode,
-                                                                         update=update,
-                                                                         push=push)
-        security_policy_updates = self.policy_data.import_security_policy_list(security_policy_data,
-                                                                               check_mode=check_mode,
-                                                                               update=update,
-                                                                               push=push)
+        import_methods = {
+            'policy_list': self.policy_data.import_policy_list_list,
+            'policy_definition': self.policy_data.import_policy_definition_list,
+            'central_policy': self.policy_data.import_central_policy_list,
+            'local_policy': self.policy_data.import_local_policy_list,
+            'security_policy': self.policy_data.import_security_policy_list,
+        }
+        updates = {kind: [] for kind in import_methods}
+        # Each object is pushed as soon as the lists and definitions it names are in place
+        graph = build_policy_graph(policy_list_data, policy_definition_data, central_policy_data, local_policy_data,
+                                   security_policy_data)
+        for wave in graph.get_waves():
+            # The templates affected by the objects of a wave are pushed once the whole wave is in
+            templates_affected = set()
+            for kind, wave_updates in self.import_wave(import_methods,
+                                                       wave,
+                                                       check_mode=check_mode,
+                                                       update=update,
+                                                       push=push,
+                                                       templates_affected=templates_affected):
+                updates[kind].extend(wave_updates)
+            if push:
+                self.policy_data.push_templates(templates_affected)
+            if 'policy_list' in wave:
+                self.policy_lists.clear_policy_list_cache()
+        policy_list_updates = updates['policy_list']
+        policy_definition_updates = updates['policy_definition']
+        central_policy_updates = updates['central_policy']
+        local_policy_updates = updates['local_policy']
+        security_policy_updates = updates['security_policy']
 
         return {
             'policy_list_updates': policy_list_updates,
@@ -289,6 +317,7 @@ class Files(object):
             'security_policy_updates': security_policy_updates
         }
 
+    @cached
     def export_attachments_to_file(self, export_file, name_list=None, device_type=None):
         """Export attachments to a file.  All object IDs will be translated to names.  Use
         a '.yml' extention to export as YAML and a '.json' extension to export as JSON.
@@ -349,13 +378,23 @@ class Files(object):
             raise Exception("File format not supported")
         return (len(attachments_list))
 
-    def import_attachments_from_file(self, import_file, update=False, check_mode=False, name_list=None):
+    @cached
+    @traced
+    def import_attachments_from_file(self,
+                                     import_file,
+                                     update=False,
+                                     check_mode=False,
+                                     name_list=None,
+                                     batch_size=None,
+                                     batches_in_flight=DEFAULT_BATCHES_IN_FLIGHT):
         """Import attachments from a file.  All object Names will be translated to IDs.
 
         Args:
             import_file (str): The name of the import file
             check_mode (bool): Try the import, but don't make changes (default: False)
             update (bool): Update existing templates (default: False)
+            batch_size (int): Attach the devices in batches of this many (default: one call per template)
+            batches_in_flight (int): The most batches to leave running on vManage at once
 
         """
 
@@ -363,11 +402,12 @@ class Files(object):
         # Read in the datafile
         if not os.path.exists(import_file):
             raise Exception(f"Cannot find file {import_file}")
-        with open(import_file) as f:
-            if import_file.endswith('.yaml') or import_file.endswith('.yml'):
-                template_data = yaml.safe_load(f)
-            else:
-                template_data = json.load(f)
+        with get_tracer(self.session).span('read-file', attributes={'vmanage.file': import_file}):
+            with open(import_file) as f:
+                if import_file.endswith('.yaml') or import_file.endswith('.yml'):
+                    template_data = yaml.safe_load(f)
+                else:
+                    template_data = json.load(f)
 
         imported_attachment_list = []
         if 'vmanage_attachments' in template_data:
@@ -378,5 +418,7 @@ class Files(object):
         # Process the device templates
         result = self.template_data.import_attachment_list(imported_attachment_list,
                                                            check_mode=check_mode,
-                                                           update=update)
+                                                           update=update,
+                                                           batch_size=batch_size,
+                                                           batches_in_flight=batches_in_flight)
         return result
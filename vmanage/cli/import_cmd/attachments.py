@@ -1,4 +1,5 @@
 import click
+from vmanage.api.device_templates import DEFAULT_BATCHES_IN_FLIGHT
 from vmanage.apps.files import Files
 
 
@@ -8,8 +9,13 @@ from vmanage.apps.files import Files
 @click.option('--update/--no-update', help="Update if exists", default=False)
 # @click.option('--diff/--no-diff', help="Show Diffs", default=False)
 @click.option('--name', '-n', help="Host name of the device", multiple=True)
+@click.option('--batch-size', type=int, help="Attach devices in batches of this many (default: one call per template)")
+@click.option('--batches-in-flight',
+              type=int,
+              default=DEFAULT_BATCHES_IN_FLIGHT,
+              help=f"Batches left running on vManage at once (default: {DEFAULT_BATCHES_IN_FLIGHT})")
 @click.pass_obj
-def attachments(ctx, input_file, check, update, name):
+def attachments(ctx, input_file, check, update, name, batch_size, batches_in_flight):
     """
     Import attachments from file
     """
@@ -17,10 +23,19 @@ def attachments(ctx, input_file, check, update, name):
 
     if name:
         click.echo(f'Importing attachment(s) for {",".join(name)} from {input_file}')
-        result = vmanage_files.import_attachments_from_file(input_file, update=update, check_mode=check, name_list=name)
+        result = vmanage_files.import_attachments_from_file(input_file,
+                                                            update=update,
+                                                            check_mode=check,
+                                                            name_list=name,
+                                                            batch_size=batch_size,
+                                                            batches_in_flight=batches_in_flight)
     else:
         click.echo(f'Importing attachment(s) from {input_file}')
-        result = vmanage_files.import_attachments_from_file(input_file, update=update, check_mode=check)
+        result = vmanage_files.import_attachments_from_file(input_file,
+                                                            update=update,
+                                                            check_mode=check,
+                                                            batch_size=batch_size,
+                                                            batches_in_flight=batches_in_flight)
 
     print(f"Attachment Updates: {len(result['updates'])}")
     for host, failure in result['failures'].items():
@@ -39,19 +39,19 @@ def connections(ctx, device, json):
         )
         click.echo("-" * 115)
 
+    # The queries finish in any order, so print the devices in the order they were listed
+    results = dict(mn.collect('get_control_connections', device_list))
     for dev in device_list:
-        try:
-            control_connections = mn.get_control_connections(dev)
-            if json:
-                print_json(control_connections)
-            else:
-                for connection in control_connections:
-                    click.echo(
-                        f"{dev:15} {connection['peer-type']:7} {connection['protocol']:4} {connection['system-ip']:15} {connection['site-id']:6} {connection['domain-id']:6} {connection['private-ip']:15} {connection['public-ip']:15} {connection['local-color']:15}  {connection['state']:11} {connection['uptime']:11}"
-                    )
-        # TODO: figure out correct exception type to catch
-        except Exception:
-            pass
+        control_connections = results[dev]
+        if isinstance(control_connections, Exception):
+            click.secho(f"{dev}: {control_connections}", err=True, fg='red')
+        elif json:
+            print_json(control_connections)
+        else:
+            for connection in control_connections:
+                click.echo(
+                    f"{dev:15} {connection['peer-type']:7} {connection['protocol']:4} {connection['system-ip']:15} {connection['site-id']:6} {connection['domain-id']:6} {connection['private-ip']:15} {connection['public-ip']:15} {connection['local-color']:15}  {connection['state']:11} {connection['uptime']:11}"
+                )
 
 
 @click.command('connections-history')
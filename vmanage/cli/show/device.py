@@ -3,6 +3,7 @@ import ipaddress
 import click
 from vmanage.api.device import Device
 from vmanage.cli.show.print_utils import print_json
+from vmanage.cli.sync import get_offline_cache
 
 
 @click.command()
@@ -15,13 +16,17 @@ from vmanage.cli.show.print_utils import print_json
               type=click.Choice(['edge', 'control', 'all']),
               help="Device type [vedges, controllers]")
 @click.option('--json/--no-json', default=False)
+@click.option('--cached/--no-cached', default=False, help="Answer from the cache filled by vmanage sync")
 @click.pass_obj
-def status(ctx, dev, device_type, json):  #pylint: disable=unused-argument
+def status(ctx, dev, device_type, json, cached):  #pylint: disable=unused-argument
     """
     Show device status information
     """
 
-    vmanage_device = Device(ctx.auth, ctx.host, ctx.port)
+    if cached:
+        vmanage_device = get_offline_cache(ctx, 'devices')
+    else:
+        vmanage_device = Device(ctx.auth, ctx.host, ctx.port)
     # output = mn.get_control_connections_history(sysip)
     # vmanage_session = ctx.obj
 
@@ -75,12 +80,16 @@ def status(ctx, dev, device_type, json):  #pylint: disable=unused-argument
               type=click.Choice(['edge', 'control', 'all']),
               help="Device type [vedges, controllers]")
 @click.option('--json/--no-json', default=False)
+@click.option('--cached/--no-cached', default=False, help="Answer from the cache filled by vmanage sync")
 @click.pass_obj
-def config(ctx, dev, device_type, json):
+def config(ctx, dev, device_type, json, cached):
     """
     Show device config information
     """
-    vmanage_device = Device(ctx.auth, ctx.host, ctx.port)
+    if cached:
+        vmanage_device = get_offline_cache(ctx, 'devices')
+    else:
+        vmanage_device = Device(ctx.auth, ctx.host, ctx.port)
 
     #pylint: disable=too-many-nested-blocks
     if dev:
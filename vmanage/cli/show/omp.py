@@ -71,7 +71,7 @@ def received(ctx, device, json):
         click.echo("VPN    PREFIX             PROTOCOL   FROM-PEER       Originator      COLOR           STATUS")
         click.echo("------------------------------------------------------------------------------------------------")
     # try:
-    omp_peers = mn.get_omp_routes_received(system_ip)
+    omp_peers = mn.get_omp_routes_received(system_ip, stream=not json)
     if json:
         print_json(omp_peers)
     else:
@@ -7,19 +7,24 @@ from vmanage.api.policy_definitions import (PolicyDefinitions, all_definition_ty
 from vmanage.api.policy_lists import PolicyLists
 from vmanage.api.security_policy import SecurityPolicy
 from vmanage.cli.show.print_utils import print_json
+from vmanage.cli.sync import get_offline_cache
 from vmanage.data.policy_data import PolicyData
 
 
 @click.command('list')
 @click.argument('name', required=False, default=None)
 @click.option('--json/--no-json', default=False)
+@click.option('--cached/--no-cached', default=False, help="Answer from the cache filled by vmanage sync")
 @click.option('--type', '-t', 'policy_list_type', default='all', help="Policy list type")
 @click.pass_obj
-def list_cmd(ctx, name, json, policy_list_type):  #pylint: disable=unused-argument
+def list_cmd(ctx, name, json, cached, policy_list_type):  #pylint: disable=unused-argument
     """
     Show policy list information
     """
-    policy_lists = PolicyLists(ctx.auth, ctx.host, ctx.port)
+    if cached:
+        policy_lists = get_offline_cache(ctx, 'policies')
+    else:
+        policy_lists = PolicyLists(ctx.auth, ctx.host, ctx.port)
     pp = pprint.PrettyPrinter(indent=2)
 
     if name:
@@ -34,6 +39,7 @@ def list_cmd(ctx, name, json, policy_list_type):  #pylint: disable=unused-argume
 @click.command()
 @click.argument('name', required=False, default=None)
 @click.option('--json/--no-json', default=False)
+@click.option('--cached/--no-cached', default=False, help="Answer from the cache filled by vmanage sync")
 @click.option('--type',
               '-t',
               'definition_type',
@@ -41,12 +47,15 @@ def list_cmd(ctx, name, json, policy_list_type):  #pylint: disable=unused-argume
               help="Definition type",
               type=click.Choice(all_definition_types + ['all']))
 @click.pass_obj
-def definition(ctx, name, json, definition_type):  #pylint: disable=unused-argument
+def definition(ctx, name, json, cached, definition_type):  #pylint: disable=unused-argument
     """
     Show policy definition information
     """
-    policy_definitions = PolicyDefinitions(ctx.auth, ctx.host, ctx.port)
-    policy_data = PolicyData(ctx.auth, ctx.host, ctx.port)
+    if cached:
+        policy_definitions = policy_data = get_offline_cache(ctx, 'policies')
+    else:
+        policy_definitions = PolicyDefinitions(ctx.auth, ctx.host, ctx.port)
+        policy_data = PolicyData(ctx.auth, ctx.host, ctx.port)
     pp = pprint.PrettyPrinter(indent=2)
 
     if name:
@@ -63,19 +72,23 @@ def definition(ctx, name, json, definition_type):  #pylint: disable=unused-argum
 @click.command()
 @click.argument('name', required=False, default=None)
 @click.option('--json/--no-json', default=False)
+@click.option('--cached/--no-cached', default=False, help="Answer from the cache filled by vmanage sync")
 @click.pass_obj
-def central(ctx, name, json):  #pylint: disable=unused-argument
+def central(ctx, name, json, cached):  #pylint: disable=unused-argument
     """
     Show central policy information
     """
-    central_policy = CentralPolicy(ctx.auth, ctx.host, ctx.port)
-    policy_data = PolicyData(ctx.auth, ctx.host, ctx.port)
+    if cached:
+        central_policy = policy_data = get_offline_cache(ctx, 'policies')
+    else:
+        central_policy = CentralPolicy(ctx.auth, ctx.host, ctx.port)
+        policy_data = PolicyData(ctx.auth, ctx.host, ctx.port)
     pp = pprint.PrettyPrinter(indent=2)
 
     if name:
         central_policy_dict = central_policy.get_central_policy_dict()
         if name in central_policy_dict:
-            if json:
+            if json or cached:
                 print_json(central_policy_dict[name])
             else:
                 preview = central_policy.get_central_policy_preview(central_policy_dict[name]['policyId'])
@@ -88,19 +101,23 @@ def central(ctx, name, json):  #pylint: disable=unused-argument
 @click.command()
 @click.argument('name', required=False, default=None)
 @click.option('--json/--no-json', default=False)
+@click.option('--cached/--no-cached', default=False, help="Answer from the cache filled by vmanage sync")
 @click.pass_obj
-def local(ctx, name, json):  #pylint: disable=unused-argument
+def local(ctx, name, json, cached):  #pylint: disable=unused-argument
     """
     Show local policy information
     """
-    local_policy = LocalPolicy(ctx.auth, ctx.host, ctx.port)
-    policy_data = PolicyData(ctx.auth, ctx.host, ctx.port)
+    if cached:
+        local_policy = policy_data = get_offline_cache(ctx, 'policies')
+    else:
+        local_policy = LocalPolicy(ctx.auth, ctx.host, ctx.port)
+        policy_data = PolicyData(ctx.auth, ctx.host, ctx.port)
     pp = pprint.PrettyPrinter(indent=2)
 
     if name:
-        policy_list_dict = local_policy.get_policy_list_dict(type=type)
-        if name in policy_list_dict:
-            pp.pprint(policy_list_dict[name])
+        local_policy_dict = local_policy.get_local_policy_dict()
+        if name in local_policy_dict:
+            pp.pprint(local_policy_dict[name])
     else:
         local_policy_list = policy_data.export_local_policy_list()
         pp.pprint(local_policy_list)
@@ -109,19 +126,23 @@ def local(ctx, name, json):  #pylint: disable=unused-argument
 @click.command()
 @click.argument('name', required=False, default=None)
 @click.option('--json/--no-json', default=False)
+@click.option('--cached/--no-cached', default=False, help="Answer from the cache filled by vmanage sync")
 @click.pass_obj
-def security(ctx, name, json):  #pylint: disable=unused-argument
+def security(ctx, name, json, cached):  #pylint: disable=unused-argument
     """
     Show security policy information
     """
-    security_policy = SecurityPolicy(ctx.auth, ctx.host, ctx.port)
-    policy_data = PolicyData(ctx.auth, ctx.host, ctx.port)
+    if cached:
+        security_policy = policy_data = get_offline_cache(ctx, 'policies')
+    else:
+        security_policy = SecurityPolicy(ctx.auth, ctx.host, ctx.port)
+        policy_data = PolicyData(ctx.auth, ctx.host, ctx.port)
     pp = pprint.PrettyPrinter(indent=2)
 
     if name:
         security_policy_dict = security_policy.get_security_policy_dict()
         if name in security_policy_dict:
-            if json:
+            if json or cached:
                 print_json(security_policy_dict[name])
             else:
                 preview = security_policy.get_security_policy_preview(security_policy_dict[name]['policyId'])
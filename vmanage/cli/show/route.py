@@ -30,7 +30,8 @@ def table(ctx, device, json):
         click.echo("VPNID  PREFIX               NEXT HOP              PROTOCOL      ")
         click.echo("----------------------------------------------------------------")
 
-    routes = vmanage_device.get_device_data('ip/routetable', system_ip)
+    # Stream the routes so that large tables start printing right away
+    routes = vmanage_device.get_device_data('ip/routetable', system_ip, stream=True)
     for rte in routes:
         if json:
             print_json(rte)
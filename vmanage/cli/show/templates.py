@@ -5,6 +5,7 @@ import dictdiffer
 from vmanage.api.device_templates import DeviceTemplates
 from vmanage.api.feature_templates import FeatureTemplates
 from vmanage.cli.show.print_utils import print_json
+from vmanage.cli.sync import get_offline_cache
 from vmanage.data.template_data import TemplateData
 
 
@@ -19,14 +20,19 @@ from vmanage.data.template_data import TemplateData
 @click.option('--default/--no-default', help="Print system default templates", default=False)
 @click.option('--name', '-n')
 @click.option('--json/--no-json', help="JSON Output")
+@click.option('--cached/--no-cached', default=False, help="Answer from the cache filled by vmanage sync")
 @click.pass_obj
-def templates(ctx, template_type, diff, default, name, json):
+def templates(ctx, template_type, diff, default, name, json, cached):
     """
     Show template information
     """
-    device_templates = DeviceTemplates(ctx.auth, ctx.host, ctx.port)
-    feature_templates = FeatureTemplates(ctx.auth, ctx.host, ctx.port)
-    template_data = TemplateData(ctx.auth, ctx.host, ctx.port)
+    if cached:
+        # The cache answers for all three
+        device_templates = feature_templates = template_data = get_offline_cache(ctx, 'templates')
+    else:
+        device_templates = DeviceTemplates(ctx.auth, ctx.host, ctx.port)
+        feature_templates = FeatureTemplates(ctx.auth, ctx.host, ctx.port)
+        template_data = TemplateData(ctx.auth, ctx.host, ctx.port)
     pp = pprint.PrettyPrinter(indent=2)
 
     if name:
@@ -0,0 +1,30 @@
+import click
+from vmanage.data.offline_cache import OfflineCache, SYNC_SCOPES
+
+
+def get_offline_cache(ctx, scope):
+    """
+    Get the local cache of vManage for a show command, making sure the scope has been synced
+    """
+    offline_cache = OfflineCache(ctx.host, ctx.port)
+    if offline_cache.get_synced_at(scope) is None:
+        raise click.ClickException(f"No cached {scope}, run 'vmanage sync' first")
+    return offline_cache
+
+
+@click.command()
+@click.option('--scope',
+              '-s',
+              'scopes',
+              multiple=True,
+              type=click.Choice(SYNC_SCOPES),
+              help="What to sync (default: everything)")
+@click.pass_obj
+def sync(ctx, scopes):
+    """
+    Sync the local cache used by show --cached
+    """
+    offline_cache = OfflineCache(ctx.host, ctx.port)
+    result = offline_cache.sync(ctx.auth, scopes=list(scopes) or None)
+    for scope, count in result.items():
+        click.echo(f"Synced {count} {scope} objects to {offline_cache.path}")
@@ -0,0 +1,146 @@
+"""Cisco vManage Device Status Index.
+"""
+
+import threading
+import time
+from vmanage.api.http_methods import HttpMethods
+from vmanage.api.transport import Transport
+from vmanage.data.parse_methods import ParseMethods
+
+# The device status keys that are indexed.  site-id is shared by the
+# devices at a site, the others identify a single device.
+DEVICE_INDEX_KEYS = ['uuid', 'system-ip', 'host-name', 'board-serial', 'site-id']
+# Seconds the device status list is used for before it is fetched again
+DEFAULT_MAX_AGE = 60
+
+
+class DeviceIndex(object):
+    """Index over the device status list for lookups without a call per device.
+
+    The index is shared by everything using the same session.  The status
+    list is fetched once and hashed on each of the indexed keys, and is
+    fetched again when it is older than the staleness window, when a
+    write through the session changes device state (a device action,
+    template attach and so on), or when refresh is called.
+
+    """
+    def __init__(self, session, host, port=443, max_age=DEFAULT_MAX_AGE, keys=None):
+        """Initialize Device Index object with session parameters.
+
+        Args:
+            session (obj): Requests Session object
+            host (str): hostname or IP address of vManage
+            port (int): default HTTPS 443
+            max_age (int): Seconds the status list is used for before it
+                is fetched again
+            keys (list): Device status keys to index (default: DEVICE_INDEX_KEYS)
+
+        """
+
+        self.session = session
+        self.host = host
+        self.port = port
+        self.base_url = f'https://{self.host}:{self.port}/dataservice/'
+        self.max_age = max_age
+        self.keys = list(DEVICE_INDEX_KEYS if keys is None else keys)
+        self.cache = Transport.from_session(self.session).cache
+        self.lock = threading.RLock()
+        self.devices = []
+        self.indexes = {}
+        self.loaded_at = None
+        self.synced = None
+        self.session.device_index = self
+
+    @classmethod
+    def from_session(cls, session, host, port=443):
+        """Get the index attached to a session, creating one if needed.
+
+        Args:
+            session (obj): Requests Session object
+            host (str): hostname or IP address of vManage
+            port (int): default HTTPS 443
+
+        Returns:
+            index (DeviceIndex): The index shared by the session.
+
+        """
+
+        index = getattr(session, 'device_index', None)
+        if index is None or index.host != host or index.port != port:
+            index = cls(session, host, port)
+        return index
+
+    def refresh(self):
+        """Fetch the device status list and rebuild the index."""
+
+        with self.lock:
+            synced = self.cache.get_stale_count('device')
+            response = HttpMethods(self.session, f'{self.base_url}device').request('GET', cache=False)
+            devices = ParseMethods.parse_data(response)
+            indexes = {key: {} for key in self.keys}
+            for device in devices:
+                for key in self.keys:
+                    if key in device:
+                        indexes[key].setdefault(str(device[key]), []).append(device)
+            self.devices = devices
+            self.indexes = indexes
+            self.loaded_at = time.monotonic()
+            self.synced = synced
+
+    def is_stale(self):
+        """Check whether the index needs to be fetched again.
+
+        Returns:
+            result (bool): True if the index was never loaded, is older
+                than the staleness window or device state was changed
+                through the session since it was loaded.
+
+        """
+
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > self.max_age \
+            or self.synced != self.cache.get_stale_count('device')
+
+    def get_devices(self, value, key='system-ip'):
+        """Get the status of every device with a key value.
+
+        Args:
+            value (str): The value of the key to match
+            key (string): The key on which to match (e.g. site-id)
+
+        Returns:
+            result (list): Device status of the matching devices.
+
+        """
+
+        with self.lock:
+            if self.is_stale():
+                self.refresh()
+            if key in self.indexes:
+                return list(self.indexes[key].get(str(value), []))
+            return [device for device in self.devices if key in device and str(device[key]) == str(value)]
+
+    def get_device_status(self, value, key='system-ip'):
+        """Get the status of a specific device
+
+        Args:
+            value string: The value of the key to match
+            key (string): The key on which to match (e.g. system-ip)
+
+        Returns:
+            result (dict): Device status
+        """
+
+        devices = self.get_devices(value, key)
+        return devices[0] if devices else {}
+
+    def get_device_status_list(self):
+        """Get the status of every device.
+
+        Returns:
+            result (list): Device status
+        """
+
+        with self.lock:
+            if self.is_stale():
+                self.refresh()
+            return list(self.devices)
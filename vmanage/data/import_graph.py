@@ -0,0 +1,202 @@
+"""Dependency Graph for Template and Policy Imports.
+"""
+
+# List keys that hold free form values rather than policy list names
+NON_LIST_KEYS = ['signatureWhiteList', 'urlWhiteList', 'urlBlackList']
+
+
+class ImportGraph(object):
+    """Dependency graph over the objects in an import file.
+
+    Objects reference each other by name (device templates name their
+    feature templates, definitions name their lists and policies name their
+    definitions), so an object can only be pushed once everything it names
+    exists in vManage.  The graph groups the objects into waves where every
+    object depends only on objects in earlier waves, so the objects in a
+    wave can be pushed at the same time.
+
+    """
+    def __init__(self):
+        """Initialize an empty graph."""
+
+        self.nodes = []
+        self.dependencies = []
+
+    def add(self, kind, item):
+        """Add an object to the graph.
+
+        Args:
+            kind (str): The kind of object (e.g. 'feature_template')
+            item (dict): The object
+
+        Returns:
+            result (int): The node index of the object.
+
+        """
+
+        self.nodes.append((kind, item))
+        self.dependencies.append(set())
+        return len(self.nodes) - 1
+
+    def add_dependency(self, node, dependency):
+        """Record that one object must be pushed after another.
+
+        Args:
+            node (int): The node index of the dependent object
+            dependency (int): The node index of the object it references
+
+        """
+
+        if node != dependency:
+            self.dependencies[node].add(dependency)
+
+    def get_waves(self):
+        """Group the objects into dependency ordered waves.
+
+        Returns:
+            result (list): One dictionary per wave mapping each kind to the
+                objects of that kind in the wave, in the order they were added.
+
+        Raises:
+            RuntimeError: The objects reference each other in a cycle.
+
+        """
+
+        dependents = [[] for _ in self.nodes]
+        remaining = [len(dependencies) for dependencies in self.dependencies]
+        for node, dependencies in enumerate(self.dependencies):
+            for dependency in dependencies:
+                dependents[dependency].append(node)
+
+        waves = []
+        ready = [node for node, count in enumerate(remaining) if not count]
+        placed = 0
+        while ready:
+            wave = {}
+            next_ready = []
+            for node in ready:
+                kind, item = self.nodes[node]
+                wave.setdefault(kind, []).append(item)
+                for dependent in dependents[node]:
+                    remaining[dependent] -= 1
+                    if not remaining[dependent]:
+                        next_ready.append(dependent)
+            waves.append(wave)
+            placed += len(ready)
+            ready = sorted(next_ready)
+
+        if placed != len(self.nodes):
+            raise RuntimeError("Import objects reference each other in a cycle")
+        return waves
+
+
+def get_list_references(data):
+    """Get the names of the policy lists referenced by an object.
+
+    Follows the same rules as PolicyData.convert_list_name_to_id.
+
+    Args:
+        data (dict): The object, with lists referenced by name
+
+    Returns:
+        result (set): The referenced list names.
+
+    """
+
+    names = set()
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key.endswith('List') and key not in NON_LIST_KEYS:
+                names.update(value if isinstance(value, list) else [value])
+            elif key.endswith('Lists'):
+                names.update(value)
+            elif key.endswith('Zone'):
+                names.add(value)
+            elif key in ('listName', 'className'):
+                names.add(value)
+            else:
+                names.update(get_list_references(value))
+    elif isinstance(data, list):
+        for item in data:
+            names.update(get_list_references(item))
+    return {name for name in names if isinstance(name, str)}
+
+
+def build_template_graph(feature_template_list, device_template_list):
+    """Build the dependency graph of a template import.
+
+    Args:
+        feature_template_list (list): Feature templates to import
+        device_template_list (list): Device templates to import
+
+    Returns:
+        result (ImportGraph): The graph, with 'feature_template' and
+            'device_template' objects.
+
+    """
+
+    graph = ImportGraph()
+    feature_template_nodes = {}
+    for feature_template in feature_template_list:
+        feature_template_nodes[feature_template['templateName']] = graph.add('feature_template', feature_template)
+
+    for device_template in device_template_list:
+        node = graph.add('device_template', device_template)
+        for general_template in device_template.get('generalTemplates', []):
+            for template in [general_template] + general_template.get('subTemplates', []):
+                # Templates that aren't in the file are expected to exist already (e.g. Factory Default)
+                if template.get('templateName') in feature_template_nodes:
+                    graph.add_dependency(node, feature_template_nodes[template['templateName']])
+
+    return graph
+
+
+def build_policy_graph(policy_list_list, policy_definition_list, central_policy_list, local_policy_list,
+                       security_policy_list):
+    """Build the dependency graph of a policy import.
+
+    Args:
+        policy_list_list (list): Policy lists to import
+        policy_definition_list (list): Policy definitions to import
+        central_policy_list (list): Central policies to import
+        local_policy_list (list): Local policies to import
+        security_policy_list (list): Security policies to import
+
+    Returns:
+        result (ImportGraph): The graph, with 'policy_list', 'policy_definition',
+            'central_policy', 'local_policy' and 'security_policy' objects.
+
+    """
+
+    graph = ImportGraph()
+    # List references don't always carry the list type, so depend on every list with the name
+    list_nodes = {}
+    for policy_list in policy_list_list:
+        list_nodes.setdefault(policy_list['name'], []).append(graph.add('policy_list', policy_list))
+
+    def add_list_dependencies(node, data):
+        for name in get_list_references(data):
+            for list_node in list_nodes.get(name, []):
+                graph.add_dependency(node, list_node)
+
+    definition_nodes = {}
+    for definition in policy_definition_list:
+        node = graph.add('policy_definition', definition)
+        definition_nodes.setdefault(definition['name'], []).append((definition['type'].lower(), node))
+        for key in ('definition', 'sequences', 'rules'):
+            add_list_dependencies(node, definition.get(key))
+
+    for kind, policy_list in [('central_policy', central_policy_list), ('local_policy', local_policy_list),
+                              ('security_policy', security_policy_list)]:
+        for policy in policy_list:
+            node = graph.add(kind, policy)
+            policy_definition = policy.get('policyDefinition')
+            if not isinstance(policy_definition, dict):
+                continue
+            for assembly_item in policy_definition.get('assembly') or []:
+                for definition_type, definition_node in definition_nodes.get(assembly_item.get('definitionName'), []):
+                    if definition_type == str(assembly_item.get('type', '')).lower():
+                        graph.add_dependency(node, definition_node)
+            add_list_dependencies(node, policy_definition)
+
+    return graph
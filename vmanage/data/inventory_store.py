@@ -0,0 +1,160 @@
+"""Cisco vManage Device Inventory Store.
+"""
+
+import hashlib
+import json
+import threading
+from vmanage.api.http_methods import HttpMethods
+
+# The device lists each source is built from
+INVENTORY_SOURCES = {
+    'status': ['device'],
+    'vedges': ['system/device/vedges'],
+    'controllers': ['system/device/controllers'],
+    'all': ['system/device/controllers', 'system/device/vedges'],
+}
+# Fields that change on every poll without anything happening to the device
+DEFAULT_IGNORE_KEYS = ['lastupdated', 'uptime-date']
+
+
+class InventoryStore(object):
+    """Device inventory kept in step with vManage, with change detection.
+
+    vManage can only return the whole inventory, so each refresh still
+    reads every device, but the response is parsed as it streams in and
+    each device is compared to the last snapshot by a fingerprint.  Every
+    refresh that finds a difference creates a new snapshot number, and
+    changes_since returns only the devices added, changed or removed after
+    a given snapshot, so callers can work on the deltas.
+
+    """
+    def __init__(self, session, host, port=443, source='status', ignore_keys=None):
+        """Initialize Inventory Store object with session parameters.
+
+        Args:
+            session (obj): Requests Session object
+            host (str): hostname or IP address of vManage
+            port (int): default HTTPS 443
+            source (str): 'status' (device status), 'vedges', 'controllers'
+                or 'all' (device config of vedges and controllers)
+            ignore_keys (list): Device fields that are not compared
+                (default: DEFAULT_IGNORE_KEYS)
+
+        """
+
+        if source not in INVENTORY_SOURCES:
+            raise ValueError(f"Unknown inventory source {source}")
+        self.session = session
+        self.host = host
+        self.port = port
+        self.base_url = f'https://{self.host}:{self.port}/dataservice/'
+        self.source = source
+        self.ignore_keys = set(DEFAULT_IGNORE_KEYS if ignore_keys is None else ignore_keys)
+        self.lock = threading.Lock()
+        self.snapshot = 0
+        self.devices = {}
+        self.fingerprints = {}
+        self.added_at = {}
+        self.changed_at = {}
+        self.removed_at = {}
+
+    def get_fingerprint(self, device):
+        """Get a digest of the fields of a device that are compared."""
+
+        compared = {key: value for key, value in device.items() if key not in self.ignore_keys}
+        return hashlib.sha1(json.dumps(compared, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def iter_devices(self):
+        """Read the current inventory from vManage.
+
+        Yields:
+            device (dict): Each device in the inventory.
+
+        """
+
+        for api in INVENTORY_SOURCES[self.source]:
+            for device in HttpMethods(self.session, self.base_url + api).stream('GET'):
+                yield device
+
+    def refresh(self):
+        """Read the inventory and record what changed since the last refresh.
+
+        Returns:
+            result (dict): The changes found, as returned by changes_since.
+
+        """
+
+        with self.lock:
+            previous = self.snapshot
+            snapshot = self.snapshot + 1
+            seen = set()
+            for device in self.iter_devices():
+                uuid = device.get('uuid')
+                if uuid is None:
+                    continue
+                seen.add(uuid)
+                fingerprint = self.get_fingerprint(device)
+                if uuid not in self.fingerprints:
+                    self.added_at[uuid] = snapshot
+                    self.changed_at[uuid] = snapshot
+                    self.removed_at.pop(uuid, None)
+                elif self.fingerprints[uuid] != fingerprint:
+                    self.changed_at[uuid] = snapshot
+                self.fingerprints[uuid] = fingerprint
+                self.devices[uuid] = device
+
+            for uuid in [uuid for uuid in self.devices if uuid not in seen]:
+                del self.devices[uuid]
+                del self.fingerprints[uuid]
+                del self.changed_at[uuid]
+                self.removed_at[uuid] = (self.added_at.pop(uuid), snapshot)
+
+            # Only move to a new snapshot when something happened
+            if any(self.changed_at[uuid] == snapshot for uuid in self.changed_at) \
+                    or any(removed == snapshot for _, removed in self.removed_at.values()):
+                self.snapshot = snapshot
+
+        return self.changes_since(previous)
+
+    def changes_since(self, snapshot=0):
+        """Get the devices that changed after a snapshot.
+
+        Args:
+            snapshot (int): A snapshot number returned earlier (default: 0,
+                which returns the whole inventory as added)
+
+        Returns:
+            result (dict): 'snapshot' is the current snapshot number to pass
+                next time, 'added' and 'changed' list the devices that were
+                added or changed, and 'removed' lists the UUIDs of the
+                devices that were removed.
+
+        """
+
+        with self.lock:
+            added = []
+            changed = []
+            for uuid, device in self.devices.items():
+                if self.added_at[uuid] > snapshot:
+                    added.append(device)
+                elif self.changed_at[uuid] > snapshot:
+                    changed.append(device)
+            # Devices that came and went after the snapshot were never seen by the caller
+            removed = [
+                uuid for uuid, (added_at, removed_at) in self.removed_at.items() if removed_at > snapshot >= added_at
+            ]
+            return {'snapshot': self.snapshot, 'added': added, 'changed': changed, 'removed': removed}
+
+    def get_device_dict(self, key_name='uuid'):
+        """Get the devices of the last snapshot.
+
+        Args:
+            key_name (string): The name of the attribute to use as the dictionary key
+
+        Returns:
+            result (dict): The devices keyed by the attribute.
+
+        """
+
+        with self.lock:
+            return {device[key_name]: device for device in self.devices.values() if key_name in device}
@@ -0,0 +1,175 @@
+"""Incremental JSON Parsing for Large vManage Responses.
+"""
+
+import codecs
+import json
+
+WHITESPACE = ' \t\n\r'
+DELIMITERS = ',]}' + WHITESPACE
+
+
+class JSONStreamParser(object):
+    """Incrementally parse the elements of one array in a JSON document.
+
+    vManage returns data as ``{"header": {...}, "data": [...]}``.  Rather than
+    loading the whole document, the parser scans the top level object for
+    the requested key and then decodes the array elements one at a time as
+    chunks arrive, so memory stays proportional to a single element.
+
+    """
+    def __init__(self, key='data'):
+        """Initialize the parser.
+
+        Args:
+            key (str): The top level key of the array to parse
+
+        """
+
+        self.key = key
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _feed(self, chunks):
+        """Read one more chunk into the buffer.
+
+        Returns:
+            result (bool): False once the input is exhausted.
+
+        """
+
+        for chunk in chunks:
+            if chunk:
+                # Drop what has already been consumed before growing the buffer
+                self.buffer = self.buffer[self.pos:] + chunk
+                self.pos = 0
+                return True
+        self.eof = True
+        return False
+
+    def _next_char(self, chunks):
+        """Skip whitespace and return the next significant character without consuming it."""
+
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._feed(chunks):
+                return None
+
+    def _find_key(self, chunks):
+        """Advance to the value of the requested top level key.
+
+        Returns:
+            result (bool): True if the key was found.
+
+        """
+
+        depth = 0
+        in_string = False
+        escaped = False
+        string_start = None
+        last_string = None
+        while True:
+            while self.pos < len(self.buffer):
+                char = self.buffer[self.pos]
+                self.pos += 1
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif char == '\\':
+                        escaped = True
+                    elif char == '"':
+                        in_string = False
+                        if depth == 1:
+                            last_string = json.loads(self.buffer[string_start:self.pos])
+                elif char == '"':
+                    in_string = True
+                    string_start = self.pos - 1
+                elif char in '{[':
+                    depth += 1
+                elif char in '}]':
+                    depth -= 1
+                elif char == ':' and depth == 1 and last_string == self.key:
+                    return True
+                elif char not in WHITESPACE:
+                    last_string = None
+            # Keep a partially read string in the buffer so it can be decoded later
+            keep = string_start if in_string else self.pos
+            offset = self.pos - keep
+            self.pos = keep
+            if not self._feed(chunks):
+                return False
+            self.pos = offset
+            string_start = 0
+
+    def _decode_value(self, chunks):
+        """Decode the complete JSON value at the current position."""
+
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A value that is not followed by a delimiter (e.g. a number) may continue in the next chunk
+                if self.eof or (end < len(self.buffer) and self.buffer[end] in DELIMITERS):
+                    self.pos = end
+                    return value
+            except ValueError:
+                if self.eof:
+                    raise
+            self._feed(chunks)
+
+    def parse(self, chunks):
+        """Parse a stream of text chunks.
+
+        Args:
+            chunks (iterable): Text chunks of the JSON document
+
+        Yields:
+            item: Each element of the array under the requested key.
+
+        Raises:
+            ValueError: The document is not valid JSON.
+
+        """
+
+        chunks = iter(chunks)
+        if not self._find_key(chunks):
+            return
+        if self._next_char(chunks) != '[':
+            value = self._decode_value(chunks)
+            if isinstance(value, list):
+                for item in value:
+                    yield item
+            return
+        self.pos += 1
+        while True:
+            char = self._next_char(chunks)
+            if char is None:
+                raise ValueError(f"Unterminated '{self.key}' array")
+            if char == ']':
+                return
+            if char == ',':
+                self.pos += 1
+                continue
+            yield self._decode_value(chunks)
+
+
+def iter_json_array(byte_chunks, key='data', encoding='utf-8'):
+    """Yield the elements of a top level JSON array from a stream of bytes.
+
+    Args:
+        byte_chunks (iterable): Raw byte chunks, e.g. ``response.iter_content()``
+        key (str): The top level key of the array to parse
+        encoding (str): Character encoding of the document
+
+    Yields:
+        item: Each element of the array under the requested key.
+
+    """
+
+    decoder = codecs.getincrementaldecoder(encoding)()
+    chunks = (decoder.decode(chunk) for chunk in byte_chunks)
+    for item in JSONStreamParser(key).parse(chunks):
+        yield item
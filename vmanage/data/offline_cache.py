@@ -0,0 +1,468 @@
+"""Local SQLite Cache of vManage Inventory, Templates and Policies.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from vmanage.api.device import Device
+from vmanage.api.feature_templates import FeatureTemplates
+from vmanage.api.policy_lists import PolicyLists
+from vmanage.data.policy_data import PolicyData
+from vmanage.data.template_data import TemplateData
+from vmanage.utils import list_to_dict
+
+DEFAULT_CACHE_DIR = os.path.join('~', '.cache', 'vmanage')
+SYNC_SCOPES = ['devices', 'templates', 'policies']
+# Device keys with an indexed column of their own
+DEVICE_KEY_COLUMNS = {
+    'uuid': 'uuid',
+    'host-name': 'host_name',
+    'system-ip': 'system_ip',
+    'site-id': 'site_id',
+}
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS sync (scope TEXT PRIMARY KEY, synced_at REAL)',
+    'CREATE TABLE IF NOT EXISTS devices (source TEXT, uuid TEXT, host_name TEXT, system_ip TEXT, site_id TEXT, '
+    'data TEXT, PRIMARY KEY (source, uuid))',
+    'CREATE INDEX IF NOT EXISTS devices_host_name ON devices (host_name)',
+    'CREATE INDEX IF NOT EXISTS devices_system_ip ON devices (system_ip)',
+    'CREATE INDEX IF NOT EXISTS devices_site_id ON devices (site_id)',
+    'CREATE TABLE IF NOT EXISTS templates (template_type TEXT, template_id TEXT, template_name TEXT, '
+    'factory_default INTEGER, data TEXT, PRIMARY KEY (template_type, template_id))',
+    'CREATE INDEX IF NOT EXISTS templates_name ON templates (template_name)',
+    'CREATE TABLE IF NOT EXISTS policy_lists (list_id TEXT PRIMARY KEY, name TEXT, type TEXT, data TEXT)',
+    'CREATE INDEX IF NOT EXISTS policy_lists_name ON policy_lists (name)',
+    'CREATE INDEX IF NOT EXISTS policy_lists_type ON policy_lists (type)',
+    'CREATE TABLE IF NOT EXISTS policies (kind TEXT, policy_id TEXT, name TEXT, type TEXT, data TEXT, '
+    'PRIMARY KEY (kind, policy_id))',
+    'CREATE INDEX IF NOT EXISTS policies_name ON policies (kind, name)',
+]
+
+
+class OfflineCache(object):
+    """Local copy of a vManage inventory for queries without a round trip.
+
+    The cache is a SQLite database per vManage that sync fills with the
+    device status and config lists, the device and feature templates and
+    the policy lists, definitions and policies.  The lookup methods are
+    named after, and return the same data as, the API methods they stand
+    in for, so they can be used in their place.  The data is as old as
+    the last sync of its scope.
+
+    """
+    def __init__(self, host, port=443, cache_dir=None):
+        """Initialize the cache of a vManage.
+
+        Args:
+            host (str): hostname or IP address of vManage
+            port (int): default HTTPS 443
+            cache_dir (str): Directory to keep the database in (default:
+                $VMANAGE_CACHE_DIR, or ~/.cache/vmanage)
+
+        """
+
+        self.host = host
+        self.port = port
+        self.cache_dir = os.path.expanduser(cache_dir or os.environ.get('VMANAGE_CACHE_DIR') or DEFAULT_CACHE_DIR)
+        self.path = os.path.join(self.cache_dir, f"inventory-{host.replace(':', '_')}-{port}.db")
+
+    def connect(self):
+        """Open the database, creating it if needed.
+
+        Returns:
+            result (obj): sqlite3 Connection object
+
+        """
+
+        os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        with conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+        return conn
+
+    def query(self, sql, parameters=()):
+        """Run a query against the cache.
+
+        Returns:
+            result (list): The rows returned.
+
+        """
+
+        with closing(self.connect()) as conn:
+            return conn.execute(sql, parameters).fetchall()
+
+    def get_synced_at(self, scope):
+        """Get when a scope was last synced.
+
+        Args:
+            scope (str): devices, templates or policies
+
+        Returns:
+            result (float): The time of the last sync, or None if the scope
+                has never been synced.
+
+        """
+
+        rows = self.query('SELECT synced_at FROM sync WHERE scope = ?', (scope, ))
+        return rows[0][0] if rows else None
+
+    def sync(self, session, scopes=None):
+        """Fill the cache from vManage.
+
+        Everything in a scope is fetched before the cache is touched, then
+        the scope is replaced in a single transaction, so lookups never see
+        a half synced scope.
+
+        Args:
+            session (obj): Requests Session object
+            scopes (list): The scopes to sync (default: SYNC_SCOPES)
+
+        Returns:
+            result (dict): The number of objects cached per scope.
+
+        """
+
+        result = {}
+        for scope in (SYNC_SCOPES if scopes is None else scopes):
+            if scope not in SYNC_SCOPES:
+                raise ValueError(f"Unknown sync scope {scope}")
+            rows = getattr(self, f'fetch_{scope}')(session)
+            with closing(self.connect()) as conn:
+                with conn:
+                    for table, table_rows in rows.items():
+                        conn.execute(f'DELETE FROM {table}')
+                        if table_rows:
+                            placeholders = ', '.join('?' * len(table_rows[0]))
+                            conn.executemany(f'INSERT OR REPLACE INTO {table} VALUES ({placeholders})', table_rows)
+                    conn.execute('INSERT OR REPLACE INTO sync VALUES (?, ?)', (scope, time.time()))
+            result[scope] = sum(len(table_rows) for table_rows in rows.values())
+        return result
+
+    def fetch_devices(self, session):
+        """Get the device rows of the cache from vManage."""
+
+        device = Device(session, self.host, self.port)
+        rows = []
+        for source, device_list in [('status', device.get_device_status_list()),
+                                    ('controllers', device.get_device_config_list('controllers')),
+                                    ('vedges', device.get_device_config_list('vedges'))]:
+            for entry in device_list:
+                rows.append((source, entry.get('uuid'), entry.get('host-name'), entry.get('system-ip')
+                             or entry.get('deviceIP'), entry.get('site-id'), json.dumps(entry)))
+        return {'devices': rows}
+
+    def fetch_templates(self, session):
+        """Get the template rows of the cache from vManage."""
+
+        template_data = TemplateData(session, self.host, self.port)
+        feature_templates = FeatureTemplates(session, self.host, self.port)
+        rows = []
+        for template in template_data.export_device_template_list(factory_default=True):
+            rows.append(
+                ('device', template['templateId'], template['templateName'], template.get('factoryDefault',
+                                                                                          False), json.dumps(template)))
+        for template in feature_templates.get_feature_template_list(factory_default=True):
+            rows.append(('feature', template['templateId'], template['templateName'],
+                         template.get('factoryDefault', False), json.dumps(template)))
+        return {'templates': rows}
+
+    def fetch_policies(self, session):
+        """Get the policy rows of the cache from vManage."""
+
+        policy_lists = PolicyLists(session, self.host, self.port)
+        policy_data = PolicyData(session, self.host, self.port)
+        list_rows = [(policy_list['listId'], policy_list['name'], policy_list['type'].lower(), json.dumps(policy_list))
+                     for policy_list in policy_lists.get_policy_list_list()]
+        policy_rows = []
+        for kind, policy_list in [('definition', policy_data.export_policy_definition_list()),
+                                  ('central', policy_data.export_central_policy_list()),
+                                  ('local', policy_data.export_local_policy_list()),
+                                  ('security', policy_data.export_security_policy_list())]:
+            for policy in policy_list:
+                if kind == 'definition':
+                    policy_rows.append(
+                        (kind, policy['definitionId'], policy['name'], policy.get('type',
+                                                                                  '').lower(), json.dumps(policy)))
+                else:
+                    policy_rows.append(
+                        (kind, policy['policyId'], policy['policyName'], policy.get('policyType'), json.dumps(policy)))
+        return {'policy_lists': list_rows, 'policies': policy_rows}
+
+    def get_data(self, sql, parameters=()):
+        """Get the cached objects returned by a query on their data column."""
+
+        return [json.loads(row[0]) for row in self.query(sql, parameters)]
+
+    def get_device_status_list(self):
+        """Get the cached device status list.
+
+        Returns:
+            result (list): Device status
+        """
+
+        return self.get_data("SELECT data FROM devices WHERE source = 'status' ORDER BY rowid")
+
+    def get_device_status(self, value, key='system-ip'):
+        """Get the cached status of a specific device
+
+        Args:
+            value string: The value of the key to match
+            key (string): The key on which to match (e.g. system-ip)
+
+        Returns:
+            result (dict): Device status
+        """
+
+        return self.get_device('status', value, key)
+
+    def get_device_config_list(self, device_type):
+        """Get the cached device config list.
+
+        Args:
+            device_type (str): vedges, controllers or all
+
+        Returns:
+            result (list): Device config
+        """
+
+        if device_type == 'all':
+            return self.get_device_config_list('controllers') + self.get_device_config_list('vedges')
+        return self.get_data('SELECT data FROM devices WHERE source = ? ORDER BY rowid', (device_type, ))
+
+    def get_device_config(self, device_type, value, key='system-ip'):
+        """Get the cached config of a specific device
+
+        Args:
+            device_type (str): vedges or controllers
+            value string: The value of the key to match
+            key (string): The key on which to match (e.g. system-ip)
+
+        Returns:
+            result (dict): Device config
+        """
+
+        return self.get_device(device_type, value, key)
+
+    def get_device(self, source, value, key):
+        """Get a cached device by any key, using the index when there is one."""
+
+        value = str(value)
+        if key in DEVICE_KEY_COLUMNS:
+            devices = self.get_data(f'SELECT data FROM devices WHERE source = ? AND {DEVICE_KEY_COLUMNS[key]} = ?',
+                                    (source, value))
+        else:
+            devices = [
+                device for device in self.get_data('SELECT data FROM devices WHERE source = ?', (source, ))
+                if str(device.get(key)) == value
+            ]
+        return devices[0] if devices else {}
+
+    def get_templates(self, template_type, factory_default=False, name_list=None):
+        """Get the cached templates of a type, optionally by name."""
+
+        sql = 'SELECT data FROM templates WHERE template_type = ?'
+        parameters = [template_type]
+        if not factory_default:
+            sql += ' AND NOT factory_default'
+        if name_list:
+            sql += f" AND template_name IN ({', '.join('?' * len(name_list))})"
+            parameters.extend(name_list)
+        return self.get_data(sql + ' ORDER BY rowid', parameters)
+
+    def export_device_template_list(self, factory_default=False, name_list=None):
+        """Get the cached device templates, with object IDs converted to names.
+
+        Args:
+            factory_default (bool): Include factory default
+            name_list (list of strings): A list of template names to retreive.
+
+        Returns:
+            result (list): The device templates.
+        """
+
+        return self.get_templates('device', factory_default=factory_default, name_list=name_list)
+
+    def get_feature_template_list(self, factory_default=False, name_list=None):
+        """Get the cached feature templates.
+
+        Args:
+            factory_default (bool): Whether to return factory default templates
+            name_list (list of strings): A list of the template names to return
+
+        Returns:
+            result (list): The feature templates.
+        """
+
+        return self.get_templates('feature', factory_default=factory_default, name_list=name_list)
+
+    def get_template_attachments(self, template_id):
+        """Get the host names of the devices that a cached device template is attached to.
+
+        Args:
+            template_id (string): Template ID
+
+        Returns:
+            result (list): List of host names.
+
+        """
+
+        templates = self.get_data("SELECT data FROM templates WHERE template_type = 'device' AND template_id = ?",
+                                  (template_id, ))
+        return templates[0]['attached_devices'] if templates else []
+
+    def get_policy_list_list(self, policy_list_type='all'):
+        """Get the cached policy lists
+
+        Args:
+            policy_list_type (str): Policy list type (default: all)
+
+        Returns:
+            result (list): The policy lists.
+
+        """
+
+        if policy_list_type == 'all':
+            return self.get_data('SELECT data FROM policy_lists ORDER BY rowid')
+        return self.get_data('SELECT data FROM policy_lists WHERE type = ? ORDER BY rowid',
+                             (policy_list_type.lower(), ))
+
+    def get_policy_list_dict(self, policy_list_type='all', key_name='name', remove_key=False):
+        """Get a dictionary of the cached policy lists
+
+        Args:
+            policy_list_type (str): Policy list type
+            key_name (string): The name of the attribute to use as the dictionary key
+            remove_key (boolean): Remove the search key from the element
+
+        Returns:
+            result (dict): The policy lists.
+
+        """
+
+        return list_to_dict(self.get_policy_list_list(policy_list_type), key_name, remove_key=remove_key)
+
+    def get_policies(self, kind, policy_type='all'):
+        """Get the cached policies of a kind, optionally of one type."""
+
+        if policy_type == 'all':
+            return self.get_data('SELECT data FROM policies WHERE kind = ? ORDER BY rowid', (kind, ))
+        return self.get_data('SELECT data FROM policies WHERE kind = ? AND type = ? ORDER BY rowid',
+                             (kind, policy_type.lower()))
+
+    def get_policy(self, kind, name):
+        """Get a cached policy of a kind by name.
+
+        Args:
+            kind (str): definition, central, local or security
+            name (str): The name of the policy
+
+        Returns:
+            result (dict): The policy, or None if there is no such policy.
+
+        """
+
+        policies = self.get_data('SELECT data FROM policies WHERE kind = ? AND name = ?', (kind, name))
+        return policies[0] if policies else None
+
+    def export_policy_definition_list(self, definition_type='all'):
+        """Get the cached policy definitions, with object IDs converted to names.
+
+        Args:
+            definition_type (str): Policy definition type
+
+        Returns:
+            result (list): The policy definitions.
+
+        """
+
+        return self.get_policies('definition', definition_type)
+
+    def get_policy_definition_dict(self, definition_type, key_name='name', remove_key=False):
+        """Get a dictionary of the cached policy definitions.
+
+        Args:
+            definition_type (str): Policy definition type
+            key_name (string): The name of the attribute to use as the dictionary key
+            remove_key (boolean): Remove the search key from the element
+
+        Returns:
+            result (dict): The policy definitions.
+
+        """
+
+        return list_to_dict(self.export_policy_definition_list(definition_type), key_name, remove_key=remove_key)
+
+    def export_central_policy_list(self):
+        """Get the cached central policies, with object IDs converted to names.
+
+        Returns:
+            result (list): The central policies.
+
+        """
+
+        return self.get_policies('central')
+
+    def get_central_policy_dict(self, key_name='policyName', remove_key=False):
+        """Get a dictionary of the cached central policies.
+
+        Args:
+            key_name (string): The name of the attribute to use as the dictionary key
+            remove_key (boolean): Remove the search key from the element
+
+        Returns:
+            result (dict): The central policies.
+
+        """
+
+        return list_to_dict(self.get_policies('central'), key_name, remove_key=remove_key)
+
+    def export_local_policy_list(self):
+        """Get the cached local policies, with object IDs converted to names.
+
+        Returns:
+            result (list): The local policies.
+
+        """
+
+        return self.get_policies('local')
+
+    def get_local_policy_dict(self, key_name='policyName', remove_key=False):
+        """Get a dictionary of the cached local policies.
+
+        Args:
+            key_name (string): The name of the attribute to use as the dictionary key
+            remove_key (boolean): Remove the search key from the element
+
+        Returns:
+            result (dict): The local policies.
+
+        """
+
+        return list_to_dict(self.get_policies('local'), key_name, remove_key=remove_key)
+
+    def export_security_policy_list(self):
+        """Get the cached security policies, with object IDs converted to names.
+
+        Returns:
+            result (list): The security policies.
+
+        """
+
+        return self.get_policies('security')
+
+    def get_security_policy_dict(self, key_name='policyName', remove_key=False):
+        """Get a dictionary of the cached security policies.
+
+        Args:
+            key_name (string): The name of the attribute to use as the dictionary key
+            remove_key (boolean): Remove the search key from the element
+
+        Returns:
+            result (dict): The security policies.
+
+        """
+
+        return list_to_dict(self.get_policies('security'), key_name, remove_key=remove_key)
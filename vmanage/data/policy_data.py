@@ -8,6 +8,9 @@ from vmanage.api.local_policy import LocalPolicy
 from vmanage.api.central_policy import CentralPolicy
 from vmanage.api.device_templates import DeviceTemplates
 from vmanage.api.security_policy import SecurityPolicy
+from vmanage.api.tracing import get_tracer, traced
+from vmanage.data.policy_index import PolicyIndex
+from vmanage.utils import DEFAULT_WORKERS, map_concurrently
 
 
 class PolicyData(object):
@@ -33,9 +36,17 @@ class PolicyData(object):
         self.local_policy = LocalPolicy(self.session, self.host, self.port)
         self.central_policy = CentralPolicy(self.session, self.host, self.port)
         self.security_policy = SecurityPolicy(self.session, self.host, self.port)
+        self.policy_index = PolicyIndex.from_session(self.session, self.host, self.port)
 
     #pylint: disable=unused-argument
-    def import_policy_list_list(self, policy_list_list, push=False, update=False, check_mode=False, force=False):
+    def import_policy_list_list(self,
+                                policy_list_list,
+                                push=False,
+                                update=False,
+                                check_mode=False,
+                                force=False,
+                                workers=DEFAULT_WORKERS,
+                                templates_affected=None):
         """Import a list of policyies lists into vManage.  Object Names are translated to IDs.
 
         Args:
@@ -43,6 +54,9 @@ class PolicyData(object):
             push (bool): Whether to push a change out
             update (bool): Whether to update when the list exists
             check_mode (bool): Report what updates would happen, but don't update
+            workers (int): The number of lists to import concurrently
+            templates_affected (set): Add the IDs of the templates to push here, for the
+                caller to push once, instead of pushing them (default: push them)
 
         Returns:
             result (dict): All data associated with a response.
@@ -50,13 +64,20 @@ class PolicyData(object):
         """
 
         # Policy Lists
-        diff = []
         policy_list_updates = []
-        #pylint: disable=too-many-nested-blocks
+        # Fetch the existing lists of each type once
+        policy_list_dicts = {}
         for policy_list in policy_list_list:
-            policy_list_dict = self.policy_lists.get_policy_list_dict(policy_list['type'],
-                                                                      remove_key=False,
-                                                                      cache=False)
+            if policy_list['type'] not in policy_list_dicts:
+                policy_list_dicts[policy_list['type']] = self.policy_lists.get_policy_list_dict(policy_list['type'],
+                                                                                                remove_key=False,
+                                                                                                cache=False)
+
+        #pylint: disable=too-many-nested-blocks
+        def import_policy_list(policy_list):
+            object_update = None
+            template_ids = []
+            policy_list_dict = policy_list_dicts[policy_list['type']]
             if policy_list['name'] in policy_list_dict:
                 existing_list = policy_list_dict[policy_list['name']]
                 diff_ignore = set([
@@ -65,7 +86,7 @@ class PolicyData(object):
                 ])
                 diff = list(dictdiffer.diff(existing_list, policy_list, ignore=diff_ignore))
                 if diff:
-                    policy_list_updates.append({'name': policy_list['name'], 'diff': diff})
+                    object_update = {'name': policy_list['name'], 'diff': diff}
                     policy_list['listId'] = policy_list_dict[policy_list['name']]['listId']
                     # If description is not specified, try to get it from the existing information
                     if not policy_list['description']:
@@ -79,23 +100,44 @@ class PolicyData(object):
                             if 'error' in response['json']:
                                 raise RuntimeError(response['json']['error']['message'])
                             elif 'processId' in response['json']:
-                                if push:
-                                    vmanage_device_templates = DeviceTemplates(self.session, self.host)
-                                    # If told to push out the change, we need to reattach each template affected by the change
-                                    for template_id in response['json']['masterTemplatesAffected']:
-                                        obj = vmanage_device_templates.get_device_template_object(template_id)
-                                        vmanage_device_templates.reattach_device_template(
-                                            template_id, obj['configType'])
+                                template_ids = response['json']['masterTemplatesAffected']
                             else:
                                 raise RuntimeError("Did not get a process id when updating policy list")
             else:
                 diff = list(dictdiffer.diff({}, policy_list))
-                policy_list_updates.append({'name': policy_list['name'], 'diff': diff})
+                object_update = {'name': policy_list['name'], 'diff': diff}
                 if not check_mode:
-                    self.policy_lists.add_policy_list(policy_list)
+                    response = self.policy_lists.add_policy_list_response(policy_list)
+                    if response['json'] and 'listId' in response['json']:
+                        self.policy_index.add('list', dict(policy_list, listId=response['json']['listId']))
+            return object_update, template_ids
+
+        # Templates shared by several lists are pushed once, after all the lists are updated
+        template_ids = set()
+        for object_update, list_template_ids in map_concurrently(import_policy_list, policy_list_list, workers=workers):
+            if object_update:
+                policy_list_updates.append(object_update)
+            template_ids.update(list_template_ids)
+        if push:
+            self.push_templates(template_ids, templates_affected)
 
         return policy_list_updates
 
+    def push_templates(self, template_ids, templates_affected=None):
+        """Re-attach the device templates affected by an import, each once.
+
+        Args:
+            template_ids (set): IDs of the templates affected by the updates
+            templates_affected (set): Add the IDs here for the caller to push instead (default: push them now)
+
+        """
+
+        if templates_affected is not None:
+            templates_affected.update(template_ids)
+        elif template_ids:
+            vmanage_device_templates = DeviceTemplates(self.session, self.host, self.port)
+            vmanage_device_templates.reattach_device_templates(sorted(template_ids))
+
     def convert_list_name_to_id(self, name_list):
         """Convert policy list from names to IDs in object.
 
@@ -108,7 +150,7 @@ class PolicyData(object):
                 if key.endswith(
                         'List') and key != "signatureWhiteList" and key != "urlWhiteList" and key != "urlBlackList":
                     t = key[0:len(key) - 4]
-                    policy_list = self.policy_lists.get_policy_list_by_name(value, policy_list_type=t)
+                    policy_list = self.policy_index.get_by_name('list', value, t)
                     if policy_list:
                         name_list[key] = policy_list['listId']
                     else:
@@ -117,7 +159,7 @@ class PolicyData(object):
                     t = key[0:len(key) - 5]
                     new_list = []
                     for list_name in value:
-                        policy_list = self.policy_lists.get_policy_list_by_name(list_name, policy_list_type=t)
+                        policy_list = self.policy_index.get_by_name('list', list_name, t)
                         if policy_list:
                             list_id = policy_list['listId']
                             new_list.append(list_id)
@@ -127,15 +169,15 @@ class PolicyData(object):
                 elif key.endswith('Zone'):
                     if value == 'Self Zone':
                         name_list[key] = 'self'
-                    policy_list = self.policy_lists.get_policy_list_by_name(value, 'zone')
+                    policy_list = self.policy_index.get_by_name('list', value, 'zone')
                     if policy_list:
                         name_list[key] = policy_list['listId']
                     else:
                         raise RuntimeError(f"Could not find id for list {value}, type zone")
                 elif key == 'listName':
                     if 'listType' in name_list:
-                        policy_list = self.policy_lists.get_policy_list_by_name(name_list['listName'],
-                                                                                policy_list_type=name_list['listType'])
+                        policy_list = self.policy_index.get_by_name('list', name_list['listName'],
+                                                                    name_list['listType'])
                     else:
                         raise RuntimeError(f"Could not find type for list {name_list['listName']}")
                     if policy_list and 'listId' in policy_list:
@@ -147,8 +189,8 @@ class PolicyData(object):
                             f"Could not find id for list {name_list['listName']}, type {name_list['listType']}")
                 elif key == 'className':
                     if 'classType' in name_list:
-                        policy_list = self.policy_lists.get_policy_list_by_name(name_list['className'],
-                                                                                policy_list_type=name_list['classType'])
+                        policy_list = self.policy_index.get_by_name('list', name_list['className'],
+                                                                    name_list['classType'])
                     else:
                         raise RuntimeError(f"Could not find type for list {name_list['className']}")
                     if policy_list and 'listId' in policy_list:
@@ -179,7 +221,7 @@ class PolicyData(object):
                     val = value
                     if isinstance(value, list):
                         val = value[0]
-                    policy_list = self.policy_lists.get_policy_list_by_id(val, policy_list_type=t)
+                    policy_list = self.policy_index.get_by_id('list', val, t)
                     if policy_list:
                         id_list[key] = policy_list['name']
                     else:
@@ -188,7 +230,7 @@ class PolicyData(object):
                     t = key[0:len(key) - 5]
                     new_list = []
                     for list_id in value:
-                        policy_list = self.policy_lists.get_policy_list_by_id(list_id, policy_list_type=t)
+                        policy_list = self.policy_index.get_by_id('list', list_id, t)
                         if policy_list:
                             list_name = policy_list['name']
                             new_list.append(list_name)
@@ -199,13 +241,13 @@ class PolicyData(object):
                     if value == 'self':
                         id_list[key] = 'Self Zone'
                     else:
-                        policy_list = self.policy_lists.get_policy_list_by_id(value, 'zone')
+                        policy_list = self.policy_index.get_by_id('list', value, 'zone')
                         if policy_list:
                             id_list[key] = policy_list['name']
                         else:
                             raise RuntimeError(f"Could not find name for list {value}, type zone")
                 elif key == 'ref':
-                    policy_list = self.policy_lists.get_policy_list_by_id(id_list['ref'])
+                    policy_list = self.policy_index.get_by_id('list', id_list['ref'])
                     if policy_list:
                         id_list['listName'] = policy_list['name']
                         id_list['listType'] = policy_list['type']
@@ -213,7 +255,7 @@ class PolicyData(object):
                     else:
                         raise RuntimeError(f"Could not find name for list {id_list['ref']}")
                 elif key == 'class':
-                    policy_list = self.policy_lists.get_policy_list_by_id(id_list['class'])
+                    policy_list = self.policy_index.get_by_id('list', id_list['class'])
                     if policy_list:
                         id_list['className'] = policy_list['name']
                         id_list['classType'] = policy_list['type']
@@ -237,9 +279,9 @@ class PolicyData(object):
             if 'match' in sequence and 'entries' in sequence['match']:
                 for entry in sequence['match']['entries']:
                     if 'listName' in entry:
-                        policy_list_dict = self.policy_lists.get_policy_list_dict(entry['listType'])
-                        if entry['listName'] in policy_list_dict:
-                            entry['ref'] = policy_list_dict[entry['listName']]['listId']
+                        policy_list = self.policy_index.get_by_name('list', entry['listName'], entry['listType'])
+                        if policy_list:
+                            entry['ref'] = policy_list['listId']
                             entry.pop('listName')
                             entry.pop('listType')
                         else:
@@ -255,11 +297,11 @@ class PolicyData(object):
         """
         if 'assembly' in policy_definition and policy_definition['assembly']:
             for assembly_item in policy_definition['assembly']:
-                policy_definition_detail = self.policy_definitions.get_policy_definition(
-                    assembly_item['type'].lower(), assembly_item['definitionId'])
+                definition_name = self.policy_index.get_name('definition', assembly_item['definitionId'],
+                                                             assembly_item['type'])
                 definition_id = assembly_item.pop('definitionId')
-                if policy_definition_detail:
-                    assembly_item['definitionName'] = policy_definition_detail['name']
+                if definition_name:
+                    assembly_item['definitionName'] = definition_name
                 else:
                     raise RuntimeError("Cannot find policy definition for {0}".format(definition_id))
                 if 'entries' in assembly_item:
@@ -277,9 +319,9 @@ class PolicyData(object):
             for assembly_item in policy_definition['assembly']:
                 if assembly_item['definitionName']:
                     definition_name = assembly_item.pop('definitionName')
-                policy_definition_dict = self.policy_definitions.get_policy_definition_dict(assembly_item['type'])
-                if definition_name in policy_definition_dict:
-                    assembly_item['definitionId'] = policy_definition_dict[definition_name]['definitionId']
+                definition_id = self.policy_index.get_id('definition', definition_name, assembly_item['type'])
+                if definition_id:
+                    assembly_item['definitionId'] = definition_id
                 else:
                     raise RuntimeError("Cannot find policy definition {0}".format(definition_name))
                 if 'entries' in assembly_item:
@@ -325,11 +367,12 @@ class PolicyData(object):
 
         return converted_policy_definition
 
-    def export_policy_definition_list(self, definition_type='all'):
+    def export_policy_definition_list(self, definition_type='all', workers=DEFAULT_WORKERS):
         """Export Policy Definition Lists from vManage, translating IDs to Names.
 
         Args:
             definition_type (string): The type of Definition List to retreive
+            workers (int): The number of definitions to export concurrently
 
         Returns:
             response (list): A list of all definition lists currently
@@ -337,15 +380,43 @@ class PolicyData(object):
 
         """
 
-        policy_definition_list = self.policy_definitions.get_policy_definition_list(definition_type)
-        export_definition_list = []
-        for policy_definition in policy_definition_list:
+        return list(self.iter_policy_definition_export(definition_type, workers=workers))
+
+    def iter_policy_definition_export(self, definition_type='all', workers=DEFAULT_WORKERS):
+        """Export Policy Definitions from vManage one at a time, translating IDs to Names.
+
+        The definitions are fetched and converted on a pool of workers.
+
+        Args:
+            definition_type (string): The type of Definition List to retreive
+            workers (int): The number of definitions to export concurrently
+
+        Yields:
+            result (dict): Each converted policy definition, grouped by type.
+
+        """
+
+        if definition_type == 'all':
+            definition_types = self.policy_definitions.get_definition_types()
+        else:
+            definition_types = [definition_type]
+
+        def export_policy_definition(policy_definition):
             definition_detail = self.policy_definitions.get_policy_definition(policy_definition['type'],
                                                                               policy_definition['definitionId'])
-            converted_policy_definition = self.convert_policy_definition_to_name(definition_detail)
-            export_definition_list.append(converted_policy_definition)
-
-        return export_definition_list
+            if not definition_detail:
+                return None
+            return self.convert_policy_definition_to_name(definition_detail)
+
+        summary_lists = map_concurrently(self.policy_definitions.get_policy_definition_summary_list,
+                                         definition_types,
+                                         workers=workers)
+        policy_definition_list = [summary for summary_list in summary_lists for summary in summary_list]
+        for converted_policy_definition in map_concurrently(export_policy_definition,
+                                                            policy_definition_list,
+                                                            workers=workers):
+            if converted_policy_definition:
+                yield converted_policy_definition
 
     #pylint: disable=unused-argument
     def import_policy_definition_list(self,
@@ -353,7 +424,9 @@ class PolicyData(object):
                                       update=False,
                                       push=False,
                                       check_mode=False,
-                                      force=False):
+                                      force=False,
+                                      workers=DEFAULT_WORKERS,
+                                      templates_affected=None):
         """Import Policy Definitions into vManage.  Object names are converted to IDs.
 
         Returns:
@@ -362,10 +435,18 @@ class PolicyData(object):
 
         """
         policy_definition_updates = []
-        #pylint: disable=too-many-nested-blocks
+        # Fetch the existing definitions of each type once
+        policy_definition_dicts = {}
         for definition in policy_definition_list:
-            policy_definition_dict = self.policy_definitions.get_policy_definition_dict(definition['type'],
-                                                                                        remove_key=False)
+            if definition['type'] not in policy_definition_dicts:
+                policy_definition_dicts[definition['type']] = self.policy_definitions.get_policy_definition_dict(
+                    definition['type'], remove_key=False)
+
+        #pylint: disable=too-many-nested-blocks
+        def import_policy_definition(definition):
+            object_update = None
+            template_ids = []
+            policy_definition_dict = policy_definition_dicts[definition['type']]
             diff = []
             payload = {
                 "name": definition['name'],
@@ -389,7 +470,7 @@ class PolicyData(object):
                 diff = list(dictdiffer.diff(existing_definition, payload, ignore=diff_ignore))
                 if diff:
                     converted_definition = self.convert_policy_definition_to_id(definition)
-                    policy_definition_updates.append({'name': converted_definition['name'], 'diff': diff})
+                    object_update = {'name': converted_definition['name'], 'diff': diff}
                     if not check_mode and update:
                         response = self.policy_definitions.update_policy_definition(
                             converted_definition, policy_definition_dict[converted_definition['name']]['definitionId'])
@@ -400,22 +481,30 @@ class PolicyData(object):
                             if 'error' in response['json']:
                                 raise RuntimeError(response['json']['error']['message'])
                             elif 'processId' in response['json']:
-                                if push:
-                                    vmanage_device_templates = DeviceTemplates(self.session, self.host)
-                                    # If told to push out the change, we need to reattach each template affected by the change
-                                    for template_id in response['json']['masterTemplatesAffected']:
-                                        obj = vmanage_device_templates.get_device_template_object(template_id)
-                                        vmanage_device_templates.reattach_device_template(
-                                            template_id, obj['configType'])
+                                template_ids = response['json']['masterTemplatesAffected']
                             else:
                                 raise RuntimeError("Did not get a process id when updating policy definition")
             else:
                 # Policy definition does not exist
                 diff = list(dictdiffer.diff({}, payload))
-                policy_definition_updates.append({'name': definition['name'], 'diff': diff})
+                object_update = {'name': definition['name'], 'diff': diff}
                 converted_definition = self.convert_policy_definition_to_id(definition)
                 if not check_mode:
-                    self.policy_definitions.add_policy_definition(converted_definition)
+                    response = self.policy_definitions.add_policy_definition(converted_definition)
+                    if response['json'] and 'definitionId' in response['json']:
+                        self.policy_index.add('definition',
+                                              dict(converted_definition, definitionId=response['json']['definitionId']))
+            return object_update, template_ids
+
+        template_ids = set()
+        for object_update, definition_template_ids in map_concurrently(import_policy_definition,
+                                                                       policy_definition_list,
+                                                                       workers=workers):
+            if object_update:
+                policy_definition_updates.append(object_update)
+            template_ids.update(definition_template_ids)
+        if push:
+            self.push_templates(template_ids, templates_affected)
 
         return policy_definition_updates
 
@@ -468,7 +557,14 @@ class PolicyData(object):
         return export_policy_list
 
     #pylint: disable=unused-argument
-    def import_local_policy_list(self, local_policy_list, update=False, push=False, check_mode=False, force=False):
+    def import_local_policy_list(self,
+                                 local_policy_list,
+                                 update=False,
+                                 push=False,
+                                 check_mode=False,
+                                 force=False,
+                                 workers=DEFAULT_WORKERS,
+                                 templates_affected=None):
         """Import Local Policies into vManage.  Object names are converted to IDs.
 
         Returns:
@@ -477,10 +573,12 @@ class PolicyData(object):
 
         """
         local_policy_dict = self.local_policy.get_local_policy_dict(remove_key=False)
-        diff = []
         local_policy_updates = []
+
         #pylint: disable=too-many-nested-blocks
-        for local_policy in local_policy_list:
+        def import_local_policy(local_policy):
+            object_update = None
+            template_ids = []
             payload = {'policyName': local_policy['policyName']}
             payload['policyDescription'] = local_policy['policyDescription']
             payload['policyType'] = local_policy['policyType']
@@ -495,7 +593,7 @@ class PolicyData(object):
                 ])
                 diff = list(dictdiffer.diff(existing_policy, payload, ignore=diff_ignore))
                 if diff:
-                    local_policy_updates.append({'name': local_policy['policyName'], 'diff': diff})
+                    object_update = {'name': local_policy['policyName'], 'diff': diff}
                     if 'policyDefinition' in payload:
                         self.convert_definition_name_to_id(payload['policyDefinition'])
                     if not check_mode and update:
@@ -507,21 +605,29 @@ class PolicyData(object):
                             if 'error' in response['json']:
                                 raise RuntimeError(response['json']['error']['message'])
                             elif 'processId' in response['json']:
-                                if push:
-                                    vmanage_device_templates = DeviceTemplates(self.session, self.host)
-                                    # If told to push out the change, we need to reattach each template affected by the change
-                                    vmanage_device_templates.reattach_multi_device_templates(
-                                        response['json']['masterTemplatesAffected'])
+                                template_ids = response['json']['masterTemplatesAffected']
                             else:
                                 raise RuntimeError("Did not get a process id when updating local policy")
             else:
                 diff = list(dictdiffer.diff({}, payload['policyDefinition']))
-                local_policy_updates.append({'name': local_policy['policyName'], 'diff': diff})
+                object_update = {'name': local_policy['policyName'], 'diff': diff}
                 if 'policyDefinition' in payload:
                     # Convert list and definition names to template IDs
                     self.convert_definition_name_to_id(payload['policyDefinition'])
                 if not check_mode:
                     self.local_policy.add_local_policy(payload)
+            return object_update, template_ids
+
+        template_ids = set()
+        for object_update, policy_template_ids in map_concurrently(import_local_policy,
+                                                                   local_policy_list,
+                                                                   workers=workers):
+            if object_update:
+                local_policy_updates.append(object_update)
+            template_ids.update(policy_template_ids)
+        if push:
+            self.push_templates(template_ids, templates_affected)
+
         return local_policy_updates
 
     def export_central_policy_list(self):
@@ -542,7 +648,15 @@ class PolicyData(object):
         return export_policy_list
 
     #pylint: disable=unused-argument
-    def import_central_policy_list(self, central_policy_list, update=False, push=False, check_mode=False, force=False):
+    @traced
+    def import_central_policy_list(self,
+                                   central_policy_list,
+                                   update=False,
+                                   push=False,
+                                   check_mode=False,
+                                   force=False,
+                                   workers=DEFAULT_WORKERS,
+                                   templates_affected=None):
         """Import Central Policies into vManage.  Object names are converted to IDs.
 
         Returns:
@@ -550,27 +664,36 @@ class PolicyData(object):
                 in vManage.
 
         """
-        central_policy_dict = self.central_policy.get_central_policy_dict(remove_key=False)
-        diff = []
+        tracer = get_tracer(self.session)
+        with tracer.span('get-policies'):
+            central_policy_dict = self.central_policy.get_central_policy_dict(remove_key=False)
         central_policy_updates = []
+
+        def import_central_policy(central_policy):
+            with tracer.span('import-policy', attributes={'vmanage.policy.name': central_policy['policyName']}):
+                return import_one_central_policy(central_policy)
+
         #pylint: disable=too-many-nested-blocks
-        for central_policy in central_policy_list:
+        def import_one_central_policy(central_policy):
+            object_update = None
             payload = {'policyName': central_policy['policyName']}
             payload['policyDescription'] = central_policy['policyDescription']
             payload['policyType'] = central_policy['policyType']
             payload['policyDefinition'] = central_policy['policyDefinition']
             if payload['policyName'] in central_policy_dict:
                 # A policy by that name already exists
-                existing_policy = self.convert_policy_to_name(central_policy_dict[payload['policyName']])
-                diff_ignore = set([
-                    'lastUpdated', 'policyVersion', 'createdOn', 'references', 'isPolicyActivated', '@rid', 'policyId',
-                    'createdBy', 'lastUpdatedBy', 'lastUpdatedOn'
-                ])
-                diff = list(dictdiffer.diff(existing_policy, payload, ignore=diff_ignore))
+                with tracer.span('convert'):
+                    existing_policy = self.convert_policy_to_name(central_policy_dict[payload['policyName']])
+                    diff_ignore = set([
+                        'lastUpdated', 'policyVersion', 'createdOn', 'references', 'isPolicyActivated', '@rid',
+                        'policyId', 'createdBy', 'lastUpdatedBy', 'lastUpdatedOn'
+                    ])
+                    diff = list(dictdiffer.diff(existing_policy, payload, ignore=diff_ignore))
                 if diff:
-                    central_policy_updates.append({'name': central_policy['policyName'], 'diff': diff})
+                    object_update = {'name': central_policy['policyName'], 'diff': diff}
                     # Convert list and definition names to template IDs
-                    converted_payload = self.convert_policy_to_id(payload)
+                    with tracer.span('convert'):
+                        converted_payload = self.convert_policy_to_id(payload)
                     if not check_mode and update:
                         response = self.central_policy.update_central_policy(converted_payload,
                                                                              existing_policy['policyId'])
@@ -587,11 +710,20 @@ class PolicyData(object):
                                 raise RuntimeError("Did not get a deviceid when updating central policy")
             else:
                 diff = list(dictdiffer.diff({}, payload['policyDefinition']))
-                central_policy_updates.append({'name': central_policy['policyName'], 'diff': diff})
+                object_update = {'name': central_policy['policyName'], 'diff': diff}
                 if not check_mode:
                     # Convert list and definition names to template IDs
-                    converted_payload = self.convert_policy_to_id(payload)
+                    with tracer.span('convert'):
+                        converted_payload = self.convert_policy_to_id(payload)
                     self.central_policy.add_central_policy(converted_payload)
+            return object_update
+
+        with tracer.span('import-policies') as span:
+            for object_update in map_concurrently(import_central_policy, central_policy_list, workers=workers):
+                if object_update:
+                    central_policy_updates.append(object_update)
+            span.set_attribute('vmanage.updates', len(central_policy_updates))
+
         return central_policy_updates
 
     def export_security_policy_list(self):
@@ -611,12 +743,15 @@ class PolicyData(object):
 
         return export_policy_list
 
+    #pylint: disable=unused-argument
     def import_security_policy_list(self,
                                     security_policy_list,
                                     update=False,
                                     push=False,
                                     check_mode=False,
-                                    force=False):
+                                    force=False,
+                                    workers=DEFAULT_WORKERS,
+                                    templates_affected=None):
         """Import Security Policies into vManage.  Object names are converted to IDs.
 
         Returns:
@@ -625,9 +760,10 @@ class PolicyData(object):
 
         """
         security_policy_dict = self.security_policy.get_security_policy_dict(remove_key=False)
-        diff = []
         security_policy_updates = []
-        for security_policy in security_policy_list:
+
+        def import_security_policy(security_policy):
+            object_update = None
             payload = {'policyName': security_policy['policyName']}
             payload['policyDescription'] = security_policy['policyDescription']
             payload['policyType'] = security_policy['policyType']
@@ -642,16 +778,22 @@ class PolicyData(object):
                 ])
                 diff = list(dictdiffer.diff(existing_policy, payload, ignore=diff_ignore))
                 if diff:
-                    security_policy_updates.append({'name': security_policy['policyName'], 'diff': diff})
+                    object_update = {'name': security_policy['policyName'], 'diff': diff}
                     # Convert list and definition names to template IDs
                     converted_payload = self.convert_policy_to_id(payload)
                     if not check_mode and update:
                         self.security_policy.update_security_policy(converted_payload, existing_policy['policyId'])
             else:
                 diff = list(dictdiffer.diff({}, payload['policyDefinition']))
-                security_policy_updates.append({'name': security_policy['policyName'], 'diff': diff})
+                object_update = {'name': security_policy['policyName'], 'diff': diff}
                 if not check_mode:
                     # Convert list and definition names to template IDs
                     converted_payload = self.convert_policy_to_id(payload)
                     self.security_policy.add_security_policy(converted_payload)
+            return object_update
+
+        for object_update in map_concurrently(import_security_policy, security_policy_list, workers=workers):
+            if object_update:
+                security_policy_updates.append(object_update)
+
         return security_policy_updates
@@ -0,0 +1,248 @@
+"""Cisco vManage Policy Object Index.
+"""
+
+import threading
+import time
+from vmanage.api.http_methods import HttpMethods
+from vmanage.api.transport import Transport
+from vmanage.data.parse_methods import ParseMethods
+
+# Seconds before a lookup that misses fetches a catalog again, to pick up
+# objects created outside of the session
+DEFAULT_RELOAD_INTERVAL = 30
+
+# The catalogs that make up the index.  Definitions can only be listed one
+# type at a time, so they are loaded per type as they are needed.
+POLICY_INDEX_KINDS = {
+    'list': {
+        'api': 'template/policy/list',
+        'family': 'template/policy/list',
+        'id_key': 'listId',
+        'name_key': 'name',
+        'typed': False,
+    },
+    'definition': {
+        'api': 'template/policy/definition',
+        'family': 'template/policy/definition',
+        'id_key': 'definitionId',
+        'name_key': 'name',
+        'typed': True,
+    },
+    'vedge': {
+        'api': 'template/policy/vedge',
+        'family': 'template/policy/vedge',
+        'id_key': 'policyId',
+        'name_key': 'policyName',
+        'typed': False,
+    },
+    'vsmart': {
+        'api': 'template/policy/vsmart',
+        'family': 'template/policy/vsmart',
+        'id_key': 'policyId',
+        'name_key': 'policyName',
+        'typed': False,
+    },
+    'security': {
+        'api': 'template/policy/security',
+        'family': 'template/policy/security',
+        'id_key': 'policyId',
+        'name_key': 'policyName',
+        'typed': False,
+    },
+}
+
+
+class PolicyIndex(object):
+    """Bidirectional name and ID index over policy lists, definitions and policies.
+
+    The index is shared by everything using the same session.  Each catalog
+    is fetched once, the first time it is needed, and lookups after that are
+    dictionary hits.  Objects created through PolicyData are added as they
+    are created, and any other write to a catalog through the session makes
+    that catalog reload on its next lookup.  A lookup that misses fetches
+    the catalog again, at most once per reload interval.
+
+    """
+    def __init__(self, session, host, port=443, reload_interval=DEFAULT_RELOAD_INTERVAL):
+        """Initialize Policy Index object with session parameters.
+
+        Args:
+            session (obj): Requests Session object
+            host (str): hostname or IP address of vManage
+            port (int): default HTTPS 443
+            reload_interval (float): Seconds before a miss fetches a catalog again
+
+        """
+
+        self.session = session
+        self.host = host
+        self.port = port
+        self.base_url = f'https://{self.host}:{self.port}/dataservice/'
+        self.reload_interval = reload_interval
+        self.cache = Transport.from_session(self.session).cache
+        self.lock = threading.RLock()
+        self.by_id = {}
+        self.by_name = {}
+        self.loaded = {}
+        self.refreshed = {}
+        self.synced = {}
+        for kind in POLICY_INDEX_KINDS:
+            self._reset(kind)
+        self.session.policy_index = self
+
+    @classmethod
+    def from_session(cls, session, host, port=443):
+        """Get the index attached to a session, creating one if needed.
+
+        Args:
+            session (obj): Requests Session object
+            host (str): hostname or IP address of vManage
+            port (int): default HTTPS 443
+
+        Returns:
+            index (PolicyIndex): The index shared by the session.
+
+        """
+
+        index = getattr(session, 'policy_index', None)
+        if index is None or index.host != host or index.port != port:
+            index = cls(session, host, port)
+        return index
+
+    @staticmethod
+    def _get_scope(kind, item_type):
+        if POLICY_INDEX_KINDS[kind]['typed'] or kind == 'list':
+            return item_type.lower() if item_type and item_type != 'all' else None
+        return None
+
+    def _reset(self, kind):
+        self.by_id[kind] = {}
+        self.by_name[kind] = {}
+        self.loaded[kind] = set()
+        self.refreshed[kind] = {}
+        self.synced[kind] = self.cache.get_write_count(POLICY_INDEX_KINDS[kind]['family'])
+
+    def _add(self, kind, item, item_type=None):
+        id_key = POLICY_INDEX_KINDS[kind]['id_key']
+        name_key = POLICY_INDEX_KINDS[kind]['name_key']
+        self.by_id[kind][item[id_key]] = item
+        self.by_name[kind][(None, item[name_key])] = item
+        if kind == 'list':
+            self.by_name[kind][(item['type'].lower(), item[name_key])] = item
+        elif POLICY_INDEX_KINDS[kind]['typed']:
+            self.by_name[kind][(self._get_scope(kind, item_type or item['type']), item[name_key])] = item
+
+    def _load(self, kind, item_type=None, cache=True):
+        """Fetch a catalog, or one type of a typed catalog, into the index."""
+
+        load_scope = self._get_scope(kind, item_type) if POLICY_INDEX_KINDS[kind]['typed'] else None
+        api = POLICY_INDEX_KINDS[kind]['api']
+        if load_scope:
+            # The only definition type whose URL is case sensitive
+            api = f"{api}/{item_type if item_type == 'advancedMalwareProtection' else load_scope}"
+        response = HttpMethods(self.session, self.base_url + api).request('GET', cache=cache)
+        for item in ParseMethods.parse_data(response):
+            self._add(kind, item, item_type)
+        self.loaded[kind].add(load_scope)
+        return load_scope
+
+    def _lookup(self, kind, table, key, item_type=None):
+        with self.lock:
+            if self.synced[kind] != self.cache.get_write_count(POLICY_INDEX_KINDS[kind]['family']):
+                self._reset(kind)
+            if POLICY_INDEX_KINDS[kind]['typed'] and not self._get_scope(kind, item_type):
+                raise ValueError(f"A type is required to look up a policy {kind}")
+            load_scope = self._get_scope(kind, item_type) if POLICY_INDEX_KINDS[kind]['typed'] else None
+            if load_scope not in self.loaded[kind]:
+                self._load(kind, item_type)
+
+            scope = self._get_scope(kind, item_type)
+            item = table[kind].get(key if table is self.by_id else (scope, key))
+            refreshed_at = self.refreshed[kind].get(load_scope)
+            if item is None and (refreshed_at is None or time.monotonic() - refreshed_at >= self.reload_interval):
+                # The object may have been created outside of this session, so reload
+                self.refreshed[kind][self._load(kind, item_type, cache=False)] = time.monotonic()
+                item = table[kind].get(key if table is self.by_id else (scope, key))
+            return item
+
+    def get_by_name(self, kind, name, item_type=None):
+        """Look up an object by name.
+
+        Args:
+            kind (str): list, definition, vedge, vsmart or security
+            name (str): The object name
+            item_type (str): The list or definition type (required for definitions)
+
+        Returns:
+            result (dict): The catalog entry for the object, or None if not found.
+
+        """
+
+        return self._lookup(kind, self.by_name, name, item_type)
+
+    def get_by_id(self, kind, item_id, item_type=None):
+        """Look up an object by ID.
+
+        Args:
+            kind (str): list, definition, vedge, vsmart or security
+            item_id (str): The object ID
+            item_type (str): The definition type (required for definitions)
+
+        Returns:
+            result (dict): The catalog entry for the object, or None if not found.
+
+        """
+
+        return self._lookup(kind, self.by_id, item_id, item_type)
+
+    def get_id(self, kind, name, item_type=None):
+        """Get the ID of an object from its name.
+
+        Returns:
+            result (str): The object ID, or None if not found.
+
+        """
+
+        item = self.get_by_name(kind, name, item_type)
+        return item[POLICY_INDEX_KINDS[kind]['id_key']] if item else None
+
+    def get_name(self, kind, item_id, item_type=None):
+        """Get the name of an object from its ID.
+
+        Returns:
+            result (str): The object name, or None if not found.
+
+        """
+
+        item = self.get_by_id(kind, item_id, item_type)
+        return item[POLICY_INDEX_KINDS[kind]['name_key']] if item else None
+
+    def add(self, kind, item, item_type=None):
+        """Record an object that was just created through this session.
+
+        Args:
+            kind (str): list, definition, vedge, vsmart or security
+            item (dict): The object, including the ID assigned by vManage
+            item_type (str): The definition type
+
+        """
+
+        with self.lock:
+            write_count = self.cache.get_write_count(POLICY_INDEX_KINDS[kind]['family'])
+            # The write that created the object does not make the rest of the index stale, but any
+            # other write since the last sync does, so leave the index to be reloaded in that case.
+            if self.synced[kind] in (write_count, write_count - 1):
+                self._add(kind, item, item_type)
+                self.synced[kind] = write_count
+
+    def invalidate(self, kind=None):
+        """Drop the index so that it is reloaded on the next lookup.
+
+        Args:
+            kind (str): Catalog to drop (default: all catalogs)
+
+        """
+
+        with self.lock:
+            for name in [kind] if kind else list(POLICY_INDEX_KINDS):
+                self._reset(name)
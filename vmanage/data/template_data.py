@@ -3,11 +3,12 @@
 
 import dictdiffer
 from vmanage.api.feature_templates import FeatureTemplates
-from vmanage.api.device_templates import DeviceTemplates
-from vmanage.api.utilities import Utilities
-from vmanage.api.device import Device
-from vmanage.api.local_policy import LocalPolicy
-from vmanage.api.security_policy import SecurityPolicy
+from vmanage.api.device_templates import DeviceTemplates, DEFAULT_BATCHES_IN_FLIGHT
+from vmanage.api.action_tracker import ActionTracker
+from vmanage.api.tracing import get_tracer, traced
+from vmanage.data.device_index import DeviceIndex
+from vmanage.data.policy_index import PolicyIndex
+from vmanage.utils import DEFAULT_WORKERS, map_concurrently, run_concurrently
 
 
 class TemplateData(object):
@@ -31,35 +32,37 @@ class TemplateData(object):
         self.base_url = f'https://{self.host}:{self.port}/dataservice/'
         self.device_templates = DeviceTemplates(self.session, self.host, self.port)
         self.feature_templates = FeatureTemplates(self.session, self.host, self.port)
+        self.policy_index = PolicyIndex.from_session(self.session, self.host, self.port)
 
-    def convert_device_template_to_name(self, device_template):
+    def convert_device_template_to_name(self, device_template, feature_template_dict=None):
         """Convert a device template objects from IDs to Names.
 
         Args:
             device_template (dict): Device Template
+            feature_template_dict (dict): Feature templates keyed by ID.  Pass this in when
+                converting many templates so that the catalog is only fetched once.
 
         Returns:
             result (dict): Converted Device Template.
         """
 
-        feature_template_dict = self.feature_templates.get_feature_template_dict(factory_default=True,
-                                                                                 key_name='templateId')
+        if feature_template_dict is None:
+            feature_template_dict = self.feature_templates.get_feature_template_dict(factory_default=True,
+                                                                                     key_name='templateId')
 
         if 'policyId' in device_template and device_template['policyId']:
             policy_id = device_template['policyId']
-            vmanage_local_policy = LocalPolicy(self.session, self.host, self.port)
-            local_policy_dict = vmanage_local_policy.get_local_policy_dict(key_name='policyId')
-            if policy_id in list(local_policy_dict.keys()):
-                device_template['policyName'] = local_policy_dict[policy_id]['policyName']
+            policy_name = self.policy_index.get_name('vedge', policy_id)
+            if policy_name:
+                device_template['policyName'] = policy_name
             else:
                 raise RuntimeError(f"Could not find local policy {policy_id}")
 
         if 'securityPolicyId' in device_template and device_template['securityPolicyId']:
             security_policy_id = device_template['securityPolicyId']
-            vmanage_security_policy = SecurityPolicy(self.session, self.host, self.port)
-            security_policy_dict = vmanage_security_policy.get_security_policy_dict(key_name='policyId')
-            if security_policy_id in list(security_policy_dict.keys()):
-                device_template['securityPolicyName'] = security_policy_dict[security_policy_id]['policyName']
+            security_policy_name = self.policy_index.get_name('security', security_policy_id)
+            if security_policy_name:
+                device_template['securityPolicyName'] = security_policy_name
             else:
                 raise RuntimeError(f"Could not find security policy {security_policy_id}")
 
@@ -78,21 +81,22 @@ class TemplateData(object):
 
         return device_template
 
-    def convert_device_template_to_id(self, device_template):
+    def convert_device_template_to_id(self, device_template, feature_template_dict=None):
         """Convert a device template objects from Names to IDs.
 
         Args:
             device_template (dict): Device Template
+            feature_template_dict (dict): Feature templates keyed by name.  Pass this in when
+                converting many templates so that the catalog is only fetched once.
 
         Returns:
             result (dict): Converted Device Template.
         """
 
         if 'policyName' in device_template:
-            vmanage_local_policy = LocalPolicy(self.session, self.host, self.port)
-            local_policy_dict = vmanage_local_policy.get_local_policy_dict(key_name='policyName')
-            if device_template['policyName'] in local_policy_dict:
-                device_template['policyId'] = local_policy_dict[device_template['policyName']]['policyId']
+            policy_id = self.policy_index.get_id('vedge', device_template['policyName'])
+            if policy_id:
+                device_template['policyId'] = policy_id
                 device_template.pop('policyName')
             else:
                 raise RuntimeError(f"Could not find local policy {device_template['policyName']}")
@@ -100,11 +104,9 @@ class TemplateData(object):
             device_template['policyId'] = ''
 
         if 'securityPolicyName' in device_template:
-            vmanage_security_policy = SecurityPolicy(self.session, self.host, self.port)
-            security_policy_dict = vmanage_security_policy.get_security_policy_dict(key_name='policyName')
-            if device_template['securityPolicyName'] in security_policy_dict:
-                device_template['securityPolicyId'] = security_policy_dict[
-                    device_template['securityPolicyName']]['policyId']
+            security_policy_id = self.policy_index.get_id('security', device_template['securityPolicyName'])
+            if security_policy_id:
+                device_template['securityPolicyId'] = security_policy_id
                 device_template.pop('securityPolicyName')
             else:
                 raise RuntimeError(f"Could not find security policy {device_template['securityPolicyName']}")
@@ -112,22 +114,25 @@ class TemplateData(object):
             device_template['securityPolicyId'] = ''
 
         if 'generalTemplates' in device_template:
-            device_template['generalTemplates'] = self.generalTemplates_to_id(device_template['generalTemplates'])
+            device_template['generalTemplates'] = self.generalTemplates_to_id(
+                device_template['generalTemplates'], feature_template_dict=feature_template_dict)
 
         return device_template
 
-    def generalTemplates_to_id(self, generalTemplates):
+    def generalTemplates_to_id(self, generalTemplates, feature_template_dict=None):
         """Convert a generalTemplates object from Names to IDs.
 
         Args:
             generalTemplates (dict): generalTemplates object
+            feature_template_dict (dict): Feature templates keyed by name
 
         Returns:
             result (dict): Converted generalTemplates object.
         """
 
         converted_generalTemplates = []
-        feature_template_dict = self.feature_templates.get_feature_template_dict(factory_default=True)
+        if feature_template_dict is None:
+            feature_template_dict = self.feature_templates.get_feature_template_dict(factory_default=True)
         for template in generalTemplates:
             if 'templateName' not in template:
                 self.result['generalTemplates'] = generalTemplates
@@ -146,7 +151,12 @@ class TemplateData(object):
 
         return converted_generalTemplates
 
-    def import_feature_template_list(self, feature_template_list, push=False, check_mode=False, update=False):
+    def import_feature_template_list(self,
+                                     feature_template_list,
+                                     push=False,
+                                     check_mode=False,
+                                     update=False,
+                                     workers=DEFAULT_WORKERS):
         """Import a list of feature templates from list to vManage.  Object Names are converted to IDs.
 
 
@@ -154,6 +164,7 @@ class TemplateData(object):
             feature_template_list (list): List of feature templates
             check_mode (bool): Only check to see if changes would be made
             update (bool): Update the template if it exists
+            workers (int): The number of templates to import concurrently
 
         Returns:
             result (list): Returns the diffs of the updates.
@@ -162,8 +173,11 @@ class TemplateData(object):
         # Process the feature templates
         feature_template_updates = []
         feature_template_dict = self.feature_templates.get_feature_template_dict(factory_default=True, remove_key=False)
+
         #pylint: disable=too-many-nested-blocks
-        for feature_template in feature_template_list:
+        def import_feature_template(feature_template):
+            object_update = None
+            template_ids = []
             if 'templateId' in feature_template:
                 feature_template.pop('templateId')
             if feature_template['templateName'] in feature_template_dict:
@@ -172,7 +186,7 @@ class TemplateData(object):
                 diff = list(
                     dictdiffer.diff(existing_template['templateDefinition'], feature_template['templateDefinition']))
                 if len(diff):
-                    feature_template_updates.append({'name': feature_template['templateName'], 'diff': diff})
+                    object_update = {'name': feature_template['templateName'], 'diff': diff}
                     if not check_mode and update:
                         response = self.feature_templates.update_feature_template(feature_template)
 
@@ -182,54 +196,90 @@ class TemplateData(object):
                             if 'error' in response['json']:
                                 raise RuntimeError(response['json']['error']['message'])
                             elif 'processId' in response['json']:
-                                if push:
-                                    vmanage_device_templates = DeviceTemplates(self.session, self.host)
-                                    # If told to push out the change, we need to reattach each template affected by the change
-                                    vmanage_device_templates.reattach_multi_device_templates(
-                                        response['json']['masterTemplatesAffected'])
+                                template_ids = response['json']['masterTemplatesAffected']
                             else:
                                 raise RuntimeError("Did not get a process id when updating policy list")
             else:
                 diff = list(dictdiffer.diff({}, feature_template['templateDefinition']))
-                feature_template_updates.append({'name': feature_template['templateName'], 'diff': diff})
+                object_update = {'name': feature_template['templateName'], 'diff': diff}
                 if not check_mode:
                     self.feature_templates.add_feature_template(feature_template)
+            return object_update, template_ids
+
+        # Device templates shared by several feature templates are pushed once, after all of them are updated
+        template_ids = set()
+        for object_update, feature_template_ids in map_concurrently(import_feature_template,
+                                                                    feature_template_list,
+                                                                    workers=workers):
+            if object_update:
+                feature_template_updates.append(object_update)
+            template_ids.update(feature_template_ids)
+        if push and template_ids:
+            self.device_templates.reattach_device_templates(sorted(template_ids))
 
         return feature_template_updates
 
-    def export_device_template_list(self, factory_default=False, name_list=None):
+    def export_device_template_list(self, factory_default=False, name_list=None, workers=DEFAULT_WORKERS):
         """Export device templates from vManage into a list.  Object IDs are converted to Names.
 
         Args:
             factory_default (bool): Include factory default
             name_list (list of strings): A list of template names to retreive.
+            workers (int): The number of templates to export concurrently
 
         Returns:
             result (dict): All data associated with a response.
         """
+
+        return list(
+            self.iter_device_template_export(factory_default=factory_default, name_list=name_list, workers=workers))
+
+    def iter_device_template_export(self, factory_default=False, name_list=None, workers=DEFAULT_WORKERS):
+        """Export device templates from vManage one at a time.  Object IDs are converted to Names.
+
+        The catalogs needed for the conversion are fetched once up front, then
+        the templates are fetched and converted on a pool of workers.
+
+        Args:
+            factory_default (bool): Include factory default
+            name_list (list of strings): A list of template names to retreive.
+            workers (int): The number of templates to export concurrently
+
+        Yields:
+            result (dict): Each converted device template, in catalog order.
+        """
         if name_list is None:
             name_list = []
         device_template_list = self.device_templates.get_device_templates()
-        return_list = []
+        feature_template_dict = self.feature_templates.get_feature_template_dict(factory_default=True,
+                                                                                 key_name='templateId')
 
-        #pylint: disable=too-many-nested-blocks
-        for device_template in device_template_list:
-            # If there is a list of template name, only return the ones asked for.
-            # Otherwise, return them all
-            if name_list and device_template['templateName'] not in name_list:
-                continue
+        def export_device_template(device_template):
             obj = self.device_templates.get_device_template_object(device_template['templateId'])
-            if obj:
-                if not factory_default and obj['factoryDefault']:
-                    continue
-                obj['templateId'] = device_template['templateId']
-                obj['attached_devices'] = self.device_templates.get_template_attachments(device_template['templateId'])
-                obj['input'] = self.device_templates.get_template_input(device_template['templateId'])
-                converted_device_template = self.convert_device_template_to_name(obj)
-                return_list.append(converted_device_template)
-        return return_list
-
-    def import_device_template_list(self, device_template_list, check_mode=False, update=False, push=False):
+            if not obj or (not factory_default and obj['factoryDefault']):
+                return None
+            obj['templateId'] = device_template['templateId']
+            obj['attached_devices'] = self.device_templates.get_template_attachments(device_template['templateId'])
+            obj['input'] = self.device_templates.get_template_input(device_template['templateId'])
+            return self.convert_device_template_to_name(obj, feature_template_dict=feature_template_dict)
+
+        # If there is a list of template name, only return the ones asked for.
+        # Otherwise, return them all
+        selected_list = [
+            device_template for device_template in device_template_list
+            if not name_list or device_template['templateName'] in name_list
+        ]
+        for converted_device_template in map_concurrently(export_device_template, selected_list, workers=workers):
+            if converted_device_template:
+                yield converted_device_template
+
+    @traced
+    def import_device_template_list(self,
+                                    device_template_list,
+                                    check_mode=False,
+                                    update=False,
+                                    push=False,
+                                    workers=DEFAULT_WORKERS):
         """Import a list of device templates from list to vManage.  Object Names are converted to IDs.
 
 
@@ -237,35 +287,52 @@ class TemplateData(object):
             device_template_list (list): List of device templates
             check_mode (bool): Only check to see if changes would be made
             update (bool): Update the template if it exists
+            workers (int): The number of templates to import concurrently
 
         Returns:
             result (list): Returns the diffs of the updates.
 
         """
         device_template_updates = []
-        device_template_dict = self.device_templates.get_device_template_dict()
-        diff = []
+        tracer = get_tracer(self.session)
+        with tracer.span('get-templates'):
+            device_template_dict = self.device_templates.get_device_template_dict()
+            # Feature template names and IDs don't change while device templates are added, so fetch them once
+            feature_template_dict = self.feature_templates.get_feature_template_dict(factory_default=True,
+                                                                                     remove_key=False)
+            feature_template_id_dict = {template['templateId']: template for template in feature_template_dict.values()}
+
+        def import_device_template(device_template):
+            with tracer.span('import-template', attributes={'vmanage.template.name': device_template['templateName']}):
+                return import_one_device_template(device_template)
+
         #pylint: disable=too-many-nested-blocks
-        for device_template in device_template_list:
+        def import_one_device_template(device_template):
+            object_update = None
+            template_id = None
             if 'policyId' in device_template:
                 device_template.pop('policyId')
             if 'securityPolicyId' in device_template:
                 device_template.pop('securityPolicyId')
             if device_template['templateName'] in device_template_dict:
-                existing_template = self.convert_device_template_to_name(
-                    device_template_dict[device_template['templateName']])
-                device_template['templateId'] = existing_template['templateId']
-                # Just check the things that we care about changing.
-                diff_ignore = set([
-                    'templateId', 'policyId', 'connectionPreferenceRequired', 'connectionPreference', 'templateName',
-                    'attached_devices', 'input', 'securityPolicyId'
-                ])
-                diff = list(dictdiffer.diff(existing_template, device_template, ignore=diff_ignore))
+                with tracer.span('convert'):
+                    existing_template = self.convert_device_template_to_name(
+                        device_template_dict[device_template['templateName']],
+                        feature_template_dict=feature_template_id_dict)
+                    device_template['templateId'] = existing_template['templateId']
+                    # Just check the things that we care about changing.
+                    diff_ignore = set([
+                        'templateId', 'policyId', 'connectionPreferenceRequired', 'connectionPreference',
+                        'templateName', 'attached_devices', 'input', 'securityPolicyId'
+                    ])
+                    diff = list(dictdiffer.diff(existing_template, device_template, ignore=diff_ignore))
                 if len(diff):
-                    device_template_updates.append({'name': device_template['templateName'], 'diff': diff})
+                    object_update = {'name': device_template['templateName'], 'diff': diff}
                     if not check_mode and update:
                         if not check_mode:
-                            converted_device_template = self.convert_device_template_to_id(device_template)
+                            with tracer.span('convert'):
+                                converted_device_template = self.convert_device_template_to_id(
+                                    device_template, feature_template_dict=feature_template_dict)
                             response = self.device_templates.update_device_template(converted_device_template)
 
                         if response['json']:
@@ -274,12 +341,7 @@ class TemplateData(object):
                             if 'error' in response['json']:
                                 raise RuntimeError(response['json']['error']['message'])
                             elif 'processId' in response['json']['data']:
-                                if push:
-                                    # If told to push out the change, we need to reattach each template affected by the change
-                                    obj = self.device_templates.get_device_template_object(
-                                        converted_device_template['templateId'])
-                                    self.device_templates.reattach_device_template(
-                                        converted_device_template['templateId'], obj['configType'])
+                                template_id = converted_device_template['templateId']
                             else:
                                 raise RuntimeError("Did not get a process id when updating policy list")
             else:
@@ -289,14 +351,36 @@ class TemplateData(object):
                     diff = list(dictdiffer.diff({}, device_template['templateConfiguration']))
                 else:
                     raise RuntimeError("Template {0} is of unknown type".format(device_template['templateName']))
-                device_template_updates.append({'name': device_template['templateName'], 'diff': diff})
+                object_update = {'name': device_template['templateName'], 'diff': diff}
                 if not check_mode:
-                    converted_device_template = self.convert_device_template_to_id(device_template)
+                    with tracer.span('convert'):
+                        converted_device_template = self.convert_device_template_to_id(
+                            device_template, feature_template_dict=feature_template_dict)
                     self.device_templates.add_device_template(converted_device_template)
+            return object_update, template_id
+
+        template_ids = []
+        with tracer.span('import-templates') as span:
+            for object_update, template_id in map_concurrently(import_device_template,
+                                                               device_template_list,
+                                                               workers=workers):
+                if object_update:
+                    device_template_updates.append(object_update)
+                if template_id:
+                    template_ids.append(template_id)
+            span.set_attribute('vmanage.updates', len(device_template_updates))
+        if push and template_ids:
+            self.device_templates.reattach_device_templates(template_ids)
 
         return device_template_updates
 
-    def import_attachment_list(self, attachment_list, check_mode=False, update=False):
+    @traced
+    def import_attachment_list(self,
+                               attachment_list,
+                               check_mode=False,
+                               update=False,
+                               batch_size=None,
+                               batches_in_flight=DEFAULT_BATCHES_IN_FLIGHT):
         """Import a list of device attachments to vManage.
 
 
@@ -304,6 +388,8 @@ class TemplateData(object):
             attachment_list (list): List of attachments
             check_mode (bool): Only check to see if changes would be made
             update (bool): Update the template if it exists
+            batch_size (int): Attach the devices in batches of this many (default: one call per template)
+            batches_in_flight (int): The most batches to leave running on vManage at once
 
         Returns:
             result (list): Returns the diffs of the updates.
@@ -311,66 +397,77 @@ class TemplateData(object):
         """
         attachment_updates = {}
         attachment_failures = {}
-        action_id_list = []
-        device_template_dict = self.device_templates.get_device_template_dict()
-        vmanage_device = Device(self.session, self.host, self.port)
+        tracer = get_tracer(self.session)
+        action_tracker = ActionTracker(self.session, self.host, self.port)
+        template_attachment_map = dict()
         template_device_map = dict()
-        for attachment in attachment_list:
-            if attachment['template'] in device_template_dict:
+
+        # Resolve the UUID of every device and group the attachments by template
+        with tracer.span('resolve-devices', attributes={'vmanage.attachments': len(attachment_list)}):
+            device_template_dict = self.device_templates.get_device_template_dict()
+            device_index = DeviceIndex.from_session(self.session, self.host, self.port)
+            for attachment in attachment_list:
+                if attachment['template'] not in device_template_dict:
+                    raise RuntimeError(f"No template named {attachment['template']}")
                 if attachment['device_type'] == 'vedge':
                     # The UUID is fixes from the serial file/upload
                     device_uuid = attachment['uuid']
                 else:
                     # If this is not a vedge, we need to get the UUID from the vmanage since
-                    # it is generated by that vmanage
-                    device_status = vmanage_device.get_device_status(attachment['host_name'], key='host-name')
+                    # it is generated by that vmanage.
+                    device_status = device_index.get_device_status(attachment['host_name'], key='host-name')
                     if device_status:
                         device_uuid = device_status['uuid']
                     else:
                         raise RuntimeError(f"Cannot find UUID for {attachment['host_name']}")
-
                 template_id = device_template_dict[attachment['template']]['templateId']
-                config_type = device_template_dict[attachment['template']]['configType']
-                attached_uuid_list = self.device_templates.get_attachments(template_id, key='uuid')
-                if device_uuid in attached_uuid_list:
-                    # The device is already attached to the template.  We need to see if any of
-                    # the input changed, so we make an API call to get the input on last attach
-                    existing_template_input = self.device_templates.get_template_input(
-                        device_template_dict[attachment['template']]['templateId'], [device_uuid])
-                    current_variables = existing_template_input['data'][0]
-                    changed = False
-                    for property_name in attachment['variables']:
-                        # Check to see if any of the passed in varibles have changed from what is
-                        # already on the attachment.  We are are not checking to see if the
-                        # correct variables are here.  That will be done on attachment.
-                        if ((property_name in current_variables) and
-                            (str(attachment['variables'][property_name]) != str(current_variables[property_name]))):
-                            changed = True
-                    if changed:
-                        if not check_mode and update:
-                            template_device_map.setdefault(template_id, []).append({
-                                "config_type": config_type,
-                                "variables": attachment['variables'],
-                                "host_name": attachment['host_name'],
-                                "site_id": attachment['site_id'],
-                                "system_ip": attachment['system_ip'],
-                                "device_uuid": device_uuid
-                            })
-
-                else:
-                    if not check_mode:
-                        template_device_map.setdefault(template_id, []).append({
-                            "config_type": config_type,
-                            "variables": attachment['variables'],
-                            "host_name": attachment['host_name'],
-                            "site_id": attachment['site_id'],
-                            "system_ip": attachment['system_ip'],
-                            "device_uuid": device_uuid
-                        })
-
-            else:
-                raise RuntimeError(f"No template named {attachment['template']}")
+                template_attachment_map.setdefault(template_id, []).append((device_uuid, attachment))
+
+        # Get the existing attachments and their input with one set of calls per template
+        current_input_map = dict()
+        template_uuid_lists = {
+            template_id: [device_uuid for device_uuid, _ in template_attachments]
+            for template_id, template_attachments in template_attachment_map.items()
+        }
+        with tracer.span('get-attached-input', attributes={'vmanage.templates': len(template_uuid_lists)}):
+            for template_id, result in run_concurrently(
+                    lambda template_id: self.get_attached_input(template_id, template_uuid_lists[template_id]),
+                    list(template_uuid_lists)):
+                if isinstance(result, Exception):
+                    raise result
+                current_input_map[template_id] = result
+
+        with tracer.span('compare'):
+            for template_id, template_attachments in template_attachment_map.items():
+                config_type = device_template_dict[template_attachments[0][1]['template']]['configType']
+                for device_uuid, attachment in template_attachments:
+                    if device_uuid in current_input_map[template_id]:
+                        # The device is already attached to the template.  We need to see if any of
+                        # the input changed from the input on last attach.
+                        current_variables = current_input_map[template_id][device_uuid]
+                        changed = False
+                        for property_name in attachment['variables']:
+                            # Check to see if any of the passed in varibles have changed from what is
+                            # already on the attachment.  We are are not checking to see if the
+                            # correct variables are here.  That will be done on attachment.
+                            if ((property_name in current_variables) and
+                                (str(attachment['variables'][property_name]) != str(current_variables[property_name]))):
+                                changed = True
+                        if not changed or check_mode or not update:
+                            continue
+                    elif check_mode:
+                        continue
+                    template_device_map.setdefault(template_id, []).append({
+                        "config_type": config_type,
+                        "variables": attachment['variables'],
+                        "host_name": attachment['host_name'],
+                        "site_id": attachment['site_id'],
+                        "system_ip": attachment['system_ip'],
+                        "device_uuid": device_uuid
+                    })
 
+        # Start the attachments to every template at once
+        template_uuid_map = dict()
         for entry in template_device_map:
             device_uuid = dict()
             for item in template_device_map[entry]:
@@ -378,24 +475,114 @@ class TemplateData(object):
                 device_uuid[item['device_uuid']]['site_id'] = item['site_id']
                 device_uuid[item['device_uuid']]['variables'] = item['variables']
                 device_uuid[item['device_uuid']]['system_ip'] = item['system_ip']
-            action_id = self.device_templates.attach_to_template(entry, template_device_map[entry][0]['config_type'],
-                                                                 device_uuid)
-            action_id_list.append(action_id)
-
-        utilities = Utilities(self.session, self.host)
-        # Batch the waits so that the peocessing of the attachments is in parallel
-        for action_id in action_id_list:
-            result = utilities.waitfor_action_completion(action_id)
-            data = result['action_response']['data']
-            for entry in data:
-                if result['action_status'] == 'failure':
-                    attachment_failures.update({entry['uuid']: entry['currentActivity']})
+            template_uuid_map[entry] = device_uuid
+
+        if batch_size:
+            result = self.attach_templates_in_batches(template_device_map,
+                                                      template_uuid_map,
+                                                      batch_size=batch_size,
+                                                      batches_in_flight=batches_in_flight)
+            attachment_updates.update(result['updates'])
+            attachment_failures.update(result['failures'])
+            return {'updates': attachment_updates, 'failures': attachment_failures}
+
+        with tracer.span('attach', attributes={'vmanage.templates': len(template_uuid_map)}):
+            for entry, result in run_concurrently(
+                    lambda entry: self.device_templates.attach_to_template(
+                        entry, template_device_map[entry][0]['config_type'], template_uuid_map[entry], wait=False),
+                    list(template_uuid_map)):
+                if isinstance(result, Exception):
+                    # The attachment was never started, so report it against each of its devices
+                    for device_uuid in template_uuid_map[entry]:
+                        attachment_failures.update({device_uuid: str(result)})
                 else:
-                    attachment_updates.update({entry['uuid']: entry['currentActivity']})
+                    action_tracker.add(result)
+
+        # Wait on all of the attachments in a single poll loop so that they are processed in parallel
+        with tracer.span('wait', attributes={'vmanage.actions': len(action_tracker.pending)}):
+            for result in action_tracker.iter_completed():
+                data = result['action_response']['data']
+                for entry in data:
+                    if result['action_status'] == 'failure':
+                        attachment_failures.update({entry['uuid']: entry['currentActivity']})
+                    else:
+                        attachment_updates.update({entry['uuid']: entry['currentActivity']})
 
         result = {'updates': attachment_updates, 'failures': attachment_failures}
         return result
 
+    def attach_templates_in_batches(self,
+                                    template_device_map,
+                                    template_uuid_map,
+                                    batch_size,
+                                    batches_in_flight=DEFAULT_BATCHES_IN_FLIGHT):
+        """Attach the devices of many templates in batches shared by the templates.
+
+        Args:
+            template_device_map (dict): The attachments of each template ID, with their config type
+            template_uuid_map (dict): The variables, system-ip, host-name and site-id of each device
+                keyed by UUID, for each template ID
+            batch_size (int): The most devices to attach in one call
+            batches_in_flight (int): The most batches to leave running on vManage at once
+
+        Returns:
+            result (dict): The activity of each device attached ('updates') or error
+                of each device that was not ('failures'), keyed by device UUID.
+
+        """
+
+        attachment_updates = {}
+        attachment_failures = {}
+        tracer = get_tracer(self.session)
+        device_template_lists = dict()
+        with tracer.span('get-input', attributes={'vmanage.templates': len(template_uuid_map)}):
+            for entry, result in run_concurrently(
+                    lambda entry: self.device_templates.get_attach_device_list(entry, template_uuid_map[entry]),
+                    list(template_uuid_map)):
+                if isinstance(result, Exception):
+                    for device_uuid in template_uuid_map[entry]:
+                        attachment_failures.update({device_uuid: str(result)})
+                    continue
+                url = self.device_templates.get_attach_url(template_device_map[entry][0]['config_type'])
+                device_template_lists.setdefault(url, []).append({
+                    "templateId": entry,
+                    "device": result,
+                    "isEdited": False,
+                    "isMasterEdited": False
+                })
+
+        # Templates of each config type share the batches
+        with tracer.span('attach', attributes={'vmanage.templates': len(template_uuid_map)}):
+            for url, device_template_list in device_template_lists.items():
+                result = self.device_templates.attach_in_batches(url,
+                                                                 device_template_list,
+                                                                 batch_size=batch_size,
+                                                                 batches_in_flight=batches_in_flight)
+                attachment_updates.update(result['updates'])
+                attachment_failures.update(result['failures'])
+
+        return {'updates': attachment_updates, 'failures': attachment_failures}
+
+    def get_attached_input(self, template_id, device_uuid_list):
+        """Get the input of the devices in a list that are attached to a template.
+
+        Args:
+            template_id (str): Template ID
+            device_uuid_list (list): UUIDs of the devices of interest
+
+        Returns:
+            result (dict): Input of the last attach keyed by the UUID of each attached device.
+
+        """
+
+        attached_uuid_list = set(self.device_templates.get_attachments(template_id, key='uuid'))
+        attached_device_list = [uuid for uuid in dict.fromkeys(device_uuid_list) if uuid in attached_uuid_list]
+        if not attached_device_list:
+            return {}
+
+        template_input = self.device_templates.get_template_input(template_id, attached_device_list)
+        return {row['csv-deviceId']: row for row in template_input['data']}
+
     def subTemplates_to_name(self, old_template, feature_template_dict):
         """Convert a Sub Template objects from IDs to Names.
 
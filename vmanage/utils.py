@@ -1,3 +1,10 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from vmanage.api.tracing import propagate
+
+DEFAULT_WORKERS = 10
+
+
 def list_to_dict(lst, key_name, remove_key=True):
     """Convert a list of dictionaries into a dictionary of dictionaries.
 
@@ -21,3 +28,67 @@ def list_to_dict(lst, key_name, remove_key=True):
             d[key] = item
 
     return d
+
+
+def run_concurrently(func, items, workers=DEFAULT_WORKERS):
+    """Call a function for each item on a thread pool, yielding results as they finish.
+
+    Args:
+        func (callable): The function to call with each item
+        items (iterable): The items to process
+        workers (int): The number of calls to run concurrently
+
+    Yields:
+        result (tuple): (item, result) for each item in completion order.  If
+            the call raised, the result is the exception that was raised.
+
+    """
+    func = propagate(func)
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        futures = {executor.submit(func, item): item for item in items}
+        try:
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = e
+                yield futures[future], result
+        finally:
+            # Don't run the remaining calls if the caller stopped early
+            for future in futures:
+                future.cancel()
+
+
+def map_concurrently(func, items, workers=DEFAULT_WORKERS):
+    """Call a function for each item on a thread pool, yielding results in order.
+
+    Only a few calls per worker are started ahead of the caller, so results
+    can be consumed as they are produced without holding them all in memory.
+
+    Args:
+        func (callable): The function to call with each item
+        items (iterable): The items to process
+        workers (int): The number of calls to run concurrently
+
+    Yields:
+        result: The result of each call in the order of the items.
+
+    Raises:
+        Exception: The first exception raised by a call, in item order.
+
+    """
+    workers = max(workers, 1)
+    func = propagate(func)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        try:
+            for item in items:
+                pending.append(executor.submit(func, item))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # Don't run the remaining calls if the caller stopped early
+            for future in pending:
+                future.cancel()